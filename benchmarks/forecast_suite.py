@@ -0,0 +1,275 @@
+"""
+Benchmark suite for the forecast functions.
+
+Times every function over date ranges of 1/30/365/3650 days and, for the
+functions that scan the dataset, over 5k/500k/5M rows (the real dataset
+resampled with replacement). Each case runs cold (registry and result
+cache emptied before every run) and warm (registry loaded, result cache
+emptied before every run); the functions behind the result cache also run
+cached, timing a cache hit. Reports p50/p95 seconds, peak traced memory
+and rows/sec as JSON.
+
+Usage (from the repository root):
+    python benchmarks/forecast_suite.py --output results.json
+    python benchmarks/forecast_suite.py --ranges 1 30 --sizes 5000 --baseline results.json
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from models.functions import flower_analysis, weather  # noqa: E402
+from models.functions.dataset import DATASET_CSV  # noqa: E402
+from models.functions.predicted_profit import get_predicted_profit  # noqa: E402
+from models.functions.predicted_revenue import get_aggregated_results  # noqa: E402
+from models.functions.price_forecasting import generate_forecast_summary  # noqa: E402
+from models.functions.quantity import get_optimal_sales  # noqa: E402
+from models.functions.registry import registry  # noqa: E402
+from models.functions.result_cache import forecast_cache  # noqa: E402
+from models.functions.top_revenue import get_total_revenue  # noqa: E402
+
+DEFAULT_RANGES = [1, 30, 365, 3650]
+DEFAULT_SIZES = [5_000, 500_000, 5_000_000]
+DEFAULT_COLD_RUNS = 3
+DEFAULT_WARM_RUNS = 5
+DEFAULT_TOLERANCE = 0.20  # allowed p50 slowdown against the baseline
+
+# First day of the forecast ranges, and of the dataset-backed ranges (the sales history)
+FORECAST_START = datetime.date(2024, 1, 1)
+HISTORY_START = datetime.date(2023, 1, 1)
+SEED = 0
+FLOWER = 'Marigold'
+
+
+def date_range(start, days):
+    end = start + datetime.timedelta(days=days - 1)
+    return start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+
+class ScaledDataset:
+    """
+    The flower dataset resampled to a given number of rows.
+
+    The frame is handed to the registry under a placeholder file, so the
+    functions under test read it exactly like the real dataset.
+    """
+
+    def __init__(self, size, directory):
+        self.size = size
+        base = registry.dataset(DATASET_CSV)
+        if size == len(base):
+            self.path, self.frame = DATASET_CSV, None
+            return
+
+        rows = np.random.default_rng(SEED).integers(0, len(base), size)
+        self.frame = base.iloc[rows].reset_index(drop=True)
+        self.path = os.path.join(directory, f'flowers_{size}.csv')
+        with open(self.path, 'w') as placeholder:
+            placeholder.write(f'resampled {size} rows\n')
+
+    def register(self):
+        if self.frame is not None:
+            frame = self.frame
+            registry.file(self.path, loader=lambda path: frame)
+
+
+def cases(ranges, datasets):
+    """
+    (function name, range days, dataset rows, call, rows processed, cached) of every case.
+
+    Forecasts over a range process flowers × days rows; dataset-backed
+    functions process the dataset rows. cached marks the functions behind
+    the result cache.
+    """
+    n_flowers = len(registry.dataset(DATASET_CSV)['Flower Name'].cat.categories)
+    base_rows = len(registry.dataset(DATASET_CSV))
+
+    for days in ranges:
+        start, end = date_range(FORECAST_START, days)
+        forecast_rows = n_flowers * days
+        yield ('get_total_revenue', days, base_rows,
+               lambda start=start, end=end: get_total_revenue(start, end, seed=SEED), forecast_rows, True)
+        yield ('get_aggregated_results', days, base_rows,
+               lambda start=start, end=end: get_aggregated_results(start, end, seed=SEED), forecast_rows, True)
+        yield ('get_predicted_profit', days, base_rows,
+               lambda start=start, end=end: get_predicted_profit(start, end), forecast_rows, True)
+        yield ('generate_forecast_summary', days, base_rows,
+               lambda days=days: generate_forecast_summary(days, seed=SEED), forecast_rows, False)
+
+    for dataset in datasets:
+        def analyze(dataset=dataset):
+            return flower_analysis.analyze_flower(FLOWER, seed=SEED, dataset_path=dataset.path)
+
+        yield ('analyze_flower', None, dataset.size, analyze, dataset.size, False)
+
+        for days in ranges:
+            start, end = date_range(HISTORY_START, days)
+
+            def optimal_sales(start=start, end=end, dataset=dataset):
+                return get_optimal_sales(start, end, registry.artifact('sales_model'), dataset_path=dataset.path)
+
+            yield ('get_optimal_sales', days, dataset.size, optimal_sales, dataset.size, False)
+
+    yield ('predict_flower', None, base_rows,
+           lambda: weather.predict_flower('Sunny', 100, 150, 'Marriage'), 1, False)
+
+
+def reset(datasets):
+    """Empty the registry and the result cache, then re-register the scaled datasets."""
+    registry.clear()
+    forecast_cache.clear()
+    for dataset in datasets:
+        dataset.register()
+
+
+def time_runs(call, runs, before=None):
+    seconds = []
+    for _ in range(runs):
+        if before:
+            before()
+        started = time.perf_counter()
+        call()
+        seconds.append(time.perf_counter() - started)
+    return seconds
+
+
+def peak_memory(call, before=None):
+    """Peak memory traced by tracemalloc during one call, in MB."""
+    if before:
+        before()
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(call, rows, mode, runs, datasets):
+    if mode == 'cold':
+        before = lambda: reset(datasets)
+    else:
+        call()  # Populate the registry and the caches
+        # Warm runs recompute the result; cached runs time the result cache hit
+        before = forecast_cache.clear if mode == 'warm' else None
+
+    seconds = time_runs(call, runs, before)
+    p50, p95 = np.percentile(seconds, [50, 95])
+    return {
+        "runs": runs,
+        "p50": float(p50),
+        "p95": float(p95),
+        "mean": float(np.mean(seconds)),
+        "peak_memory_mb": peak_memory(call, before),
+        "rows": rows,
+        "rows_per_second": rows / p50 if p50 > 0 else None
+    }
+
+
+def case_key(result):
+    return (result["function"], result["mode"], result["range_days"], result["dataset_rows"])
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    import pandas
+    import sklearn
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pandas.__version__,
+        "scikit-learn": sklearn.__version__,
+        "commit": commit,
+        "seed": SEED,
+        "timestamp": datetime.datetime.now().isoformat(timespec='seconds')
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Rows of (case, baseline p50, current p50, ratio, regressed) for the cases in both runs."""
+    previous = {case_key(result): result for result in baseline["results"] if "p50" in result}
+    rows = []
+    for result in results:
+        before = previous.get(case_key(result))
+        if before is None or "p50" not in result:
+            continue
+        ratio = result["p50"] / before["p50"] if before["p50"] > 0 else float('inf')
+        rows.append((case_key(result), before["p50"], result["p50"], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the forecast functions")
+    parser.add_argument("--ranges", type=int, nargs='+', default=DEFAULT_RANGES, help="Date range lengths, in days")
+    parser.add_argument("--sizes", type=int, nargs='+', default=DEFAULT_SIZES, help="Dataset sizes, in rows")
+    parser.add_argument("--functions", nargs='+', help="Only benchmark these functions")
+    parser.add_argument("--modes", nargs='+', default=['cold', 'warm', 'cached'], choices=['cold', 'warm', 'cached'])
+    parser.add_argument("--cold-runs", type=int, default=DEFAULT_COLD_RUNS)
+    parser.add_argument("--warm-runs", type=int, default=DEFAULT_WARM_RUNS, help="Runs of the warm and cached modes")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a saved results file and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative p50 slowdown against the baseline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        datasets = [ScaledDataset(size, directory) for size in args.sizes]
+        reset(datasets)
+
+        results = []
+        for function, days, dataset_rows, call, rows, cached in cases(args.ranges, datasets):
+            if args.functions and function not in args.functions:
+                continue
+            for mode in args.modes:
+                if mode == 'cached' and not cached:
+                    continue
+                result = {"function": function, "mode": mode, "range_days": days, "dataset_rows": dataset_rows}
+                runs = args.cold_runs if mode == 'cold' else args.warm_runs
+                try:
+                    # Keep the functions' own prints out of the JSON report
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        result.update(run_case(call, rows, mode, runs, datasets))
+                except Exception as e:
+                    # A missing model or a failing function is reported, not fatal
+                    result["error"] = f"{type(e).__name__}: {e}"
+                results.append(result)
+                print(json.dumps(result), file=sys.stderr)
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            rows = compare(results, json.load(baseline_file), args.tolerance)
+        for key, before, after, ratio, regressed in rows:
+            status = "REGRESSION" if regressed else "ok"
+            print(f"{status:<10} {key} p50 {before:.4f}s -> {after:.4f}s ({ratio:.2f}x)", file=sys.stderr)
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
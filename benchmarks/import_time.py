@@ -0,0 +1,107 @@
+"""
+Import-time benchmark of the models.functions imports of every Streamlit page.
+
+Each page's `models.*` imports are run in fresh interpreters and timed. The
+run fails (exit code 1) when the median import time of a page exceeds the
+budget, or when the imports print anything, pull in sklearn or matplotlib,
+or load a model or dataset.
+
+Usage (from the repository root):
+    python benchmarks/import_time.py [--budget SECONDS] [--repeat N]
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+DEFAULT_BUDGET = 1.5  # seconds per page
+DEFAULT_REPEAT = 5
+
+# Modules that must stay out of sys.modules after the page imports
+HEAVY_MODULES = ['sklearn', 'matplotlib']
+
+# Runs in the child interpreter: time the imports, then report what they did
+PROBE = """
+import io, json, sys, time
+from contextlib import redirect_stdout
+output = io.StringIO()
+started = time.perf_counter()
+with redirect_stdout(output):
+    exec({code!r})
+seconds = time.perf_counter() - started
+from models.functions.registry import registry
+print(json.dumps({{
+    "seconds": seconds,
+    "output": output.getvalue(),
+    "heavy": [name for name in {heavy!r} if name in sys.modules],
+    "loaded": sorted(registry.timings()),
+}}))
+"""
+
+
+def page_imports(page_path):
+    """Source of the `models.*` import statements of a page."""
+    with open(page_path, encoding='utf-8') as page_file:
+        tree = ast.parse(page_file.read())
+
+    statements = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and (node.module or '').startswith('models'):
+            statements.append(ast.unparse(node))
+        elif isinstance(node, ast.Import) and any(alias.name.startswith('models') for alias in node.names):
+            statements.append(ast.unparse(node))
+    return "\n".join(statements)
+
+
+def measure(code, repeat):
+    """Run the imports in `repeat` fresh interpreters; returns the probe results."""
+    probe = PROBE.format(code=code, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", probe], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="Maximum median import time per page, in seconds")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Fresh interpreters per page")
+    args = parser.parse_args()
+
+    failures = []
+    for page_path in sorted(glob.glob(os.path.join(ROOT_DIR, "pages", "*.py"))):
+        page = os.path.basename(page_path).strip()
+        code = page_imports(page_path)
+        if not code:
+            continue
+
+        runs = measure(code, args.repeat)
+        median = statistics.median(run["seconds"] for run in runs)
+        print(f"{page:<28} median {median:.3f}s  max {max(run['seconds'] for run in runs):.3f}s")
+
+        last = runs[-1]
+        if median > args.budget:
+            failures.append(f"{page}: median import time {median:.3f}s exceeds the {args.budget:.3f}s budget")
+        if last["output"]:
+            failures.append(f"{page}: imports printed output: {last['output'][:80]!r}")
+        if last["heavy"]:
+            failures.append(f"{page}: imports loaded {', '.join(last['heavy'])}")
+        if last["loaded"]:
+            failures.append(f"{page}: imports loaded {', '.join(last['loaded'])}")
+
+    for failure in failures:
+        print("FAIL", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
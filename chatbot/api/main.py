@@ -1,10 +1,20 @@
+import os
+
 from chatbot.api.utilities import (
     get_predicted_profit_api,
     get_aggregated_revenue_api,
     get_total_profit_api,
-    get_top_revenue_api
+    get_top_revenue_api,
+    get_summary_api
+)
+
+# Consolidated analytics service (chatbot/api/service.py) serving every route, on its own
+# port (FLORAFLOW_SERVICE_PORT, as in chatbot/api/wsgi.py) so it never answers for a legacy service
+base_url_analytics = os.environ.get(
+    "FLORAFLOW_SERVICE_URL", f"http://127.0.0.1:{os.environ.get('FLORAFLOW_SERVICE_PORT', 5004)}"
 )
 
+# Legacy single-route services
 base_url_predicted_profit = "http://127.0.0.1:5000"
 base_url_aggregated_revenue = "http://127.0.0.1:5001"
 base_url_total_profit = "http://127.0.0.1:5002"
@@ -13,7 +23,9 @@ base_url_top_revenue = "http://127.0.0.1:5003"
 start_date = "2024-01-01"
 end_date = "2024-01-31"
 
-print(get_predicted_profit_api(base_url_predicted_profit, start_date, end_date))
-print(get_aggregated_revenue_api(base_url_aggregated_revenue, start_date, end_date))
-print(get_total_profit_api(base_url_total_profit, start_date, end_date))
-print(get_top_revenue_api(base_url_top_revenue, start_date, end_date))
+if __name__ == "__main__":
+    print(get_predicted_profit_api(base_url_predicted_profit, start_date, end_date))
+    print(get_aggregated_revenue_api(base_url_aggregated_revenue, start_date, end_date))
+    print(get_total_profit_api(base_url_total_profit, start_date, end_date))
+    print(get_top_revenue_api(base_url_top_revenue, start_date, end_date))
+    print(get_summary_api(base_url_analytics, start_date, end_date))
@@ -0,0 +1,186 @@
+import threading
+
+from flask import Response, g, request
+from flask.json.provider import DefaultJSONProvider
+
+from models.functions.timing import STAGES, StageTimings, stage
+
+# Upper bounds (seconds) of the latency histogram buckets
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS_PATH = '/metrics'
+TIMING_HEADER = 'X-Server-Timing'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout."""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+class RouteMetrics:
+    """
+    Request counts, error counts, in-flight gauges and latency histograms per
+    route, plus histograms of the time spent in each stage (see STAGES).
+
+    Metrics are kept per process; every worker of a multi-process server
+    exposes its own.
+    """
+
+    def __init__(self, prefix='floraflow'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.requests = {}     # (route, method, status) -> count
+        self.errors = {}       # (route, method) -> count
+        self.in_flight = {}    # route -> gauge
+        self.durations = {}    # route -> Histogram
+        self.stages = {}       # (route, stage) -> Histogram
+
+    def started(self, route):
+        with self._lock:
+            self.in_flight[route] = self.in_flight.get(route, 0) + 1
+
+    def finished(self, route):
+        with self._lock:
+            self.in_flight[route] -= 1
+
+    def record(self, route, method, status, seconds, stage_seconds):
+        with self._lock:
+            key = (route, method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if status >= 500:
+                self.errors[(route, method)] = self.errors.get((route, method), 0) + 1
+            self.durations.setdefault(route, Histogram()).observe(seconds)
+            for name, value in stage_seconds.items():
+                self.stages.setdefault((route, name), Histogram()).observe(value)
+
+    def _histogram_lines(self, name, histogram, **labels):
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            yield f'{name}_bucket{_labels(**labels, le=bound)} {count}'
+        yield f'{name}_bucket{_labels(**labels, le="+Inf")} {histogram.count}'
+        yield f'{name}_sum{_labels(**labels)} {histogram.sum}'
+        yield f'{name}_count{_labels(**labels)} {histogram.count}'
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        p = self.prefix
+        with self._lock:
+            lines = [f'# HELP {p}_requests_total Requests served, by route, method and status.',
+                     f'# TYPE {p}_requests_total counter']
+            for (route, method, status), count in sorted(self.requests.items()):
+                lines.append(f'{p}_requests_total{_labels(route=route, method=method, status=status)} {count}')
+
+            lines += [f'# HELP {p}_request_errors_total Requests answered with a 5xx status.',
+                      f'# TYPE {p}_request_errors_total counter']
+            for (route, method), count in sorted(self.errors.items()):
+                lines.append(f'{p}_request_errors_total{_labels(route=route, method=method)} {count}')
+
+            lines += [f'# HELP {p}_requests_in_flight Requests being served.',
+                      f'# TYPE {p}_requests_in_flight gauge']
+            for route, count in sorted(self.in_flight.items()):
+                lines.append(f'{p}_requests_in_flight{_labels(route=route)} {count}')
+
+            lines += [f'# HELP {p}_request_duration_seconds Time from the start of the request to the response.',
+                      f'# TYPE {p}_request_duration_seconds histogram']
+            for route, histogram in sorted(self.durations.items()):
+                lines.extend(self._histogram_lines(f'{p}_request_duration_seconds', histogram, route=route))
+
+            lines += [f'# HELP {p}_stage_duration_seconds Time spent in each stage of a request '
+                      f'({", ".join(STAGES)}).',
+                      f'# TYPE {p}_stage_duration_seconds histogram']
+            for (route, name), histogram in sorted(self.stages.items()):
+                lines.extend(self._histogram_lines(f'{p}_stage_duration_seconds', histogram, route=route, stage=name))
+        return '\n'.join(lines) + '\n'
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, with jsonify timed as the serialize stage."""
+
+    def response(self, *args, **kwargs):
+        with stage('serialize'):
+            return super().response(*args, **kwargs)
+
+
+def server_timing(timings, total):
+    """X-Server-Timing value: each stage and the total, in milliseconds."""
+    entries = [f'{name};dur={timings.seconds[name] * 1000:.3f}' for name in STAGES if name in timings.seconds]
+    entries += [f'{name};dur={seconds * 1000:.3f}' for name, seconds in timings.seconds.items() if name not in STAGES]
+    entries.append(f'total;dur={total * 1000:.3f}')
+    return ', '.join(entries)
+
+
+def _route():
+    # The rule, not the path, so query strings and bad URLs do not multiply the series
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+def instrument(app, metrics=None):
+    """
+    Time every request of a Flask app and serve the metrics on /metrics.
+
+    Each response gets an X-Server-Timing header with the stages recorded
+    while serving it; /metrics itself is not recorded.
+
+    Returns:
+    - RouteMetrics: The metrics the app records into.
+    """
+    metrics = metrics or RouteMetrics()
+    app.json = TimedJSONProvider(app)
+
+    @app.before_request
+    def start_timing():
+        if request.path == METRICS_PATH:
+            return
+        g.route = _route()
+        g.stage_timings = StageTimings().start()
+        metrics.started(g.route)
+
+    @app.after_request
+    def record_timing(response):
+        timings = g.pop('stage_timings', None)
+        if timings is None:
+            return response
+
+        total = timings.stop()
+        response.headers[TIMING_HEADER] = server_timing(timings, total)
+        metrics.record(g.route, request.method, response.status_code, total, timings.seconds)
+        return response
+
+    @app.teardown_request
+    def end_timing(exc=None):
+        route = g.pop('route', None)
+        if route is None:
+            return
+
+        # after_request did not run (the response failed), so count it here
+        timings = g.pop('stage_timings', None)
+        if timings is not None:
+            metrics.record(route, request.method, 500, timings.stop(), timings.seconds)
+        metrics.finished(route)
+
+    @app.route(METRICS_PATH, methods=['GET'])
+    def prometheus_metrics():
+        return Response(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+    app.extensions['route_metrics'] = metrics
+    return metrics
@@ -1,31 +1,27 @@
+import os
+import sys
 from flask import Flask, request, jsonify
-import pandas as pd
-import joblib
-from datetime import datetime
-
-# Load the pre-saved prediction summary
-prediction_summary = joblib.load('../../models/regression/prediction_summary.joblib')
-
-# Function to get predicted profit as a dictionary based on start_date and end_date
-def get_predicted_profit(start_date: str, end_date: str):
-    # Convert string dates to datetime
-    start_date = datetime.strptime(start_date, "%Y-%m-%d")
-    end_date = datetime.strptime(end_date, "%Y-%m-%d")
-    
-    # Ensure that 'Date' column is in datetime format
-    prediction_summary['Date'] = pd.to_datetime(prediction_summary['Date'])
-
-    # Filter the data based on the date range
-    filtered_data = prediction_summary[(prediction_summary['Date'] >= start_date) & (prediction_summary['Date'] <= end_date)]
-
-    # Create a dictionary with 'Flower Name' as the key and 'Predicted Profit' as the value
-    profit_dict = {row['Flower Name']: row["Predicted Profit"]
-                   for _, row in filtered_data.iterrows()}
-    return profit_dict
+
+# Make the repository root importable when the service is started from chatbot/api
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+from chatbot.api.metrics import instrument
+from models.functions.prediction_store import shared_prediction_store
+
+# The route's figures come from models.functions, shared (with their cache entries) with the consolidated service
+from models.functions.predicted_profit import get_predicted_profit
+
+def warm_up():
+    """Load the prediction summary index the route uses."""
+    shared_prediction_store()
 
 # Initialize Flask app
 app = Flask(__name__)
 
+# Per-route stage timings, X-Server-Timing headers and Prometheus /metrics
+instrument(app)
+
 # Flask route to handle the API request
 @app.route('/get_predicted_profit', methods=['GET'])
 def predicted_profit():
@@ -39,9 +35,13 @@ def predicted_profit():
 
     try:
         # Call the function to get predicted profits
-        profit_dict = get_predicted_profit(start_date, end_date)
+        daily = request.args.get('daily', 'false').lower() == 'true'
+        profit_dict = get_predicted_profit(start_date, end_date, daily=daily)
         return jsonify(profit_dict)
 
+    except ValueError as e:
+        # Malformed dates or a start date after the end date
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         # Handle unexpected errors
         return jsonify({"error": str(e)}), 500
@@ -1,74 +1,30 @@
+import os
+import sys
 from flask import Flask, request, jsonify
-import pandas as pd
-import numpy as np
-import joblib
-from datetime import datetime
-from sklearn.preprocessing import LabelEncoder
 
-# Load the revenue model
-revenue_model = joblib.load('../../models/regression/revenue_model_svm.joblib')
+# Make the repository root importable when the service is started from chatbot/api
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
 
-# Load dataset
-data = pd.read_csv("../../data/flowers_dataset_cleaned.csv")
+from chatbot.api.metrics import instrument
+from models.functions.forecast_cube import shared_forecast_cube
+from models.functions.registry import flower_encoding, registry
 
-# Encode flower names
-label_encoder = LabelEncoder()
-data['Flower Name Encoded'] = label_encoder.fit_transform(data['Flower Name'])
-flower_names = label_encoder.classes_
+# The route's figures come from models.functions, shared (with their cache entries) with the consolidated service
+from models.functions.predicted_revenue import get_aggregated_results
 
-# Function to get aggregated results
-def get_aggregated_results(start_date: str, end_date: str):
-    # Convert string dates to datetime
-    start_date = datetime.strptime(start_date, "%Y-%m-%d")
-    end_date = datetime.strptime(end_date, "%Y-%m-%d")
-
-    # Generate date range
-    date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-
-    results = []
-
-    for flower in flower_names:
-        # Get encoded value for flower
-        encoded_flower = label_encoder.transform([flower])[0]
-
-        # Randomly generate quantities for each day
-        freq_qty_sold = np.random.randint(50, 200, len(date_range))
-        average_price = data['MRP (₹)'].mean()
-
-        # Prepare future data for predictions
-        future_data = pd.DataFrame({
-            'Flower Name': [encoded_flower] * len(date_range),
-            'Qty Sold (kg)': freq_qty_sold,
-            'MRP (₹)': [average_price] * len(date_range)
-        })
-
-        # Predict revenue
-        predicted_revenue = revenue_model.predict(future_data)
-
-        # Collect results
-        for i, single_date in enumerate(date_range):
-            results.append({
-                'Flower Name': flower,
-                'Date': single_date,
-                'Predicted Revenue': predicted_revenue[i]
-            })
-
-    # Create a DataFrame with all the results
-    prediction_summary = pd.DataFrame(results)
-
-    # Aggregate results by flower name
-    aggregated_results = prediction_summary.groupby('Flower Name').agg({
-        'Predicted Revenue': 'sum'
-    }).reset_index()
-
-    # Convert the aggregated results to a dictionary
-    aggregated_results_dict = aggregated_results.set_index('Flower Name').to_dict()['Predicted Revenue']
-    
-    return aggregated_results_dict
+def warm_up():
+    """Load the encoder, dataset, model and forecast cube the route uses."""
+    flower_encoding()
+    registry.artifact('revenue_model')
+    shared_forecast_cube()
 
 # Initialize Flask app
 app = Flask(__name__)
 
+# Per-route stage timings, X-Server-Timing headers and Prometheus /metrics
+instrument(app)
+
 # Flask route to handle the API request
 @app.route('/get_aggregated_revenue', methods=['GET'])
 def aggregated_revenue():
@@ -85,6 +41,9 @@ def aggregated_revenue():
         aggregated_results = get_aggregated_results(start_date, end_date)
         return jsonify(aggregated_results)
 
+    except ValueError as e:
+        # Malformed dates or a start date after the end date
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         # Handle unexpected errors
         return jsonify({"error": str(e)}), 500
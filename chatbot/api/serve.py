@@ -0,0 +1,192 @@
+"""
+Pre-forking production server for the Flask services.
+
+The parent process imports the service and warms it up (models, encoders
+and datasets loaded into the registry), freezes the loaded objects out of
+the garbage collector and only then forks the workers, so every worker
+shares those pages copy-on-write instead of loading its own copy. Each
+worker serves the shared listening socket with a fixed pool of threads.
+Dead workers are replaced; SIGTERM or SIGINT drains and stops them all.
+
+Usage (from the repository root):
+    python -m chatbot.api.serve service --host 0.0.0.0 --workers 4 --threads 8
+
+Workers and threads default to the FLORAFLOW_WORKERS and FLORAFLOW_THREADS
+environment variables, then to the CPU count and DEFAULT_THREADS.
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+from chatbot.api.wsgi import SERVICES, load  # noqa: E402
+
+DEFAULT_THREADS = 8
+DEFAULT_BACKLOG = 2048
+
+# Seconds a stopping worker gets to finish its in-flight requests
+GRACEFUL_TIMEOUT = 30
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Werkzeug WSGI server answering requests on a fixed pool of threads."""
+
+    multithread = True
+
+    def __init__(self, host, port, app, threads, fd, multiprocess=False):
+        self.multiprocess = multiprocess
+        super().__init__(host, port, app, fd=fd)
+        # Workers share the listening socket: a worker that loses the race
+        # for a connection gets EAGAIN instead of blocking in accept()
+        self.socket.setblocking(False)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+
+    def get_request(self):
+        connection, address = super().get_request()
+        connection.setblocking(True)
+        return connection, address
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        if hasattr(self, 'executor'):
+            self.executor.shutdown(wait=True)
+
+
+def listen(host, port, backlog=DEFAULT_BACKLOG):
+    """Bound, listening socket that the workers inherit."""
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    listener = socket.create_server((host, port), family=family, backlog=backlog)
+    return listener
+
+
+def run_worker(app, listener, threads, multiprocess):
+    """Serve requests until SIGTERM or SIGINT, then finish the in-flight ones."""
+    host, port = listener.getsockname()[:2]
+    server = PooledWSGIServer(host, port, app, threads, listener.fileno(), multiprocess)
+    readiness = app.extensions.get('readiness')
+
+    def stop(signum, frame):
+        if readiness is not None:
+            readiness.draining = True
+        # shutdown() waits for serve_forever to return, so it cannot run in the handler itself
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    server.serve_forever(poll_interval=0.5)
+
+
+def spawn(app, listener, threads):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_worker(app, listener, threads, multiprocess=True)
+        except BaseException:
+            traceback.print_exc()
+            os._exit(1)
+        os._exit(0)
+    return pid
+
+
+def signal_all(pids, signum):
+    for pid in pids:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+def serve(name, host, port, workers, threads):
+    """Warm up a service once, then serve it from `workers` forked processes."""
+    started = time.perf_counter()
+    app = load(name)
+    print(f"{name}: warmed up in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    listener = listen(host, port)
+    print(f"{name}: listening on {host}:{listener.getsockname()[1]} with "
+          f"{workers} worker(s) x {threads} thread(s)", file=sys.stderr)
+
+    if workers == 1 or not hasattr(os, 'fork'):
+        run_worker(app, listener, threads, multiprocess=False)
+        return
+
+    # Keep the warmed-up objects out of the collector, so collections in the
+    # workers do not write to (and un-share) their pages
+    gc.collect()
+    gc.freeze()
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        signal_all(children, signal.SIGTERM)
+
+    children = set()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        children.add(spawn(app, listener, threads))
+
+    deadline = None
+    while children:
+        if stopping and deadline is None:
+            deadline = time.monotonic() + GRACEFUL_TIMEOUT
+        if deadline is not None and time.monotonic() > deadline:
+            signal_all(children, signal.SIGKILL)
+
+        pid, status = os.waitpid(-1, os.WNOHANG)
+        if pid == 0:
+            time.sleep(0.2)
+            continue
+
+        children.discard(pid)
+        if not stopping:
+            print(f"{name}: worker {pid} exited ({status}); starting a new one", file=sys.stderr)
+            children.add(spawn(app, listener, threads))
+
+    listener.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a FloraFlow API with pre-forked workers")
+    parser.add_argument("service", choices=sorted(SERVICES))
+    parser.add_argument("--host", default='127.0.0.1', help="Address to bind (0.0.0.0 for every interface)")
+    parser.add_argument("--port", type=int, help="Port to bind (default: the service's development port)")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get('FLORAFLOW_WORKERS', os.cpu_count() or 1)),
+                        help="Worker processes")
+    parser.add_argument("--threads", type=int, default=int(os.environ.get('FLORAFLOW_THREADS', DEFAULT_THREADS)),
+                        help="Request threads per worker")
+    args = parser.parse_args()
+
+    if args.workers < 1 or args.threads < 1:
+        parser.error("--workers and --threads must be at least 1")
+
+    port = args.port if args.port is not None else SERVICES[args.service][1]
+    serve(args.service, args.host, port, args.workers, args.threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+import io
+import os
+import sys
+import pandas as pd
+from flask import Flask, request, jsonify
+
+# Make the repository root importable when the service is started from chatbot/api
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+from chatbot.api.metrics import instrument
+from chatbot.api.wsgi import SERVICES
+from models.functions.dataset import DATASET_CSV
+from models.functions.forecast_cube import CUBE_MANIFEST, cube_response_table, shared_forecast_cube, window_totals
+from models.functions.forecast_engine import forecast_scenarios, rank_totals
+from models.functions.ingest import AGGREGATE_KEYS, append_records, read_batch, shared_sales_store
+from models.functions.prediction_store import shared_prediction_store
+# The per-route figures are the models.functions implementations, shared (with
+# their result-cache entries) with the pages and the legacy single-route services
+from models.functions.predicted_profit import get_predicted_profit
+from models.functions.predicted_revenue import get_aggregated_results as get_aggregated_revenue
+from models.functions.top_profit import get_total_revenue as get_total_profit
+from models.functions.top_revenue import get_total_revenue
+from models.functions.registry import artifact_path, flower_encoding, registry
+from models.functions.result_cache import cached_forecast, forecast_cache
+from models.functions.surrogate import forecast_model
+from models.functions.weather import market_grid, predict_flowers
+
+dataset_path = DATASET_CSV
+revenue_model_path = artifact_path('revenue_model')
+profit_model_path = artifact_path('profit_model')
+prediction_summary_path = artifact_path('prediction_summary')
+
+
+def warm_up():
+    """Load every asset the routes use into the shared registry."""
+    flower_encoding()
+    registry.artifact('revenue_model')
+    registry.artifact('profit_model')
+    shared_prediction_store()
+    shared_forecast_cube()
+
+
+def forecast_models(*names, fast=False):
+    # Output column -> model (or its grid surrogate), fetched from the registry so changed files are picked up
+    columns = {'revenue_model': 'Predicted Revenue', 'profit_model': 'Predicted Profit'}
+    return {columns[name]: forecast_model(name, fast) for name in names}
+
+
+# Bounds of the /scenarios n_scenarios parameter
+DEFAULT_SCENARIOS = 1000
+MAX_SCENARIOS = 10000
+
+# Upper bound on the weather × segment × quantity × MRP rows of a /recommend_flowers grid
+MAX_GRID_CELLS = 100_000
+
+# Values of the optional "mode" query parameter; "fast" serves the grid surrogates
+FORECAST_MODES = {'exact': False, 'fast': True}
+
+# Forecast parameters of date_range_response that /get_predicted_profit has no use for
+PREDICTED_PROFIT_UNSUPPORTED = ('seed', 'mode')
+
+# Content types of a /sales batch body -> batch format; other bodies are read as a JSON list of records
+SALES_FORMATS = {'application/x-ndjson': 'ndjson', 'application/jsonl': 'ndjson', 'text/csv': 'csv'}
+
+# Values of the /sales/totals group_by parameter -> aggregate keys
+TOTALS_GROUPS = {'flower': 'Flower Name', 'day': 'Day', 'segment': 'Customer Segment'}
+
+# Keys of the /summary payload, in the order returnFromApi hands them to the chatbot
+SUMMARY_KEYS = ['predicted_profit', 'aggregated_revenue', 'total_profit', 'top_revenue']
+
+
+@cached_forecast('summary', [dataset_path, revenue_model_path, profit_model_path, prediction_summary_path,
+                             CUBE_MANIFEST])
+def get_summary(start_date: str, end_date: str, seed=None, fast=False):
+    """
+    Compute every chatbot figure for a date range.
+
+    Revenue and profit come from one shared forecast pass (or the forecast
+    cube), so both models see the same simulated quantities.
+
+    Returns:
+    - dict: SUMMARY_KEYS -> {flower name: value}.
+    """
+    label_encoder, flower_names, average_price = flower_encoding()
+    totals = window_totals(forecast_models('revenue_model', 'profit_model', fast=fast),
+                           flower_names, label_encoder, start_date, end_date, average_price, seed=seed)
+
+    return {
+        'predicted_profit': get_predicted_profit(start_date, end_date),
+        'aggregated_revenue': totals['Predicted Revenue'],
+        'total_profit': rank_totals(totals['Predicted Profit']),
+        'top_revenue': rank_totals(totals['Predicted Revenue'])
+    }
+
+
+@cached_forecast('scenarios', [dataset_path, revenue_model_path, profit_model_path, CUBE_MANIFEST])
+def get_scenarios(start_date: str, end_date: str, seed=None, n_scenarios=DEFAULT_SCENARIOS, fast=False):
+    """
+    Monte Carlo revenue and profit totals per flower with mean and P10/P50/P90.
+
+    Pass a seed for reproducible (and cacheable) results. The per-quantity
+    predictions come from the forecast cube when it was built from the current models.
+    """
+    label_encoder, flower_names, average_price = flower_encoding()
+    models = forecast_models('revenue_model', 'profit_model', fast=fast)
+    return forecast_scenarios(models, flower_names, label_encoder, start_date, end_date, average_price,
+                              n_scenarios, seed=seed, table=cube_response_table(models, flower_names, average_price))
+
+
+# Initialize Flask app
+app = Flask(__name__)
+
+# Per-route stage timings, X-Server-Timing headers and Prometheus /metrics
+instrument(app)
+
+
+def date_range_response(func):
+    # Get start_date and end_date from query parameters
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+
+    # Check if both dates are provided
+    if not start_date or not end_date:
+        return jsonify({"error": "Both start_date and end_date are required"}), 400
+
+    # Optional RNG seed for reproducible forecasts
+    seed = request.args.get('seed')
+    if seed is not None and not seed.isdigit():
+        return jsonify({"error": "seed must be a non-negative integer"}), 400
+
+    # Optional inference mode: exact SVR models (default) or their fast grid surrogates
+    mode = request.args.get('mode', 'exact')
+    if mode not in FORECAST_MODES:
+        return jsonify({"error": f"mode must be one of {', '.join(FORECAST_MODES)}"}), 400
+
+    try:
+        return jsonify(func(start_date, end_date, seed=int(seed) if seed is not None else None,
+                            fast=FORECAST_MODES[mode]))
+
+    except ValueError as e:
+        # Malformed dates or a start date after the end date
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        # Handle unexpected errors
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/get_predicted_profit', methods=['GET'])
+def predicted_profit():
+    # Predicted profit is read from the stored predictions, so there is nothing to seed or approximate
+    unsupported = [name for name in PREDICTED_PROFIT_UNSUPPORTED if name in request.args]
+    if unsupported:
+        return jsonify({"error": f"get_predicted_profit does not accept {', '.join(unsupported)}"}), 400
+
+    daily = request.args.get('daily', 'false').lower() == 'true'
+    return date_range_response(lambda start_date, end_date, seed=None, fast=False: get_predicted_profit(start_date, end_date, daily=daily))
+
+
+@app.route('/get_aggregated_revenue', methods=['GET'])
+def aggregated_revenue():
+    return date_range_response(get_aggregated_revenue)
+
+
+@app.route('/get_total_profit', methods=['GET'])
+def total_profit():
+    return date_range_response(get_total_profit)
+
+
+@app.route('/get_total_revenue', methods=['GET'])
+def total_revenue():
+    return date_range_response(get_total_revenue)
+
+
+@app.route('/summary', methods=['GET'])
+def summary():
+    return date_range_response(get_summary)
+
+
+@app.route('/scenarios', methods=['GET'])
+def scenarios():
+    n_scenarios = request.args.get('n_scenarios', str(DEFAULT_SCENARIOS))
+    if not n_scenarios.isdigit() or not 0 < int(n_scenarios) <= MAX_SCENARIOS:
+        return jsonify({"error": f"n_scenarios must be an integer between 1 and {MAX_SCENARIOS}"}), 400
+
+    return date_range_response(lambda start_date, end_date, seed=None, fast=False: get_scenarios(
+        start_date, end_date, seed=seed, n_scenarios=int(n_scenarios), fast=fast))
+
+
+@app.route('/recommend_flowers', methods=['POST'])
+def recommend_flowers():
+    """
+    Batch flower recommendations from weather, quantity, MRP and customer segment.
+
+    Accepts a CSV body (Content-Type: text/csv) or JSON: a list of records, a
+    dict of equal-length arrays, or {"grid": {"qty_sold": [...], "mrp": [...]}}
+    to score every weather × segment × quantity × MRP combination.
+    """
+    try:
+        if request.mimetype == 'text/csv':
+            data = pd.read_csv(io.StringIO(request.get_data(as_text=True)))
+        else:
+            data = request.get_json(silent=True)
+            if data is None:
+                return jsonify({"error": "Send a JSON or text/csv body"}), 400
+
+        if isinstance(data, dict) and 'grid' in data:
+            data = market_grid(**data['grid'], max_cells=MAX_GRID_CELLS)
+            return jsonify({"rows": data.to_dict('records'), "predictions": predict_flowers(data).tolist()})
+
+        return jsonify({"predictions": predict_flowers(data).tolist()})
+
+    except (ValueError, TypeError, pd.errors.ParserError) as e:
+        return jsonify({"error": str(e)}), 400
+    except FileNotFoundError as e:
+        # The random forest pickle is not shipped with every checkout
+        return jsonify({"error": f"Flower recommender model unavailable: {e}"}), 503
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/sales', methods=['POST'])
+def append_sales():
+    """
+    Append new sale records to the dataset's ingestion log.
+
+    Accepts NDJSON (Content-Type: application/x-ndjson), CSV (text/csv) or a
+    JSON list of records. Valid records are stored even when others are
+    rejected; the response lists the rejected rows and the new log version.
+    """
+    try:
+        if request.mimetype in SALES_FORMATS:
+            data = read_batch(io.StringIO(request.get_data(as_text=True)), SALES_FORMATS[request.mimetype])
+        else:
+            data = request.get_json(silent=True)
+            if data is None:
+                return jsonify({"error": "Send NDJSON, text/csv or a JSON list of records"}), 400
+
+        result = append_records(data, dataset_path)
+        status = 400 if result["rejected"] and not result["accepted"] else 200
+        return jsonify(result), status
+
+    except (ValueError, TypeError, pd.errors.ParserError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/sales/totals', methods=['GET'])
+def sales_totals():
+    """
+    Sales, quantity, revenue and profit margin of the recorded sales (ingested ones included).
+
+    Optional filters: start_date, end_date (YYYY-MM-DD, on the sale start day),
+    flower and segment; group_by is a comma-separated subset of flower, day, segment.
+    """
+    group_by = request.args.get('group_by', 'flower,day,segment')
+    names = [name.strip() for name in group_by.split(',') if name.strip()]
+    unknown = [name for name in names if name not in TOTALS_GROUPS]
+    if unknown:
+        return jsonify({"error": f"group_by must be a subset of {', '.join(TOTALS_GROUPS)}"}), 400
+
+    try:
+        snapshot = shared_sales_store(dataset_path).snapshot()
+        totals = snapshot.totals(request.args.get('start_date'), request.args.get('end_date'),
+                                 request.args.get('flower'), request.args.get('segment'),
+                                 group_by=[key for key in AGGREGATE_KEYS if key in {TOTALS_GROUPS[n] for n in names}])
+        if 'Day' in totals.columns:
+            totals['Day'] = totals['Day'].dt.strftime('%Y-%m-%d')
+        return jsonify({"version": snapshot.version, "totals": totals.to_dict('records')})
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/cache_stats', methods=['GET'])
+def cache_stats():
+    return jsonify(forecast_cache.stats())
+
+
+@app.route('/forecast_cube', methods=['GET'])
+def forecast_cube():
+    # Coverage of the materialized forecast; "available" is false when it is missing or stale
+    cube = shared_forecast_cube()
+    if cube is None:
+        return jsonify({"available": False})
+    return jsonify({"available": True, **cube.describe()})
+
+
+@app.route('/artifacts', methods=['GET'])
+def artifacts():
+    # Load counts and timings of the shared registry
+    return jsonify(registry.timings())
+
+
+# Start the Flask development server; production servers load the app through chatbot.api.wsgi
+if __name__ == '__main__':
+    # Load every asset once before serving; all routes share these copies
+    warm_up()
+    # The Werkzeug debugger and reloader are opt-in
+    app.run(debug=os.environ.get('FLORAFLOW_DEBUG') == '1', port=SERVICES['service'][1])
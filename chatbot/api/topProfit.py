@@ -1,68 +1,33 @@
+import os
+import sys
 from flask import Flask, request, jsonify
-import pandas as pd
-import numpy as np
-import joblib
-from datetime import datetime
-from sklearn.preprocessing import LabelEncoder
 
-# Load the dataset and models
-data = pd.read_csv("../../data/flowers_dataset_cleaned.csv")
+# Make the repository root importable when the service is started from chatbot/api
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
 
-if 'Timestamp' in data.columns:
-    data['Timestamp'] = pd.to_datetime(data['Timestamp'])
+from chatbot.api.metrics import instrument
+from models.functions.forecast_cube import shared_forecast_cube
+from models.functions.registry import flower_encoding, registry
 
-label_encoder = LabelEncoder()
-data['Flower Name Encoded'] = label_encoder.fit_transform(data['Flower Name'])
-flower_names = label_encoder.classes_
+# The route's figures come from models.functions, shared (with their cache entries) with the consolidated service
+from models.functions.top_profit import get_total_revenue
 
-revenue_model = joblib.load('../../models/regression/revenue_model_svm.joblib')
-profit_model = joblib.load('../../models/regression/profit_model_svm.joblib')
-
-# Function to get total revenue based on the start and end dates
-def get_total_revenue(start_date: str, end_date: str):
-   
-    start_date = datetime.strptime(start_date, "%Y-%m-%d")
-    end_date = datetime.strptime(end_date, "%Y-%m-%d")
-
-    date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-
-    results = []
-
-    for flower in flower_names:
-        encoded_flower = label_encoder.transform([flower])[0] 
-        freq_qty_sold = np.random.randint(50, 200, len(date_range))  
-        average_price = data['MRP (₹)'].mean()  
-
-        future_data = pd.DataFrame({
-            'Flower Name': [encoded_flower] * len(date_range),
-            'Qty Sold (kg)': freq_qty_sold,
-            'MRP (₹)': [average_price] * len(date_range)
-        })
-
-        predicted_revenue = profit_model.predict(future_data)
-
-        for i, single_date in enumerate(date_range):
-            results.append({
-                'Flower Name': flower,
-                'Date': single_date,
-                'Predicted Profit': predicted_revenue[i]
-            })
-
-    prediction_summary = pd.DataFrame(results)
-
-    aggregated_revenue = prediction_summary.groupby('Flower Name')['Predicted Profit'].sum().reset_index()
-
-    top_revenue = aggregated_revenue.sort_values(by='Predicted Profit', ascending=False)
-
-    revenue_dict = dict(zip(top_revenue['Flower Name'], top_revenue['Predicted Profit']))
-
-    return revenue_dict
+def warm_up():
+    """Load the encoder, dataset, model and forecast cube the route uses."""
+    flower_encoding()
+    registry.artifact('profit_model')
+    shared_forecast_cube()
 
 # Initialize Flask app
 app = Flask(__name__)
 
+# Per-route stage timings, X-Server-Timing headers and Prometheus /metrics
+instrument(app)
+
 # Flask route to handle the API request
 @app.route('/get_total_revenue', methods=['GET'])
+@app.route('/get_total_profit', methods=['GET'])
 def total_revenue():
     # Get start_date and end_date from query parameters
     start_date = request.args.get('start_date')
@@ -77,6 +42,9 @@ def total_revenue():
         revenue_dict = get_total_revenue(start_date, end_date)
         return jsonify(revenue_dict)
 
+    except ValueError as e:
+        # Malformed dates or a start date after the end date
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         # Handle unexpected errors
         return jsonify({"error": str(e)}), 500
@@ -1,68 +1,100 @@
 import requests
+from requests.adapters import HTTPAdapter
 
-def get_predicted_profit_api(base_url, start_date, end_date):
+# (connect, read) timeout in seconds applied to every API call
+DEFAULT_TIMEOUT = (3.05, 30)
+
+# One keep-alive session shared by every helper, so repeated calls reuse pooled connections
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+def get_predicted_profit_api(base_url, start_date, end_date, timeout=DEFAULT_TIMEOUT):
     """
     Sends a GET request to the predicted profit API.
     Args:
         base_url (str): The base URL of the API.
         start_date (str): The start date in YYYY-MM-DD format.
         end_date (str): The end date in YYYY-MM-DD format.
+        timeout (float or tuple): Connect/read timeout in seconds.
     Returns:
         dict: JSON response if status code is 200, else an error message.
     """
     try:
-        response = requests.get(f"{base_url}/get_predicted_profit", params={"start_date": start_date, "end_date": end_date})
+        response = session.get(f"{base_url}/get_predicted_profit", params={"start_date": start_date, "end_date": end_date}, timeout=timeout)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
         return {"error": str(e)}
 
-def get_aggregated_revenue_api(base_url, start_date, end_date):
+def get_aggregated_revenue_api(base_url, start_date, end_date, timeout=DEFAULT_TIMEOUT):
     """
     Sends a GET request to the aggregated revenue API.
     Args:
         base_url (str): The base URL of the API.
         start_date (str): The start date in YYYY-MM-DD format.
         end_date (str): The end date in YYYY-MM-DD format.
+        timeout (float or tuple): Connect/read timeout in seconds.
     Returns:
         dict: JSON response if status code is 200, else an error message.
     """
     try:
-        response = requests.get(f"{base_url}/get_aggregated_revenue", params={"start_date": start_date, "end_date": end_date})
+        response = session.get(f"{base_url}/get_aggregated_revenue", params={"start_date": start_date, "end_date": end_date}, timeout=timeout)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
         return {"error": str(e)}
 
-def get_total_profit_api(base_url, start_date, end_date):
+def get_total_profit_api(base_url, start_date, end_date, timeout=DEFAULT_TIMEOUT):
     """
     Sends a GET request to the total profit API.
     Args:
         base_url (str): The base URL of the API.
         start_date (str): The start date in YYYY-MM-DD format.
         end_date (str): The end date in YYYY-MM-DD format.
+        timeout (float or tuple): Connect/read timeout in seconds.
     Returns:
         dict: JSON response if status code is 200, else an error message.
     """
     try:
-        response = requests.get(f"{base_url}/get_total_revenue", params={"start_date": start_date, "end_date": end_date})
+        response = session.get(f"{base_url}/get_total_profit", params={"start_date": start_date, "end_date": end_date}, timeout=timeout)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
         return {"error": str(e)}
 
-def get_top_revenue_api(base_url, start_date, end_date):
+def get_top_revenue_api(base_url, start_date, end_date, timeout=DEFAULT_TIMEOUT):
     """
     Sends a GET request to the top revenue API.
     Args:
         base_url (str): The base URL of the API.
         start_date (str): The start date in YYYY-MM-DD format.
         end_date (str): The end date in YYYY-MM-DD format.
+        timeout (float or tuple): Connect/read timeout in seconds.
     Returns:
         dict: JSON response if status code is 200, else an error message.
     """
     try:
-        response = requests.get(f"{base_url}/get_total_revenue", params={"start_date": start_date, "end_date": end_date})
+        response = session.get(f"{base_url}/get_total_revenue", params={"start_date": start_date, "end_date": end_date}, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    except requests.RequestException as e:
+        return {"error": str(e)}
+
+def get_summary_api(base_url, start_date, end_date, timeout=DEFAULT_TIMEOUT):
+    """
+    Sends a GET request to the combined summary API of the analytics service.
+    Args:
+        base_url (str): The base URL of the API.
+        start_date (str): The start date in YYYY-MM-DD format.
+        end_date (str): The end date in YYYY-MM-DD format.
+        timeout (float or tuple): Connect/read timeout in seconds.
+    Returns:
+        dict: JSON response with predicted_profit, aggregated_revenue, total_profit
+        and top_revenue if status code is 200, else an error message.
+    """
+    try:
+        response = session.get(f"{base_url}/summary", params={"start_date": start_date, "end_date": end_date}, timeout=timeout)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
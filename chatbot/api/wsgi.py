@@ -0,0 +1,94 @@
+"""
+WSGI entry points of the Flask services.
+
+Any WSGI server can serve them, e.g. from the repository root:
+    gunicorn --preload --workers 4 --threads 8 --bind 0.0.0.0:5004 "chatbot.api.wsgi:service"
+
+The bundled pre-forking launcher needs no extra dependency:
+    python -m chatbot.api.serve service --workers 4 --threads 8
+"""
+import importlib
+import os
+import time
+
+from flask import jsonify
+
+# Port of the consolidated service; the legacy single-route services keep 5000-5003
+SERVICE_PORT = int(os.environ.get('FLORAFLOW_SERVICE_PORT', 5004))
+
+# Service name -> (module, default port of its development server)
+SERVICES = {
+    'service': ('chatbot.api.service', SERVICE_PORT),
+    'predicted_profit': ('chatbot.api.predictedProfit', 5000),
+    'predicted_revenue': ('chatbot.api.predictedRevenue', 5001),
+    'total_profit': ('chatbot.api.topProfit', 5002),
+    'top_revenue': ('chatbot.api.topRevenue', 5003),
+}
+
+READY_PATH = '/ready'
+
+
+class Readiness:
+    """Whether a worker has finished warming up and is not shutting down."""
+
+    def __init__(self):
+        self.warm = False
+        self.draining = False
+        self.warm_up_seconds = None
+
+    @property
+    def ready(self):
+        return self.warm and not self.draining
+
+
+def add_readiness(app):
+    """
+    Serve /ready: 200 once the app's models and data are loaded, 503 before
+    that and while the worker shuts down, so a load balancer only routes
+    requests to workers that can answer them at full speed.
+    """
+    readiness = Readiness()
+
+    @app.route(READY_PATH, methods=['GET'])
+    def ready():
+        body = {"ready": readiness.ready, "pid": os.getpid(), "warm_up_seconds": readiness.warm_up_seconds}
+        return jsonify(body), 200 if readiness.ready else 503
+
+    app.extensions['readiness'] = readiness
+    return readiness
+
+
+def load(name, warm=True):
+    """
+    Flask app of a service, with its /ready endpoint.
+
+    Parameters:
+    - name (str): Key of SERVICES.
+    - warm (bool): Run the service's warm_up() (load its models and data) before returning.
+
+    Returns:
+    - Flask: The WSGI application.
+    """
+    if name not in SERVICES:
+        raise ValueError(f"Unknown service {name!r}; expected one of {', '.join(SERVICES)}")
+
+    # Importing a service loads nothing; warm_up() below loads its models and data
+    started = time.perf_counter()
+    module = importlib.import_module(SERVICES[name][0])
+    app = module.app
+    readiness = app.extensions.get('readiness') or add_readiness(app)
+
+    if warm and not readiness.warm:
+        module.warm_up()
+        readiness.warm_up_seconds = time.perf_counter() - started
+        readiness.warm = True
+    return app
+
+
+def __getattr__(name):
+    # "chatbot.api.wsgi:service" style lookups from WSGI servers
+    if name in SERVICES:
+        app = load(name)
+        globals()[name] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,87 @@
+import math
+
+# Fixed opening of every chatbot context; keeping it byte-identical across
+# sessions lets the model provider reuse its prompt prefix
+CONTEXT_PREFIX = (
+    "You are assisting a flower shop owner in rural India.\n"
+    "The table below holds forecasts per flower for the selected date range, in rupees.\n"
+    "Answer the owner's questions using this data. Continue the conversation.\n"
+)
+
+# Columns of the context table, in the order returnFromApi returns the payload
+COLUMNS = ["Predicted profit", "Aggregated revenue", "Total profit", "Top revenue"]
+
+DEFAULT_TOKEN_BUDGET = 1500
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (about four characters per token)."""
+    return math.ceil(len(text) / 4)
+
+
+def _format_value(value, decimals):
+    if isinstance(value, (int, float)):
+        return f"{value:.{decimals}f}"
+    return "-"
+
+
+def build_context(payload, token_budget=DEFAULT_TOKEN_BUDGET, top_k=None, decimals=0, date_range=None):
+    """
+    Render the returnFromApi payload as a compact table for the chatbot prompt.
+
+    Flowers are ranked by aggregated revenue. Rows are cut to top_k and then
+    further, from the bottom, until the context fits the token budget.
+
+    Parameters:
+    - payload (list): The four dicts returned by returnFromApi.
+    - token_budget (int): Maximum estimated tokens of the rendered context.
+    - top_k (int, optional): Maximum number of flowers to list.
+    - decimals (int): Decimals kept when rounding values.
+    - date_range (tuple, optional): (start_date, end_date) shown in the header.
+
+    Returns:
+    - str: The context text.
+    """
+    sections = list(payload) + [{}] * (len(COLUMNS) - len(payload))
+
+    header = CONTEXT_PREFIX
+    if date_range:
+        header += f"Date range: {date_range[0]} to {date_range[1]}\n"
+
+    # Sections that failed upstream are reported instead of tabulated
+    notes = [f"{column}: unavailable ({section['error']})"
+             for column, section in zip(COLUMNS, sections) if "error" in section]
+    if notes:
+        header += "\n".join(notes) + "\n"
+
+    flowers = set()
+    for section in sections:
+        if "error" not in section:
+            flowers.update(section)
+    ranking = sections[1] if "error" not in sections[1] else {}
+    flowers = sorted(flowers, key=lambda flower: (-ranking.get(flower, float("-inf")), flower))
+
+    if top_k is not None:
+        flowers = flowers[:top_k]
+
+    table_header = "Flower | " + " | ".join(COLUMNS)
+    rows = [
+        f"{flower} | " + " | ".join(_format_value(section.get(flower), decimals) for section in sections)
+        for flower in flowers
+    ]
+
+    def render(n_rows, total):
+        lines = [header, table_header] + rows[:n_rows]
+        if n_rows < total:
+            lines.append(f"({total - n_rows} lower-revenue flowers omitted)")
+        return "\n".join(lines)
+
+    # Keep the largest number of top-ranked rows that fits the budget (binary search)
+    low, high = 0, len(rows)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(render(middle, len(rows))) <= token_budget:
+            low = middle
+        else:
+            high = middle - 1
+    return render(low, len(rows))
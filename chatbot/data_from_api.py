@@ -1,8 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+
 from chatbot.api.utilities import get_predicted_profit_api
 from chatbot.api.utilities import get_aggregated_revenue_api
 from chatbot.api.utilities import get_top_revenue_api
 from chatbot.api.utilities import get_total_profit_api
+from chatbot.api.utilities import get_summary_api
 
+from chatbot.api.main import base_url_analytics
 from chatbot.api.main import base_url_aggregated_revenue
 from chatbot.api.main import base_url_predicted_profit
 from chatbot.api.main import base_url_top_revenue
@@ -10,15 +14,40 @@ from chatbot.api.main import base_url_total_profit
 
 import json
 
-def returnFromApi(start_date, end_date) -> json:
-    answerList = [
-        get_predicted_profit_api(base_url_predicted_profit, start_date, end_date),
-        get_aggregated_revenue_api(base_url_aggregated_revenue, start_date, end_date),
-        get_total_profit_api(base_url_total_profit, start_date, end_date),
-        get_top_revenue_api(base_url_top_revenue, start_date, end_date)        
+# Order in which the summary sections are handed to the chatbot
+SUMMARY_KEYS = ['predicted_profit', 'aggregated_revenue', 'total_profit', 'top_revenue']
+
+# Upper bound in seconds on the wait for all four per-route calls together
+TOTAL_DEADLINE = 45
+
+# Reused across chatbot sessions so the fan-out does not pay for thread start-up
+executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="floraflow-api")
+
+def fetchConcurrently(start_date, end_date, deadline=TOTAL_DEADLINE) -> json:
+    # Issue the four per-route requests in parallel over the pooled session
+    futures = [
+        executor.submit(get_predicted_profit_api, base_url_predicted_profit, start_date, end_date),
+        executor.submit(get_aggregated_revenue_api, base_url_aggregated_revenue, start_date, end_date),
+        executor.submit(get_total_profit_api, base_url_total_profit, start_date, end_date),
+        executor.submit(get_top_revenue_api, base_url_top_revenue, start_date, end_date)
     ]
 
-    return answerList
+    # Wait for the slowest call, but never past the total deadline
+    wait(futures, timeout=deadline)
+
+    return [
+        future.result() if future.done() else {"error": f"No response within {deadline} seconds"}
+        for future in futures
+    ]
+
+def returnFromApi(start_date, end_date) -> json:
+    # One round trip to the analytics service instead of one per route
+    summary = get_summary_api(base_url_analytics, start_date, end_date)
+    if "error" not in summary:
+        return [summary[key] for key in SUMMARY_KEYS]
+
+    # Fall back to the single-route services, queried concurrently
+    return fetchConcurrently(start_date, end_date)
 
 def main():
     returnFromApi("2024-10-11", "2024-10-21")
\ No newline at end of file
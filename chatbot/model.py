@@ -1,30 +1,266 @@
 import os
+import re
+import json
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 import google.generativeai as genai
 import logging
 
 from dotenv import load_dotenv
 from chatbot.data_from_api import returnFromApi
 
-class Gemini:
+logger = logging.getLogger(__name__)
 
-    def __init__(self, model: str = "gemini-1.5-flash") -> None:
-        try:
+# genai.configure is process-wide, so it only needs to run once
+_configured = False
+_configure_lock = threading.Lock()
+
+def configure_genai():
+    global _configured
+    with _configure_lock:
+        if not _configured:
             load_dotenv()
             genai.configure(api_key=os.environ["GEMINI"])
+            _configured = True
+
+# Default bound on the number of cached responses
+DEFAULT_CACHE_SIZE = 256
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Lowercases a prompt, collapses whitespace and drops trailing punctuation,
+    so trivially different phrasings of a question share a cache entry.
+    """
+    return re.sub(r"\s+", " ", prompt).strip().lower().rstrip("?!. ")
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class MemoryBackend:
+    """
+    Size-bounded in-memory store that evicts the least recently used entry.
+    With a ttl (seconds), entries also expire that long after they were set.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, ttl: float = None, clock=time.time) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (value, expiry time or None)
+        self._lock = threading.Lock()
+
+    def _expired(self, expires) -> bool:
+        return expires is not None and expires <= self.clock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            value, expires = self._entries[key]
+            if self._expired(expires):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            expires = self.clock() + self.ttl if self.ttl is not None else None
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self._persist()
+
+    def _persist(self) -> None:
+        pass
 
-            self.model = genai.GenerativeModel(model_name=model)
-        except Exception as ConstructorError:
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class DiskBackend(MemoryBackend):
+    """
+    MemoryBackend that is loaded from and saved to a JSON file, so cached
+    responses survive restarts.
+    """
+
+    def __init__(self, path: str, maxsize: int = DEFAULT_CACHE_SIZE, ttl: float = None, clock=time.time) -> None:
+        super().__init__(maxsize, ttl, clock)
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as cache_file:
+                # [key, value, expiry]; files written before expiry was stored hold [key, value]
+                for key, value, *expires in json.load(cache_file)[-maxsize:]:
+                    expires = expires[0] if expires else None
+                    if not self._expired(expires):
+                        self._entries[key] = (value, expires)
+        except (OSError, ValueError):
             pass
 
-    def respond(self, prompt: str) -> str:
+    def _persist(self) -> None:
+        # Write to a temporary file and move it into place so a crash never leaves a torn file
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as cache_file:
+            json.dump([[key, value, expires] for key, (value, expires) in self._entries.items()], cache_file)
+        os.replace(tmp_path, self.path)
+
+class ResponseCache:
+    """
+    Cache of model responses keyed on model name, normalized prompt and context data.
+
+    The backend only needs get(key) and set(key, value); MemoryBackend and
+    DiskBackend are provided, and tests can pass any local stand-in.
+    """
+
+    def __init__(self, backend=None) -> None:
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model_name: str, prompt: str, context: str = "") -> str:
+        return f"{model_name}:{_digest(normalize_prompt(prompt))}:{_digest(context)}"
+
+    def get(self, model_name: str, prompt: str, context: str = ""):
+        response = self.backend.get(self.key(model_name, prompt, context))
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    def set(self, model_name: str, prompt: str, response: str, context: str = "") -> None:
+        if response:
+            self.backend.set(self.key(model_name, prompt, context), response)
+
+def default_response_cache() -> ResponseCache:
+    """
+    In-memory cache, or a persistent one when GEMINI_CACHE_PATH names a JSON file.
+    GEMINI_CACHE_TTL sets how many seconds a response stays cached (forever by default).
+    """
+    path = os.environ.get("GEMINI_CACHE_PATH")
+    ttl = float(os.environ["GEMINI_CACHE_TTL"]) if os.environ.get("GEMINI_CACHE_TTL") else None
+    return ResponseCache(DiskBackend(path, ttl=ttl) if path else MemoryBackend(ttl=ttl))
+
+class Gemini:
+
+    def __init__(self, model: str = "gemini-1.5-flash", client=None, cache=None) -> None:
+        """
+        Args:
+            model (str): Gemini model name.
+            client: Object with a generate_content(prompt, stream=False) method to use
+                instead of the Gemini API, e.g. a local fake model in tests.
+            cache (ResponseCache): Response cache; None disables caching.
+        """
+        self.model_name = model
+        self.cache = cache
+        try:
+            if client is None:
+                configure_genai()
+                client = genai.GenerativeModel(model_name=model)
+            self.model = client
+        except Exception:
+            logger.exception("Could not create the Gemini client")
+
+    def _cached(self, prompt: str, context: str):
+        if self.cache is None:
+            return None
+        return self.cache.get(self.model_name, prompt, context)
+
+    def _store(self, prompt: str, response: str, context: str) -> None:
+        if self.cache is not None:
+            self.cache.set(self.model_name, prompt, response, context)
+
+    def respond(self, prompt: str, context: str = "") -> str:
+        cached = self._cached(prompt, context)
+        if cached is not None:
+            return cached
         try:
             response = self.model.generate_content(prompt)
+            self._store(prompt, response.text, context)
             return response.text
-        except Exception as ReponseError:
-            pass
+        except Exception:
+            logger.exception("Gemini response failed")
+            raise
+
+    def respond_stream(self, prompt: str, context: str = ""):
+        """
+        Yields the response text chunk by chunk as the model generates it.
+        A cached response is yielded at once without calling the model.
+        Errors are raised to the caller; a failed response is not cached.
+        """
+        cached = self._cached(prompt, context)
+        if cached is not None:
+            yield cached
+            return
+        chunks = []
+        try:
+            for chunk in self.model.generate_content(prompt, stream=True):
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    yield chunk.text
+            self._store(prompt, "".join(chunks), context)
+        except Exception:
+            logger.exception("Gemini streaming response failed")
+            raise
+
+    def start_chat(self, history=None):
+        """
+        Opens a multi-turn chat session; earlier turns stay on the session
+        so the data context only has to be sent once.
+        """
+        return self.model.start_chat(history=history or [])
+
+    def send_stream(self, chat, message: str, context: str = ""):
+        """
+        Sends one message on a chat session and yields the reply chunk by chunk.
+
+        context should identify everything the reply depends on besides the
+        message (the data context and earlier turns). On a cache hit the turn
+        is appended to the chat history without calling the model. Errors are
+        raised to the caller; a failed reply is not cached.
+        """
+        cached = self._cached(message, context)
+        if cached is not None:
+            chat.history = list(chat.history) + [
+                {"role": "user", "parts": [message]},
+                {"role": "model", "parts": [cached]}
+            ]
+            yield cached
+            return
+        chunks = []
+        try:
+            for chunk in chat.send_message(message, stream=True):
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    yield chunk.text
+            self._store(message, "".join(chunks), context)
+        except Exception:
+            logger.exception("Gemini chat response failed")
+            raise
+
+# One client per model name and one response cache, shared by every caller in the process
+_clients = {}
+_clients_lock = threading.Lock()
+response_cache = default_response_cache()
+
+def get_gemini(model: str = "gemini-1.5-flash") -> Gemini:
+    with _clients_lock:
+        if model not in _clients:
+            gemini = Gemini(model, cache=response_cache)
+            if not hasattr(gemini, "model"):
+                # Construction failed; return it without caching so the next call retries
+                return gemini
+            _clients[model] = gemini
+        return _clients[model]
 
 def main():
-    myAi = Gemini()
+    myAi = get_gemini()
     data = returnFromApi("2024-10-11", "2024-10-21")
     answer = myAi.respond(
         f"""
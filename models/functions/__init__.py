@@ -0,0 +1,68 @@
+"""
+FloraFlow forecasting and analysis functions.
+
+Importing this package does no work: the names below are resolved from
+their submodules on first access, and models and datasets are only loaded
+when a function is called.
+"""
+import importlib
+
+# Public name -> (submodule, attribute)
+_EXPORTS = {
+    'get_predicted_profit': ('predicted_profit', 'get_predicted_profit'),
+    'get_aggregated_results': ('predicted_revenue', 'get_aggregated_results'),
+    'get_total_profit': ('top_profit', 'get_total_revenue'),
+    'get_top_revenue': ('top_revenue', 'get_total_revenue'),
+    'predict_for_days': ('price_forecasting', 'predict_for_days'),
+    'find_best_flower': ('price_forecasting', 'find_best_flower'),
+    'generate_forecast_summary': ('price_forecasting', 'generate_forecast_summary'),
+    'forecast_summary': ('price_forecasting', 'forecast_summary'),
+    'analyze_flower': ('flower_analysis', 'analyze_flower'),
+    'analyze_flowers': ('flower_analysis', 'analyze_flowers'),
+    'predict_daywise_flower_profit': ('flower_price_predictor', 'predict_daywise_flower_profit'),
+    'get_optimal_sales': ('quantity', 'get_optimal_sales'),
+    'optimal_sales_totals': ('quantity', 'optimal_sales_totals'),
+    'predict_flower': ('weather', 'predict_flower'),
+    'predict_flowers': ('weather', 'predict_flowers'),
+    'market_grid': ('weather', 'market_grid'),
+    'load_dataset': ('dataset', 'load_dataset'),
+    'registry': ('registry', 'registry'),
+    'flower_encoding': ('registry', 'flower_encoding'),
+    'artifact_path': ('registry', 'artifact_path'),
+    'PredictionStore': ('prediction_store', 'PredictionStore'),
+    'shared_prediction_store': ('prediction_store', 'shared_prediction_store'),
+    'IntervalIndex': ('interval_index', 'IntervalIndex'),
+    'shared_interval_index': ('interval_index', 'shared_interval_index'),
+    'forecast_totals': ('forecast_engine', 'forecast_totals'),
+    'forecast_scenarios': ('forecast_engine', 'forecast_scenarios'),
+    'GridSurrogate': ('surrogate', 'GridSurrogate'),
+    'forecast_model': ('surrogate', 'forecast_model'),
+    'forecast_cache': ('result_cache', 'forecast_cache'),
+    'cached_forecast': ('result_cache', 'cached_forecast'),
+    'MarketModel': ('synthetic', 'MarketModel'),
+    'generate_market_data': ('synthetic', 'generate_market_data'),
+    'append_records': ('ingest', 'append_records'),
+    'shared_sales_store': ('ingest', 'shared_sales_store'),
+    'live_dataset': ('ingest', 'live_dataset'),
+    'ForecastCube': ('forecast_cube', 'ForecastCube'),
+    'build_cube': ('forecast_cube', 'build_cube'),
+    'shared_forecast_cube': ('forecast_cube', 'shared_forecast_cube'),
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module_name, attribute = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(f'{__name__}.{module_name}'), attribute)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,132 @@
+import threading
+from functools import wraps
+
+import streamlit as st
+
+from models.functions.dataset import DATASET_CSV
+from models.functions.ingest import live_dataset, manifest_path
+from models.functions.registry import artifact_path, registry
+from models.functions.result_cache import artifact_version
+
+# Time-to-live of the Streamlit caches, in seconds
+RESOURCE_TTL = 60 * 60
+DATA_TTL = 15 * 60
+
+# Name -> {"calls", "misses", "ttl", "kind", "function"} of every cached function
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _cached(kind, name, ttl, artifact_paths):
+    """
+    Put a function behind st.cache_data or st.cache_resource.
+
+    The cache is keyed on the function's arguments plus the (size, mtime)
+    version of the files it reads, so a retrained model or a new dataset is
+    picked up without waiting for the TTL. Streamlit caches live in the
+    server process, so every page and every session shares them.
+    """
+    streamlit_cache = st.cache_resource if kind == "resource" else st.cache_data
+
+    def decorator(func):
+        def compute(version, *args, **kwargs):
+            with _stats_lock:
+                _stats[name]["misses"] += 1
+            return func(*args, **kwargs)
+
+        # Streamlit keys its caches on module, qualname and source; the
+        # explicit name keeps the caches of different functions apart
+        compute.__qualname__ = f"{compute.__qualname__}[{name}]"
+        cached = streamlit_cache(ttl=ttl, show_spinner=False)(compute)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _stats_lock:
+                _stats[name]["calls"] += 1
+            return cached(artifact_version(artifact_paths), *args, **kwargs)
+
+        with _stats_lock:
+            _stats[name] = {"calls": 0, "misses": 0, "ttl": ttl, "kind": kind, "function": cached}
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorator
+
+
+def cached_resource(name, ttl=RESOURCE_TTL, artifact_paths=()):
+    """Share one unpickled object (model, dataset) across reruns, pages and sessions."""
+    return _cached("resource", name, ttl, tuple(artifact_paths))
+
+
+def cached_data(name, ttl=DATA_TTL, artifact_paths=()):
+    """Cache a computed result; each caller gets its own copy."""
+    return _cached("data", name, ttl, tuple(artifact_paths))
+
+
+FORECAST_MODEL_PATHS = (artifact_path('revenue_model'), artifact_path('profit_model'), DATASET_CSV)
+
+
+@cached_resource("dataset", artifact_paths=(DATASET_CSV, manifest_path(DATASET_CSV)))
+def dataset(path=DATASET_CSV):
+    """The flower dataset with every ingested record, shared and read-only."""
+    return live_dataset(path)
+
+
+@cached_data("forecast_summary", artifact_paths=FORECAST_MODEL_PATHS)
+def forecast_summary(days):
+    """Forecast summary frame and best flowers over the next `days` days."""
+    from models.functions.price_forecasting import forecast_summary as batched_forecast_summary
+
+    return batched_forecast_summary(days)
+
+
+@cached_resource(
+    "profit_components",
+    artifact_paths=(DATASET_CSV, artifact_path('label_encoder'), artifact_path('scaler_prices')),
+)
+def profit_components():
+    """Dataset, encoders and the per-flower baseline profit used by the Forecasting page."""
+    from models.functions.flower_price_predictor import load_components, calculate_daily_profit
+
+    data, label_encoder, scaler_prices = load_components()
+    return data, label_encoder, scaler_prices, calculate_daily_profit(data)
+
+
+@cached_resource("sales_model", artifact_paths=(artifact_path('sales_model'),))
+def sales_model():
+    """The flower sales optimization model of the Quantity Predictor."""
+    return registry.artifact('sales_model')
+
+
+def cache_stats():
+    """Calls, hits, misses, hit rate and TTL of every cached function."""
+    with _stats_lock:
+        rows = []
+        for name, entry in _stats.items():
+            hits = entry["calls"] - entry["misses"]
+            rows.append({
+                "Cache": name,
+                "Kind": entry["kind"],
+                "Calls": entry["calls"],
+                "Hits": hits,
+                "Misses": entry["misses"],
+                "Hit rate": hits / entry["calls"] if entry["calls"] else 0.0,
+                "TTL (s)": entry["ttl"],
+            })
+    return rows
+
+
+def clear_caches():
+    """Drop every cached value; the next call of each function recomputes it."""
+    with _stats_lock:
+        functions = [entry["function"] for entry in _stats.values()]
+    for function in functions:
+        function.clear()
+
+
+def cache_stats_panel():
+    """Sidebar panel with the cache statistics and a button to clear the caches."""
+    with st.sidebar.expander("Cache stats"):
+        st.dataframe(cache_stats(), hide_index=True)
+        if st.button("Clear caches"):
+            clear_caches()
+            st.rerun()
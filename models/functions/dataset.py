@@ -0,0 +1,101 @@
+import os
+import pandas as pd
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# The CSV stays the source of truth; the Parquet copy next to it is derived from it
+DATASET_CSV = os.path.join(ROOT_DIR, 'data', 'flowers_dataset_cleaned.csv')
+
+CATEGORICAL_COLUMNS = ['Flower Name', 'Weather', 'Customer Segment']
+DATETIME_COLUMNS = ['Start DateTime', 'End DateTime']
+
+# Schema metadata key recording which CSV version a Parquet copy was built from
+FINGERPRINT_KEY = b'floraflow.csv_fingerprint'
+
+
+def columnar_path(csv_path):
+    """Path of the Parquet copy kept next to a CSV file."""
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+
+def csv_fingerprint(csv_path):
+    """Cheap version stamp of a CSV file: size and modification time."""
+    stat = os.stat(csv_path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def read_typed_csv(csv_path):
+    """Parse the CSV with categorical and datetime64 columns already typed."""
+    data = pd.read_csv(csv_path, parse_dates=DATETIME_COLUMNS)
+    for column in CATEGORICAL_COLUMNS:
+        if column in data.columns:
+            data[column] = data[column].astype('category')
+    return data
+
+
+def convert_dataset(csv_path=DATASET_CSV, parquet_path=None):
+    """
+    Convert a CSV file to its typed Parquet copy.
+
+    The copy is written to a temporary file and moved into place, so
+    readers never see a half-written file.
+
+    Returns:
+    - str: Path of the Parquet file.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet_path = parquet_path or columnar_path(csv_path)
+    fingerprint = csv_fingerprint(csv_path)
+
+    table = pa.Table.from_pandas(read_typed_csv(csv_path), preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[FINGERPRINT_KEY] = fingerprint.encode()
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, parquet_path)
+    return parquet_path
+
+
+def is_stale(csv_path, parquet_path):
+    """True when the Parquet copy is missing or was built from another CSV version."""
+    import pyarrow.parquet as pq
+
+    if not os.path.exists(parquet_path):
+        return True
+    metadata = pq.read_schema(parquet_path).metadata or {}
+    return metadata.get(FINGERPRINT_KEY) != csv_fingerprint(csv_path).encode()
+
+
+def load_dataset(csv_path=DATASET_CSV, columns=None):
+    """
+    Load the flower dataset from its memory-mapped Parquet copy.
+
+    The copy is rebuilt first whenever the CSV has changed. Without pyarrow
+    the CSV is parsed directly, with the same column types.
+
+    Parameters:
+    - csv_path (str): Path of the source CSV.
+    - columns (list, optional): Subset of columns to read.
+
+    Returns:
+    - pd.DataFrame: Dataset with categorical and datetime64 columns.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        data = read_typed_csv(csv_path)
+        return data[columns] if columns is not None else data
+
+    parquet_path = columnar_path(csv_path)
+    if is_stale(csv_path, parquet_path):
+        convert_dataset(csv_path, parquet_path)
+
+    return pq.read_table(parquet_path, columns=columns, memory_map=True).to_pandas()
+
+
+if __name__ == "__main__":
+    print(f"Wrote {convert_dataset()}")
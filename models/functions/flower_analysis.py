@@ -1,99 +1,146 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.preprocessing import LabelEncoder
-import joblib
 
-# File paths for the dataset and models
-dataset_path = "data/flowers_dataset_cleaned.csv"
-revenue_model_path = "models/regression/revenue_model_svm.joblib"
-profit_model_path = "models/regression/profit_model_svm.joblib"
+from models.functions.dataset import DATASET_CSV
+from models.functions.registry import flower_encoding, registry
+from models.functions.surrogate import forecast_model
 
-def analyze_flower(flower_name):
+ONE_DAY = np.timedelta64(1, 'D')
+
+def expand_intervals(start_datetimes, end_datetimes):
+    """
+    Expand every [start, end] interval into its daily timestamps at once.
+
+    Matches pd.date_range(start, end, freq='D') per interval: days start at
+    the interval's start time and step by one day while not past the end.
+
+    Parameters:
+    - start_datetimes (array-like): Interval starts (datetime64).
+    - end_datetimes (array-like): Interval ends (datetime64).
+
+    Returns:
+    - np.ndarray: Index of the interval each day belongs to.
+    - np.ndarray: The daily timestamps (datetime64[ns]).
+    """
+    starts = np.asarray(start_datetimes, dtype='datetime64[ns]')
+    ends = np.asarray(end_datetimes, dtype='datetime64[ns]')
+
+    # Days per interval; intervals ending before they start produce none
+    lengths = np.where(ends >= starts, (ends - starts) // ONE_DAY + 1, 0).astype(np.int64)
+
+    row_index = np.repeat(np.arange(len(starts)), lengths)
+    # Offset of each day within its interval: position minus the interval's first position
+    first_positions = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    day_offsets = np.arange(lengths.sum()) - first_positions
+
+    return row_index, starts[row_index] + day_offsets * ONE_DAY
+
+def _first_argmax_per_group(groups, values):
+    """Position of the first maximum of values within each group, keyed by group."""
+    # lexsort is stable, so ties keep the earliest position, as idxmax does
+    order = np.lexsort((-values, groups))
+    group_ids, first = np.unique(groups[order], return_index=True)
+    return dict(zip(group_ids.tolist(), order[first]))
+
+def analyze_flowers(flower_names=None, seed=None, fast=False, dataset_path=DATASET_CSV):
+    """
+    Analyze the revenue and profit forecast of several flowers in one batch.
+
+    Every sale interval of the selected flowers is expanded to days at once
+    and each model predicts once over the stacked rows.
+
+    Parameters:
+    - flower_names (list, optional): Flowers to analyze; all flowers when omitted.
+    - seed (int, optional): Seed for the simulated quantities.
+    - fast (bool): Use the grid surrogates instead of the SVR models.
+    - dataset_path (str): Sales dataset CSV; the repository dataset by default.
+
+    Returns:
+    - dict: Flower name -> summary (or error) as returned by analyze_flower.
+    """
+    # Shared dataset and flower encoding, loaded once per process
+    data = registry.dataset(dataset_path)
+    label_encoder, known_flowers, _ = flower_encoding(dataset_path)
+
+    if flower_names is None:
+        flower_names = list(known_flowers)
+
+    results = {}
+    valid_flowers = []
+    for flower_name in flower_names:
+        if flower_name not in known_flowers:
+            results[flower_name] = {"error": f"'{flower_name}' is not a valid flower name."}
+        else:
+            valid_flowers.append(flower_name)
+
+    flower_data = data[data['Flower Name'].isin(valid_flowers)]
+
+    # Expand every sale interval of the selected flowers into days
+    row_index, dates = expand_intervals(flower_data['Start DateTime'].to_numpy(), flower_data['End DateTime'].to_numpy())
+    encoded_rows = label_encoder.transform(flower_data['Flower Name'].astype(str))[row_index]
+
+    rng = np.random.default_rng(seed)
+    future_data = pd.DataFrame({
+        'Flower Name': encoded_rows,
+        'Qty Sold (kg)': rng.integers(50, 200, size=len(row_index)),  # Random quantities
+        'MRP (₹)': flower_data['MRP (₹)'].to_numpy(dtype=float)[row_index]  # MRP of each sale entry
+    })
+
+    # Shared models (or their fast surrogates), reloaded only when their files change; one predict each
+    predicted_revenue = np.asarray(forecast_model('revenue_model', fast).predict(future_data)) if len(future_data) else np.empty(0)
+    predicted_profit = np.asarray(forecast_model('profit_model', fast).predict(future_data)) if len(future_data) else np.empty(0)
+    qty_sold = future_data['Qty Sold (kg)'].to_numpy()
+
+    max_revenue = _first_argmax_per_group(encoded_rows, predicted_revenue)
+    max_profit = _first_argmax_per_group(encoded_rows, predicted_profit)
+    max_qty = _first_argmax_per_group(encoded_rows, qty_sold)
+
+    def day(position):
+        return str(pd.Timestamp(dates[position]).date())
+
+    for flower_name in valid_flowers:
+        flower_encoded = int(label_encoder.transform([flower_name])[0])
+        if flower_encoded not in max_revenue:
+            results[flower_name] = {"error": f"No data available for flower: {flower_name}"}
+            continue
+
+        revenue_at, profit_at, qty_at = max_revenue[flower_encoded], max_profit[flower_encoded], max_qty[flower_encoded]
+        results[flower_name] = {
+            "Flower Name": flower_name,
+            "Max Revenue": {
+                "Amount": float(predicted_revenue[revenue_at]),
+                "Date": day(revenue_at)
+            },
+            "Max Profit": {
+                "Amount": float(predicted_profit[profit_at]),
+                "Date": day(profit_at)
+            },
+            "Max Quantity Sold": {
+                "Quantity": float(qty_sold[qty_at]),
+                "Date": day(qty_at)
+            }
+        }
+
+    return results
+
+def analyze_flower(flower_name, seed=None, fast=False, dataset_path=DATASET_CSV):
     """
     Analyze a specific flower's revenue and profit forecast.
 
     Parameters:
     - flower_name (str): The name of the flower to analyze.
+    - seed (int, optional): Seed for the simulated quantities.
+    - fast (bool): Use the grid surrogates instead of the SVR models.
+    - dataset_path (str): Sales dataset CSV; the repository dataset by default.
 
     Returns:
     - dict: Summary of the analysis including revenue, profit, and a dataframe of predictions.
     """
-    # Load the dataset
-    data = pd.read_csv(dataset_path)
-
-    # Encode flower names
-    label_encoder = LabelEncoder()
-    data['Flower Name'] = label_encoder.fit_transform(data['Flower Name'])
-    flower_names = label_encoder.classes_
-
-
-    if flower_name not in flower_names:
-        return {"error": f"'{flower_name}' is not a valid flower name."}
-
-    # Load models
-    revenue_model = joblib.load(revenue_model_path)
-    profit_model = joblib.load(profit_model_path)
-
-    # Get the encoded value for the selected flower
-    flower_encoded = label_encoder.transform([flower_name])[0]
-
-    # Filter dataset for the selected flower
-    flower_data = data[data['Flower Name'] == flower_encoded]
-
-    if flower_data.empty:
-        return {"error": f"No data available for flower: {flower_name}"}
-
-    # Generate analysis
-    flower_results = []
-    for _, row in flower_data.iterrows():
-        # Create a date range for predictions
-        date_range = pd.date_range(start=row['Start DateTime'], end=row['End DateTime'], freq='D')
-        freq_qty_sold = np.random.randint(50, 200, len(date_range))  # Random quantities
-        average_price = row['MRP (₹)']  # Use MRP for this flower entry
-
-        future_data = pd.DataFrame({
-            'Flower Name': [flower_encoded] * len(date_range),
-            'Qty Sold (kg)': freq_qty_sold,
-            'MRP (₹)': [average_price] * len(date_range)
-        })
-
-        # Predict revenue and profit
-        future_data['Predicted Revenue'] = revenue_model.predict(future_data[['Flower Name', 'Qty Sold (kg)', 'MRP (₹)']])
-        future_data['Predicted Profit'] = profit_model.predict(future_data[['Flower Name', 'Qty Sold (kg)', 'MRP (₹)']])
-        future_data['Date'] = date_range
-
-        flower_results.append(future_data)
-
-    # Combine results for the selected flower
-    combined_flower_results = pd.concat(flower_results).reset_index(drop=True)
-    combined_flower_results['Flower Name'] = flower_name
-
-    # Generate summary
-    max_revenue_row = combined_flower_results.loc[combined_flower_results['Predicted Revenue'].idxmax()]
-    max_profit_row = combined_flower_results.loc[combined_flower_results['Predicted Profit'].idxmax()]
-    max_qty_row = combined_flower_results.loc[combined_flower_results['Qty Sold (kg)'].idxmax()]
-
-    summary = {
-        "Flower Name": flower_name,
-        "Max Revenue": {
-            "Amount": float(max_revenue_row['Predicted Revenue']),
-            "Date": str(max_revenue_row['Date'].date())
-        },
-        "Max Profit": {
-            "Amount": float(max_profit_row['Predicted Profit']),
-            "Date": str(max_profit_row['Date'].date())
-        },
-        "Max Quantity Sold": {
-            "Quantity": float(max_qty_row['Qty Sold (kg)']),
-            "Date": str(max_qty_row['Date'].date())
-        }
-    }
-
-    return summary
+    return analyze_flowers([flower_name], seed=seed, fast=fast, dataset_path=dataset_path)[flower_name]
 
 
-# User input for the flower name
-flower_name = input("Enter the name of the flower to analyze: ").strip()
-result = analyze_flower(flower_name)
-print(result)
\ No newline at end of file
+if __name__ == "__main__":
+    # User input for the flower name
+    flower_name = input("Enter the name of the flower to analyze: ").strip()
+    result = analyze_flower(flower_name)
+    print(result)
@@ -1,13 +1,13 @@
 import numpy as np
-import pandas as pd
-from sklearn.preprocessing import MinMaxScaler, LabelEncoder
-import joblib
+
+from models.functions.dataset import DATASET_CSV
+from models.functions.registry import registry
 
 # Load necessary components
-def load_components():
-    data = pd.read_csv("data/flowers_dataset_cleaned.csv")
-    label_encoder = joblib.load('models/regression/label_encoder.joblib')
-    scaler_prices = joblib.load('models/regression/scaler_prices.joblib')  # For scaling profit
+def load_components(dataset_path=DATASET_CSV):
+    data = registry.dataset(dataset_path)
+    label_encoder = registry.artifact('label_encoder')
+    scaler_prices = registry.artifact('scaler_prices')  # For scaling profit
     return data, label_encoder, scaler_prices
 
 # Calculate daily profit for each flower (for demonstration, use the last 30 days)
@@ -17,10 +17,10 @@ def calculate_daily_profit(data):
     For simplicity, we'll assume profits vary slightly day by day.
     """
     # Calculate daily profit as the average of MRP for each flower in the last 30 days
-    daily_profit_per_flower = data.groupby('Flower Name')['MRP (₹)'].rolling(30).mean().reset_index()
+    daily_profit_per_flower = data.groupby('Flower Name', observed=True)['MRP (₹)'].rolling(30).mean().reset_index()
     
     # Use the last available daily profit as the baseline profit for the next days
-    daily_profit_per_flower = daily_profit_per_flower.groupby('Flower Name').last()['MRP (₹)']
+    daily_profit_per_flower = daily_profit_per_flower.groupby('Flower Name', observed=True).last()['MRP (₹)']
     
     return daily_profit_per_flower
 
@@ -62,11 +62,11 @@ def forecast_daywise_profit(flower_id, n_days, data, label_encoder, daily_profit
     }
 
 # Wrapper for external usage
-def predict_daywise_flower_profit(flower_id, n_days):
+def predict_daywise_flower_profit(flower_id, n_days, dataset_path=DATASET_CSV):
     """
     Wrapper function to predict day-wise flower profit for external usage.
     """
-    data, label_encoder, scaler_prices = load_components()
+    data, label_encoder, scaler_prices = load_components(dataset_path)
     daily_profit_per_flower = calculate_daily_profit(data)
     
     try:
@@ -81,10 +81,11 @@ def predict_daywise_flower_profit(flower_id, n_days):
     except Exception as e:
         return {"Error": str(e)}
 
-# Example 1: Using flower index
-result = predict_daywise_flower_profit(flower_id=1, n_days=7)
-print(result["Day-wise Profits (₹)"])
+if __name__ == "__main__":
+    # Example 1: Using flower index
+    result = predict_daywise_flower_profit(flower_id=1, n_days=7)
+    print(result["Day-wise Profits (₹)"])
 
-# Example 2: Using flower name
-result = predict_daywise_flower_profit(flower_id="Rose", n_days=7)
-print(result["Day-wise Profits (₹)"])
+    # Example 2: Using flower name
+    result = predict_daywise_flower_profit(flower_id="Rose", n_days=7)
+    print(result["Day-wise Profits (₹)"])
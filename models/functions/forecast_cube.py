@@ -0,0 +1,304 @@
+"""
+Materialized forecast cube: the simulated quantity, predicted revenue and
+predicted profit of every flower for every day of a fixed horizon, plus
+the per-quantity responses the scenario forecasts look up.
+
+Build it nightly (e.g. from cron) with the current models:
+    python -m models.functions.forecast_cube --days 365 [--start 2024-11-01] [--seed 0]
+
+The arrays are saved as .npy files next to a manifest.json and read back
+memory-mapped. Forecast totals over a window inside the cube are two
+slices of its cumulative sums, whatever the length of the window; days
+outside the cube, explicit seeds and a cube built from other model files
+fall back to live inference.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from models.functions.dataset import DATASET_CSV, ROOT_DIR
+from models.functions.forecast_engine import QTY_HIGH, QTY_LOW, forecast_totals, parse_dates, quantity_response_table
+from models.functions.registry import REGRESSION_DIR, artifact_path, flower_encoding, registry
+from models.functions.result_cache import artifact_version
+from models.functions.timing import stage
+
+CUBE_DIR = os.path.join(REGRESSION_DIR, 'forecast_cube')
+CUBE_MANIFEST = os.path.join(CUBE_DIR, 'manifest.json')
+
+# Metrics along the cube's last axis
+CUBE_METRICS = ['Qty Sold (kg)', 'Predicted Revenue', 'Predicted Profit']
+
+# Predicted metric -> registered model
+CUBE_MODELS = {'Predicted Revenue': 'revenue_model', 'Predicted Profit': 'profit_model'}
+
+# Files whose change makes a cube stale
+CUBE_SOURCES = [DATASET_CSV] + [artifact_path(name) for name in CUBE_MODELS.values()]
+
+# Array files of a build, by role; names carry the build stamp
+CUBE_FILES = ('values', 'cumulative', 'responses')
+
+DEFAULT_DAYS = 365
+
+
+def _source_versions():
+    # JSON round-trips tuples as lists, so compare lists
+    return [list(version) if version is not None else None for version in artifact_version(CUBE_SOURCES)]
+
+
+class ForecastCube:
+    """
+    Memory-mapped flowers × days × metrics forecast.
+
+    `values` holds the daily figures and `cumulative` their running sums
+    along the day axis with a leading zero, so the total of days lo..hi-1
+    is cumulative[:, hi] - cumulative[:, lo]. `responses` holds the
+    quantity_response_table of each predicted metric.
+    """
+
+    def __init__(self, manifest, directory):
+        self.manifest = manifest
+        self.start = np.datetime64(manifest['start'], 'D')
+        self.days = manifest['days']
+        self.end = self.start + self.days - 1
+        self.flowers = manifest['flowers']
+        self.metrics = manifest['metrics']
+        self.response_metrics = manifest['response_metrics']
+        self.average_price = manifest['average_price']
+
+        files = manifest['files']
+        self.values = np.load(os.path.join(directory, files['values']), mmap_mode='r')
+        self.cumulative = np.load(os.path.join(directory, files['cumulative']), mmap_mode='r')
+        self.responses = np.load(os.path.join(directory, files['responses']), mmap_mode='r')
+
+    def is_current(self):
+        """Whether the dataset and models are still the files the cube was built from."""
+        return self.manifest['sources'] == _source_versions()
+
+    def serves(self, metrics, flower_names, average_price):
+        """Whether the cube holds these metrics for these flowers at this MRP."""
+        return (set(metrics) <= set(self.response_metrics)
+                and list(flower_names) == self.flowers
+                and bool(np.isclose(average_price, self.average_price)))
+
+    def totals(self, metrics, start, end):
+        """
+        Per-flower totals of metrics over the cube's days between start and end.
+
+        Parameters:
+        - metrics (iterable): Names in CUBE_METRICS.
+        - start, end (np.datetime64): First and last day (inclusive), clipped to the cube.
+
+        Returns:
+        - dict: Metric -> (flowers,) array; zeros when the range misses the cube.
+        """
+        lo = int(np.clip((start - self.start).astype(int), 0, self.days))
+        hi = int(np.clip((end - self.start).astype(int) + 1, lo, self.days))
+        with stage('aggregate'):
+            return {
+                metric: self.cumulative[:, hi, self.metrics.index(metric)]
+                - self.cumulative[:, lo, self.metrics.index(metric)]
+                for metric in metrics
+            }
+
+    def response_table(self, metrics):
+        """quantity_response_table output for metrics, read from the cube."""
+        return {metric: self.responses[self.response_metrics.index(metric)] for metric in metrics}
+
+    def describe(self):
+        """Coverage and provenance of the cube."""
+        return {
+            'start': str(self.start),
+            'end': str(self.end),
+            'days': self.days,
+            'flowers': len(self.flowers),
+            'metrics': self.metrics,
+            'seed': self.manifest['seed'],
+            'created': self.manifest['created'],
+            'current': self.is_current(),
+        }
+
+
+def load_cube(manifest_path):
+    """ForecastCube described by a manifest.json."""
+    with open(manifest_path, encoding='utf-8') as manifest_file:
+        manifest = json.load(manifest_file)
+    return ForecastCube(manifest, os.path.dirname(manifest_path))
+
+
+def shared_forecast_cube(manifest_path=CUBE_MANIFEST):
+    """
+    Process-wide cube, reloaded when a new build replaces its manifest.
+
+    Returns None when no cube was built or when it was built from other
+    dataset or model files than the current ones.
+    """
+    try:
+        cube = registry.file(manifest_path, load_cube)
+    except OSError:
+        return None
+    return cube if cube.is_current() else None
+
+
+def window_totals(models, flower_names, label_encoder, start_date: str, end_date: str, average_price, seed=None):
+    """
+    forecast_totals, served from the forecast cube for the days it covers.
+
+    Without a seed, the days of the range inside the cube are summed from
+    its cumulative arrays and only the days outside it are predicted. A
+    seed asks for a reproducible draw of its own, so it is always
+    forecast live, as is everything when the cube cannot serve the models.
+
+    Returns:
+    - dict: Output name -> {flower name: total} in flower_names order.
+
+    Raises:
+    - ValueError: If a date is malformed or start_date is after end_date.
+    """
+    # Checked before anything else, so the cube and live paths reject the same ranges
+    start, end = (np.datetime64(day, 'D') for day in parse_dates(start_date, end_date))
+
+    cube = shared_forecast_cube() if seed is None else None
+    if cube is None or not cube.serves(models, flower_names, average_price):
+        return forecast_totals(models, flower_names, label_encoder, start_date, end_date, average_price, seed=seed)
+
+    totals = cube.totals(models, start, end)
+
+    # Days before and after the cube, forecast live
+    outside = []
+    if start < cube.start:
+        outside.append((start, min(end, cube.start - 1)))
+    if end > cube.end:
+        outside.append((max(start, cube.end + 1), end))
+
+    for first, last in outside:
+        if first > last:
+            continue
+        live = forecast_totals(models, flower_names, label_encoder, str(first), str(last), average_price)
+        for name, flower_totals in live.items():
+            totals[name] = totals[name] + np.fromiter(flower_totals.values(), dtype=float, count=len(flower_names))
+
+    with stage('aggregate'):
+        return {name: dict(zip(flower_names, values.tolist())) for name, values in totals.items()}
+
+
+def cube_response_table(models, flower_names, average_price):
+    """The cube's quantity_response_table for the models, or None when it cannot serve them."""
+    cube = shared_forecast_cube()
+    if cube is None or not cube.serves(models, flower_names, average_price):
+        return None
+    return cube.response_table(models)
+
+
+def _save_array(path, array):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as array_file:
+        np.save(array_file, array)
+    os.replace(tmp_path, path)
+
+
+def build_cube(days=DEFAULT_DAYS, start=None, seed=0, output_dir=CUBE_DIR):
+    """
+    Forecast every flower for `days` days from `start` and save the cube.
+
+    Quantities are drawn as build_feature_matrix draws them, so the cube
+    holds the same figures as forecast_totals(start, start + days - 1, seed).
+    Each build writes new array files, then swaps the manifest in one
+    rename; files of older builds are removed afterwards.
+
+    Parameters:
+    - days (int): Number of days to forecast.
+    - start (str, optional): First day (YYYY-MM-DD); today by default.
+    - seed (int): Seed for the simulated quantities.
+    - output_dir (str): Directory of the manifest and arrays.
+
+    Returns:
+    - dict: The manifest of the new cube.
+    """
+    if days < 1:
+        raise ValueError("days must be at least 1")
+    start = datetime.strptime(start, "%Y-%m-%d").date() if start else date.today()
+
+    sources = _source_versions()
+    label_encoder, flower_names, average_price = flower_encoding()
+    models = {metric: registry.artifact(name) for metric, name in CUBE_MODELS.items()}
+    encoded_flowers = label_encoder.transform(flower_names)
+
+    # One predict per model over every (flower, quantity) pair; the days are looked up from it
+    table = quantity_response_table(models, encoded_flowers, average_price)
+
+    rng = np.random.default_rng(seed)
+    qty_sold = rng.integers(QTY_LOW, QTY_HIGH, size=len(flower_names) * days).reshape(len(flower_names), days)
+    flower_index = np.arange(len(flower_names))[:, None]
+
+    values = np.empty((len(flower_names), days, len(CUBE_METRICS)))
+    values[:, :, 0] = qty_sold
+    for metric, responses in table.items():
+        values[:, :, CUBE_METRICS.index(metric)] = responses[flower_index, qty_sold - QTY_LOW]
+
+    cumulative = np.zeros((len(flower_names), days + 1, len(CUBE_METRICS)))
+    np.cumsum(values, axis=1, out=cumulative[:, 1:])
+
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+    files = {role: f'{role}-{stamp}.npy' for role in CUBE_FILES}
+    _save_array(os.path.join(output_dir, files['values']), values)
+    _save_array(os.path.join(output_dir, files['cumulative']), cumulative)
+    _save_array(os.path.join(output_dir, files['responses']), np.stack([table[metric] for metric in CUBE_MODELS]))
+
+    manifest = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'start': start.isoformat(),
+        'days': days,
+        'seed': seed,
+        'flowers': [str(flower) for flower in flower_names],
+        'metrics': CUBE_METRICS,
+        'response_metrics': list(CUBE_MODELS),
+        'quantity_range': [QTY_LOW, QTY_HIGH],
+        'average_price': float(average_price),
+        'sources': sources,
+        'files': files,
+    }
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    # Readers that mapped an older build keep their open files; on Windows those cannot be removed yet
+    for name in os.listdir(output_dir):
+        if name.endswith('.npy') and name not in files.values():
+            try:
+                os.remove(os.path.join(output_dir, name))
+            except OSError:
+                pass
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the flower × day forecast cube")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="Number of days to forecast")
+    parser.add_argument("--start", help="First day (YYYY-MM-DD); today by default")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the simulated quantities")
+    parser.add_argument("--output", default=CUBE_DIR, help="Directory of the cube")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        manifest = build_cube(args.days, args.start, args.seed, args.output)
+    except ValueError as e:
+        parser.error(str(e))
+
+    end = datetime.strptime(manifest['start'], "%Y-%m-%d").date() + timedelta(days=manifest['days'] - 1)
+    print(f"Forecast cube: {len(manifest['flowers'])} flowers × {manifest['days']} days × "
+          f"{len(manifest['metrics'])} metrics, {manifest['start']} to {end}, "
+          f"built in {time.perf_counter() - started:.2f}s in {os.path.relpath(args.output, ROOT_DIR)}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+from models.functions.timing import stage
+
+# Column order the SVM regressors were trained on
+FEATURE_COLUMNS = ['Flower Name', 'Qty Sold (kg)', 'MRP (₹)']
+
+# Range of the simulated daily quantities (upper bound exclusive, as np.random.randint)
+QTY_LOW, QTY_HIGH = 50, 200
+
+
+def parse_dates(start_date: str, end_date: str):
+    """
+    Parse two YYYY-MM-DD strings into datetimes.
+
+    Raises:
+    - ValueError: If a date is malformed or start_date is after end_date.
+    """
+    with stage('parse'):
+        start_date = datetime.strptime(start_date, "%Y-%m-%d")
+        end_date = datetime.strptime(end_date, "%Y-%m-%d")
+        if start_date > end_date:
+            raise ValueError("start_date must be on or before end_date")
+        return start_date, end_date
+
+
+def parse_date_range(start_date: str, end_date: str):
+    """Turn two YYYY-MM-DD strings into a daily DatetimeIndex (both ends inclusive); see parse_dates."""
+    start_date, end_date = parse_dates(start_date, end_date)
+    with stage('parse'):
+        return pd.date_range(start=start_date, end=end_date, freq='D')
+
+
+def build_feature_matrix(encoded_flowers, n_days, average_price, seed=None):
+    """
+    Build a single flowers × days feature frame for the regression models.
+
+    Rows are laid out flower-major, so predictions reshape to (flowers, days).
+
+    Parameters:
+    - encoded_flowers (array-like): Label-encoded flower ids.
+    - n_days (int): Number of days to forecast per flower.
+    - average_price (float): MRP used for every row.
+    - seed (int, optional): Seed for the simulated quantities.
+
+    Returns:
+    - pd.DataFrame: Feature frame with FEATURE_COLUMNS.
+    """
+    with stage('frame'):
+        encoded_flowers = np.asarray(encoded_flowers)
+        rng = np.random.default_rng(seed)
+        qty_sold = rng.integers(QTY_LOW, QTY_HIGH, size=len(encoded_flowers) * n_days)
+
+        return pd.DataFrame({
+            'Flower Name': np.repeat(encoded_flowers, n_days),
+            'Qty Sold (kg)': qty_sold,
+            'MRP (₹)': np.full(len(qty_sold), average_price, dtype=float)
+        }, columns=FEATURE_COLUMNS)
+
+
+def forecast_grid(models, encoded_flowers, n_days, average_price, seed=None):
+    """
+    Run one predict per model over every flower and day.
+
+    Parameters:
+    - models (dict): Output name -> fitted regressor.
+    - encoded_flowers (array-like): Label-encoded flower ids.
+    - n_days (int): Number of days to forecast.
+    - average_price (float): MRP used for every row.
+    - seed (int, optional): Seed for the simulated quantities.
+
+    Returns:
+    - dict: Output name -> (flowers, days) array of predictions.
+    """
+    n_flowers = len(encoded_flowers)
+    future_data = build_feature_matrix(encoded_flowers, n_days, average_price, seed=seed)
+
+    with stage('predict'):
+        return {
+            name: np.asarray(model.predict(future_data)).reshape(n_flowers, n_days)
+            for name, model in models.items()
+        }
+
+
+def forecast_totals(models, flower_names, label_encoder, start_date: str, end_date: str,
+                    average_price, seed=None):
+    """
+    Forecast every flower over a date range and sum the predictions per flower.
+
+    All models share the same simulated quantities, so revenue and profit
+    totals come from one pass over the same feature matrix.
+
+    Returns:
+    - dict: Output name -> {flower name: total} in flower_names order.
+    """
+    date_range = parse_date_range(start_date, end_date)
+    with stage('frame'):
+        encoded_flowers = label_encoder.transform(flower_names)
+
+    grid = forecast_grid(models, encoded_flowers, len(date_range), average_price, seed=seed)
+
+    with stage('aggregate'):
+        return {
+            name: dict(zip(flower_names, predictions.sum(axis=1).tolist()))
+            for name, predictions in grid.items()
+        }
+
+
+def rank_totals(totals: dict):
+    """Sort a {flower: total} dict from the highest total to the lowest."""
+    with stage('aggregate'):
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+# Percentiles reported for scenario forecasts
+SCENARIO_PERCENTILES = (10, 50, 90)
+
+# Upper bound on scenario × flower × day cells drawn at once, to cap memory
+MAX_SCENARIO_CELLS = 20_000_000
+
+
+def quantity_response_table(models, encoded_flowers, average_price):
+    """
+    Predict every model once for every flower and every possible daily quantity.
+
+    Quantities are integers in [QTY_LOW, QTY_HIGH) and the MRP is fixed, so
+    this (flowers, quantities) table holds every prediction a forecast can
+    need; scenario draws are then looked up instead of predicted.
+
+    Returns:
+    - dict: Output name -> (flowers, QTY_HIGH - QTY_LOW) array.
+    """
+    with stage('frame'):
+        encoded_flowers = np.asarray(encoded_flowers)
+        quantities = np.arange(QTY_LOW, QTY_HIGH)
+
+        grid = pd.DataFrame({
+            'Flower Name': np.repeat(encoded_flowers, len(quantities)),
+            'Qty Sold (kg)': np.tile(quantities, len(encoded_flowers)),
+            'MRP (₹)': np.full(len(encoded_flowers) * len(quantities), average_price, dtype=float)
+        }, columns=FEATURE_COLUMNS)
+
+    with stage('predict'):
+        return {
+            name: np.asarray(model.predict(grid)).reshape(len(encoded_flowers), len(quantities))
+            for name, model in models.items()
+        }
+
+
+def forecast_scenarios(models, flower_names, label_encoder, start_date: str, end_date: str,
+                       average_price, n_scenarios, seed=None, table=None):
+    """
+    Monte Carlo forecast of per-flower totals over a date range.
+
+    Draws a (scenarios, flowers, days) tensor of quantities, looks up the
+    predictions of each model and sums them per scenario and flower. A
+    precomputed quantity_response_table (e.g. the forecast cube's) can be
+    passed as table to skip the predictions.
+
+    Returns:
+    - dict: Output name -> {flower name: {"mean", "p10", "p50", "p90"}}.
+
+    Raises:
+    - ValueError: If start_date is after end_date or n_scenarios is not positive.
+    """
+    date_range = parse_date_range(start_date, end_date)
+    if n_scenarios < 1:
+        raise ValueError("n_scenarios must be at least 1")
+
+    with stage('frame'):
+        encoded_flowers = label_encoder.transform(flower_names)
+    n_flowers, n_days = len(encoded_flowers), len(date_range)
+
+    if table is None:
+        table = quantity_response_table(models, encoded_flowers, average_price)
+
+    with stage('aggregate'):
+        totals = {name: np.empty((n_scenarios, n_flowers)) for name in table}
+
+        # Draw the scenarios in chunks so long ranges do not exhaust memory
+        rng = np.random.default_rng(seed)
+        chunk = max(1, MAX_SCENARIO_CELLS // (n_flowers * n_days))
+        flower_index = np.arange(n_flowers)[None, :, None]
+        for first in range(0, n_scenarios, chunk):
+            size = min(chunk, n_scenarios - first)
+            qty_index = rng.integers(0, QTY_HIGH - QTY_LOW, size=(size, n_flowers, n_days))
+            for name, responses in table.items():
+                totals[name][first:first + size] = responses[flower_index, qty_index].sum(axis=2)
+
+        result = {}
+        for name, scenario_totals in totals.items():
+            mean = scenario_totals.mean(axis=0)
+            p10, p50, p90 = np.percentile(scenario_totals, SCENARIO_PERCENTILES, axis=0)
+            result[name] = {
+                flower: {"mean": float(mean[i]), "p10": float(p10[i]), "p50": float(p50[i]), "p90": float(p90[i])}
+                for i, flower in enumerate(flower_names)
+            }
+        return result
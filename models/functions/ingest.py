@@ -0,0 +1,489 @@
+"""
+Incremental ingestion of new sale records.
+
+Accepted batches are appended to a log next to the dataset
+(data/flowers_dataset_cleaned.ingested/): one part file per batch and a
+manifest listing them. The manifest is replaced atomically, so readers see
+either the old or the new version, never half a batch. Running processes
+load only the parts they have not seen yet and update the daily aggregates
+and the label vocabulary from those parts alone.
+
+Run as a script (from the repository root):
+    python -m models.functions.ingest append new_sales.ndjson more_sales.csv
+    python -m models.functions.ingest watch incoming/ --interval 2
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from models.functions.dataset import CATEGORICAL_COLUMNS, DATASET_CSV, DATETIME_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Columns every record must have, and the snake_case keys accepted for them
+REQUIRED_COLUMNS = ['Flower Name', 'MRP (₹)', 'Qty Sold (kg)', 'Weather', 'Customer Segment',
+                    'Start DateTime', 'End DateTime']
+NUMERIC_COLUMNS = ['MRP (₹)', 'Qty Sold (kg)', 'Revenue', 'Profit Margin', 'Sale Frequency',
+                   'Weather Impact Score', 'Customer Segment Score', 'Profit Percentage']
+SALE_ALIASES = {
+    'flower_name': 'Flower Name', 'mrp': 'MRP (₹)', 'qty_sold': 'Qty Sold (kg)', 'weather': 'Weather',
+    'customer_segment': 'Customer Segment', 'start_datetime': 'Start DateTime', 'end_datetime': 'End DateTime',
+    'revenue': 'Revenue', 'profit_margin': 'Profit Margin', 'sale_frequency': 'Sale Frequency',
+    'weather_impact_score': 'Weather Impact Score', 'customer_segment_score': 'Customer Segment Score',
+    'demand': 'Demand', 'profit_percentage': 'Profit Percentage',
+}
+
+# Profit percentage of records that do not carry one, as in the dataset
+DEFAULT_PROFIT_PERCENTAGE = 20.0
+
+# Keys and summed columns of the materialized aggregates
+AGGREGATE_KEYS = ['Flower Name', 'Day', 'Customer Segment']
+AGGREGATE_SUMS = ['Qty Sold (kg)', 'Revenue', 'Profit Margin']
+
+# Batch file suffix -> format, for the watcher
+BATCH_FORMATS = {'.ndjson': 'ndjson', '.jsonl': 'ndjson', '.csv': 'csv'}
+
+MANIFEST = 'manifest.json'
+
+
+def ingest_dir(csv_path=DATASET_CSV):
+    """Directory of the ingestion log of a dataset."""
+    return os.path.splitext(os.path.abspath(csv_path))[0] + '.ingested'
+
+
+def manifest_path(csv_path=DATASET_CSV):
+    return os.path.join(ingest_dir(csv_path), MANIFEST)
+
+
+def read_manifest(directory):
+    """Version, part files and added vocabulary of a log; an empty log when there is none."""
+    try:
+        with open(os.path.join(directory, MANIFEST)) as manifest_file:
+            return json.load(manifest_file)
+    except FileNotFoundError:
+        return {"version": 0, "parts": [], "vocabulary": {}}
+
+
+def _replace_file(path, write):
+    """Write a file through a temporary copy and move it into place."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def _log_lock(directory):
+    """Exclusive lock on a log, across threads and processes."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, '.lock'), 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def validate_records(data, columns):
+    """
+    Check and type a batch of sale records.
+
+    Records need REQUIRED_COLUMNS (or their SALE_ALIASES keys): non-empty
+    names, positive MRP and quantity, and parseable start/end times with the
+    end not before the start. Revenue, Profit Margin, Profit Percentage and
+    Sales Duration (hours) are derived when missing.
+
+    Parameters:
+    - data (pd.DataFrame, dict or list): Records of the batch.
+    - columns (list): Columns of the dataset, in order.
+
+    Returns:
+    - pd.DataFrame: The valid records with the dataset's columns.
+    - list: {"row", "error"} of every rejected record (row is its position in the batch).
+    """
+    frame = pd.DataFrame(data).rename(columns=SALE_ALIASES).reset_index(drop=True)
+    missing = [column for column in REQUIRED_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    # First problem found in each row; empty when the row is valid
+    errors = pd.Series('', index=frame.index, dtype=object)
+
+    def reject(mask, message):
+        errors[mask & (errors == '')] = message
+
+    for column in CATEGORICAL_COLUMNS:
+        values = frame[column].astype('string').str.strip()
+        reject((values.isna() | (values == '')).to_numpy(dtype=bool), f"{column} is empty")
+        frame[column] = values
+
+    for column in NUMERIC_COLUMNS:
+        if column in frame.columns:
+            values = pd.to_numeric(frame[column], errors='coerce')
+            reject(values.isna() & frame[column].notna(), f"{column} is not a number")
+            frame[column] = values
+    for column in ['MRP (₹)', 'Qty Sold (kg)']:
+        reject(frame[column].isna(), f"{column} is missing")
+        reject(frame[column] <= 0, f"{column} must be positive")
+
+    for column in DATETIME_COLUMNS:
+        values = pd.to_datetime(frame[column], errors='coerce', format='ISO8601')
+        reject(values.isna(), f"{column} is not a YYYY-MM-DD HH:MM:SS time")
+        frame[column] = values
+    reject(frame['End DateTime'] < frame['Start DateTime'], "End DateTime is before Start DateTime")
+
+    rejected = [{"row": int(row), "error": error} for row, error in errors[errors != ''].items()]
+    valid = frame[(errors == '').to_numpy()].copy()
+
+    # Derived columns, following the dataset's rules
+    if 'Revenue' not in valid.columns:
+        valid['Revenue'] = valid['MRP (₹)'] * valid['Qty Sold (kg)']
+    if 'Profit Percentage' not in valid.columns:
+        valid['Profit Percentage'] = DEFAULT_PROFIT_PERCENTAGE
+    if 'Profit Margin' not in valid.columns:
+        valid['Profit Margin'] = valid['Revenue'] * valid['Profit Percentage'] / 100
+    valid['Sales Duration (hours)'] = (valid['End DateTime'] - valid['Start DateTime']) / pd.Timedelta(hours=1)
+
+    return valid.reindex(columns=columns).reset_index(drop=True), rejected
+
+
+def daily_aggregates(data):
+    """Number of sales and AGGREGATE_SUMS per flower, start day and customer segment."""
+    keys = pd.DataFrame({
+        'Flower Name': data['Flower Name'].astype(str).to_numpy(),
+        'Day': data['Start DateTime'].dt.normalize().to_numpy(),
+        'Customer Segment': data['Customer Segment'].astype(str).to_numpy(),
+    })
+    values = data[AGGREGATE_SUMS].reset_index(drop=True).assign(Sales=1)
+    return pd.concat([keys, values], axis=1).groupby(AGGREGATE_KEYS, sort=True).sum()
+
+
+def combine_aggregates(*aggregates):
+    """Sum aggregate tables over their keys; only the (small) tables are touched, not the records."""
+    return pd.concat(aggregates).groupby(level=AGGREGATE_KEYS, sort=True).sum()
+
+
+def base_vocabulary(data):
+    """Label vocabulary of a frame: the categories of each categorical column."""
+    return {column: [str(value) for value in data[column].astype('category').cat.categories]
+            for column in CATEGORICAL_COLUMNS}
+
+
+def _read_part(path):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, parse_dates=DATETIME_COLUMNS)
+
+
+def _write_part(frame, directory, version):
+    """Write a batch as a part of the log (Parquet, or CSV without pyarrow); returns its file name."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        name, write = f"part-{version:06d}.csv", lambda tmp_path: frame.to_csv(tmp_path, index=False)
+    else:
+        name, write = f"part-{version:06d}.parquet", lambda tmp_path: frame.to_parquet(tmp_path, index=False)
+    _replace_file(os.path.join(directory, name), write)
+    return name
+
+
+def append_records(data, csv_path=DATASET_CSV):
+    """
+    Validate a batch and append its valid records to the dataset's log.
+
+    The new label values (flowers, weathers, segments) are appended to the
+    vocabulary, so the codes of the existing ones never change.
+
+    Returns:
+    - dict: {"version", "accepted", "rejected"}; version is the log version
+      holding the batch (unchanged when nothing was accepted).
+    """
+    from models.functions.registry import registry
+
+    base = registry.dataset(csv_path)
+    valid, rejected = validate_records(data, list(base.columns))
+    directory = ingest_dir(csv_path)
+
+    if valid.empty:
+        return {"version": read_manifest(directory)["version"], "accepted": 0, "rejected": rejected}
+
+    with _log_lock(directory):
+        manifest = read_manifest(directory)
+        version = manifest["version"] + 1
+
+        known = base_vocabulary(base)
+        for column in CATEGORICAL_COLUMNS:
+            added = manifest["vocabulary"].setdefault(column, [])
+            seen = set(known[column]) | set(added)
+            for value in valid[column].drop_duplicates():
+                if value not in seen:
+                    added.append(value)
+                    seen.add(value)
+
+        part = _write_part(valid, directory, version)
+
+        manifest["version"] = version
+        manifest["parts"].append({"file": part, "rows": len(valid)})
+        _replace_file(os.path.join(directory, MANIFEST),
+                      lambda tmp_path: _dump_json(manifest, tmp_path))
+
+    return {"version": version, "accepted": len(valid), "rejected": rejected}
+
+
+def _dump_json(value, path):
+    with open(path, 'w') as json_file:
+        json.dump(value, json_file, indent=2)
+
+
+class Snapshot:
+    """
+    One consistent version of the sales: the dataset plus the ingested parts.
+
+    Snapshots are immutable; a new log version produces a new snapshot, so
+    a reader holding one keeps a consistent view while others move on.
+    """
+
+    def __init__(self, version, csv_path, base, parts, part_files, aggregates, vocabulary):
+        self.version = version
+        self.csv_path = csv_path
+        self.base = base
+        self.parts = parts
+        self.part_files = part_files
+        self.aggregates = aggregates
+        self.vocabulary = vocabulary
+
+    @cached_property
+    def frame(self):
+        """All records, with the vocabulary as categories; the dataset itself when nothing was ingested."""
+        if not self.parts:
+            return self.base
+
+        frames = []
+        for data in [self.base] + self.parts:
+            data = data.copy(deep=False)
+            for column in CATEGORICAL_COLUMNS:
+                data[column] = pd.Categorical(data[column].astype(str), categories=self.vocabulary[column])
+            frames.append(data)
+        return pd.concat(frames, ignore_index=True)
+
+    @cached_property
+    def interval_index(self):
+        """Interval index over frame (the shared dataset index when nothing was ingested)."""
+        from models.functions.interval_index import IntervalIndex, shared_interval_index
+
+        if not self.parts:
+            return shared_interval_index(self.csv_path)
+        return IntervalIndex(self.frame)
+
+    def totals(self, start_date=None, end_date=None, flower_name=None, customer_segment=None,
+               group_by=AGGREGATE_KEYS):
+        """
+        Sales, quantity, revenue and profit margin from the aggregates.
+
+        Parameters:
+        - start_date, end_date (str, optional): Inclusive range of sale start days.
+        - flower_name, customer_segment (str, optional): Restrict to one flower or segment.
+        - group_by (list): Subset of AGGREGATE_KEYS to group by.
+
+        Returns:
+        - pd.DataFrame: One row per group.
+        """
+        aggregates = self.aggregates.reset_index()
+        mask = np.ones(len(aggregates), dtype=bool)
+        if start_date is not None:
+            mask &= (aggregates['Day'] >= pd.Timestamp(start_date)).to_numpy()
+        if end_date is not None:
+            mask &= (aggregates['Day'] <= pd.Timestamp(end_date)).to_numpy()
+        if flower_name is not None:
+            mask &= (aggregates['Flower Name'] == flower_name).to_numpy()
+        if customer_segment is not None:
+            mask &= (aggregates['Customer Segment'] == customer_segment).to_numpy()
+
+        selected = aggregates[mask]
+        columns = ['Sales'] + AGGREGATE_SUMS
+        if not group_by:
+            return selected[columns].sum().to_frame().T.astype({'Sales': int})
+        return selected.groupby(list(group_by), sort=True)[columns].sum().reset_index()
+
+
+class SalesStore:
+    """
+    Process-wide reader of a dataset and its ingestion log.
+
+    snapshot() costs one stat while the log is unchanged; on a new version
+    only the new parts are read, and the aggregates and vocabulary are
+    updated from them.
+    """
+
+    def __init__(self, base, csv_path=DATASET_CSV):
+        self.csv_path = csv_path
+        self.directory = ingest_dir(csv_path)
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._snapshot = Snapshot(0, csv_path, base, [], [], daily_aggregates(base), base_vocabulary(base))
+
+    def _manifest_stamp(self):
+        try:
+            stat = os.stat(os.path.join(self.directory, MANIFEST))
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def snapshot(self):
+        """The latest version of the sales."""
+        stamp = self._manifest_stamp()
+        if stamp == self._stamp:
+            return self._snapshot
+
+        with self._lock:
+            if stamp != self._stamp:
+                self._snapshot = self._advance(read_manifest(self.directory))
+                self._stamp = stamp
+        return self._snapshot
+
+    def _advance(self, manifest):
+        current = self._snapshot
+        files = [part["file"] for part in manifest["parts"]]
+
+        # The log only grows; anything else (a reset log) means starting over
+        if files[:len(current.part_files)] != current.part_files:
+            current = Snapshot(0, self.csv_path, current.base, [], [],
+                               daily_aggregates(current.base), base_vocabulary(current.base))
+
+        new_files = files[len(current.part_files):]
+        new_parts = [_read_part(os.path.join(self.directory, name)) for name in new_files]
+        aggregates = combine_aggregates(current.aggregates, *map(daily_aggregates, new_parts)) if new_parts \
+            else current.aggregates
+
+        vocabulary = base_vocabulary(current.base)
+        for column, added in manifest["vocabulary"].items():
+            vocabulary[column] += [value for value in added if value not in vocabulary[column]]
+
+        return Snapshot(manifest["version"], self.csv_path, current.base, current.parts + new_parts,
+                        current.part_files + new_files, aggregates, vocabulary)
+
+
+def shared_sales_store(csv_path=DATASET_CSV):
+    """Process-wide SalesStore of a dataset, rebuilt when the dataset file itself changes."""
+    from models.functions.registry import registry
+
+    return registry.derived(f'sales_store:{os.path.abspath(csv_path)}',
+                            lambda base: SalesStore(base, csv_path), ('dataset', csv_path))
+
+
+def live_dataset(csv_path=DATASET_CSV):
+    """The dataset with every ingested record, at the latest log version."""
+    return shared_sales_store(csv_path).snapshot().frame
+
+
+def live_interval_index(csv_path=DATASET_CSV):
+    """Interval index over live_dataset()."""
+    return shared_sales_store(csv_path).snapshot().interval_index
+
+
+def read_batch(source, file_format):
+    """Records of an NDJSON or CSV batch (a path or a file-like object)."""
+    if file_format == 'ndjson':
+        return pd.read_json(source, lines=True, dtype=False, convert_dates=False)
+    if file_format == 'csv':
+        return pd.read_csv(source)
+    raise ValueError(f"Unknown batch format {file_format!r}; expected ndjson or csv")
+
+
+def batch_format(path):
+    return BATCH_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def ingest_file(path, csv_path=DATASET_CSV):
+    """Append the records of one batch file."""
+    file_format = batch_format(path)
+    if file_format is None:
+        raise ValueError(f"Unknown batch file type: {path}")
+    return append_records(read_batch(path, file_format), csv_path)
+
+
+def watch(directory, csv_path=DATASET_CSV, interval=2.0, once=False):
+    """
+    Ingest every batch file dropped into a directory.
+
+    Files are processed in name order and moved to processed/ (or to
+    failed/ when unreadable or with no valid record), with the rejected
+    records next to them as <name>.rejected.json. Producers should write
+    under a dot-prefixed or unlisted name and rename when done, so a
+    half-written file is never picked up.
+    """
+    processed_dir = os.path.join(directory, 'processed')
+    failed_dir = os.path.join(directory, 'failed')
+    os.makedirs(processed_dir, exist_ok=True)
+    os.makedirs(failed_dir, exist_ok=True)
+
+    while True:
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if name.startswith('.') or not os.path.isfile(path) or batch_format(name) is None:
+                continue
+
+            try:
+                result = ingest_file(path, csv_path)
+            except (ValueError, pd.errors.ParserError) as e:
+                result = {"accepted": 0, "rejected": [], "error": str(e)}
+
+            target_dir = processed_dir if result["accepted"] else failed_dir
+            os.replace(path, os.path.join(target_dir, name))
+            if result["rejected"] or "error" in result:
+                _dump_json(result, os.path.join(target_dir, f"{name}.rejected.json"))
+            if "error" in result:
+                logger.warning("%s: not ingested (%s)", name, result["error"])
+            elif result["accepted"]:
+                logger.info("%s: %d accepted, %d rejected, version %s",
+                            name, result["accepted"], len(result["rejected"]), result["version"])
+            else:
+                logger.warning("%s: no valid record, %d rejected", name, len(result["rejected"]))
+
+        if once:
+            return
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ingest new sale records")
+    parser.add_argument("--dataset", default=DATASET_CSV, help="Dataset the records are appended to")
+    commands = parser.add_subparsers(dest="command", required=True)
+    append_parser = commands.add_parser("append", help="Append NDJSON or CSV batch files")
+    append_parser.add_argument("files", nargs='+')
+    watch_parser = commands.add_parser("watch", help="Ingest batch files dropped into a directory")
+    watch_parser.add_argument("directory")
+    watch_parser.add_argument("--interval", type=float, default=2.0, help="Seconds between directory scans")
+    watch_parser.add_argument("--once", action="store_true", help="Process the current files and exit")
+    args = parser.parse_args()
+
+    # Progress goes to the log (stderr); stdout only carries the append results, one JSON line per file
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.command == "append":
+        for batch_path in args.files:
+            print(json.dumps({"file": batch_path, **ingest_file(batch_path, args.dataset)}))
+    else:
+        watch(args.directory, args.dataset, args.interval, args.once)
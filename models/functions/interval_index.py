@@ -0,0 +1,111 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from models.functions.dataset import DATASET_CSV
+
+
+def day_bounds(start_date, end_date):
+    """First and last instant of two calendar days, for whole-day inclusive queries."""
+    start = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+    return start, end
+
+
+class _Partition:
+    """Sale intervals of one flower (or of all flowers), sorted by start."""
+
+    def __init__(self, starts, ends, positions):
+        order = np.argsort(starts, kind='stable')
+        self.starts = starts[order]
+        self.ends = ends[order]
+        self.positions = positions[order]
+        # Longest interval; an interval overlapping [a, b] must start at or after a - max_duration
+        self.max_duration = (self.ends - self.starts).max() if len(order) else np.timedelta64(0, 'ns')
+
+    def _start_slice(self, low, high):
+        return (np.searchsorted(self.starts, low, side='left'),
+                np.searchsorted(self.starts, high, side='right'))
+
+
+class IntervalIndex:
+    """
+    Index over the Start/End DateTime intervals of the sale records.
+
+    Intervals are partitioned per flower and sorted by start. "Starting
+    within" queries are two binary searches; "contained in" and
+    "overlapping" queries binary-search the candidate window by start and
+    only check the end times inside it. All bounds are inclusive.
+
+    Queries return row positions in the indexed frame, in frame order.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.frame = data
+
+        starts = data['Start DateTime'].to_numpy(dtype='datetime64[ns]')
+        ends = data['End DateTime'].to_numpy(dtype='datetime64[ns]')
+        flowers = data['Flower Name'].astype(str).to_numpy()
+        positions = np.arange(len(data))
+
+        # Records with a missing start or end never match a range query
+        valid = ~(np.isnat(starts) | np.isnat(ends))
+        starts, ends, flowers, positions = starts[valid], ends[valid], flowers[valid], positions[valid]
+
+        self._all = _Partition(starts, ends, positions)
+        self._flowers = {}
+        for flower_name in np.unique(flowers):
+            mask = flowers == flower_name
+            self._flowers[flower_name] = _Partition(starts[mask], ends[mask], positions[mask])
+
+    def _partition(self, flower_name):
+        if flower_name is None:
+            return self._all
+        return self._flowers.get(flower_name)
+
+    @staticmethod
+    def _bound(value):
+        return np.datetime64(pd.Timestamp(value), 'ns')
+
+    def starting_within(self, start, end, flower_name=None):
+        """Positions of the records whose start lies in [start, end]."""
+        partition = self._partition(flower_name)
+        if partition is None:
+            return np.empty(0, dtype=np.int64)
+
+        lo, hi = partition._start_slice(self._bound(start), self._bound(end))
+        return np.sort(partition.positions[lo:hi])
+
+    def contained_in(self, start, end, flower_name=None):
+        """Positions of the records with start >= start and end <= end."""
+        partition = self._partition(flower_name)
+        if partition is None:
+            return np.empty(0, dtype=np.int64)
+
+        end = self._bound(end)
+        lo, hi = partition._start_slice(self._bound(start), end)
+        inside = partition.ends[lo:hi] <= end
+        return np.sort(partition.positions[lo:hi][inside])
+
+    def overlapping(self, start, end, flower_name=None):
+        """Positions of the records with start <= end and end >= start."""
+        partition = self._partition(flower_name)
+        if partition is None:
+            return np.empty(0, dtype=np.int64)
+
+        start, end = self._bound(start), self._bound(end)
+        lo, hi = partition._start_slice(start - partition.max_duration, end)
+        inside = partition.ends[lo:hi] >= start
+        return np.sort(partition.positions[lo:hi][inside])
+
+    def take(self, positions):
+        """Rows of the indexed frame at the given positions."""
+        return self.frame.iloc[positions]
+
+
+def shared_interval_index(path=DATASET_CSV):
+    """Process-wide index over the dataset's sale intervals, rebuilt when the dataset changes."""
+    from models.functions.registry import registry
+
+    return registry.derived(f'interval_index:{os.path.abspath(path)}', IntervalIndex, ('dataset', path))
@@ -1,31 +1,28 @@
-import pandas as pd
-import joblib
-from datetime import datetime
-
-# Load the pre-saved prediction summary
-prediction_summary = joblib.load('models/regression/prediction_summary.joblib')
+from models.functions.prediction_store import shared_prediction_store
+from models.functions.registry import artifact_path
+from models.functions.result_cache import cached_forecast
 
 # Function to get predicted profit as dictionary based on start_date and end_date
-def get_predicted_profit(start_date: str, end_date: str):
-    # Convert string dates to datetime
-    start_date = datetime.strptime(start_date, "%Y-%m-%d")
-    end_date = datetime.strptime(end_date, "%Y-%m-%d")
-    
-    # Ensure that 'Date' column is in datetime format
-    prediction_summary['Date'] = pd.to_datetime(prediction_summary['Date'])
+@cached_forecast('predicted_profit', [artifact_path('prediction_summary')])
+def get_predicted_profit(start_date: str, end_date: str, daily: bool = False):
+    prediction_store = shared_prediction_store()
 
-    # Filter the data based on the date range
-    filtered_data = prediction_summary[(prediction_summary['Date'] >= start_date) & (prediction_summary['Date'] <= end_date)]
+    # Total predicted profit per flower over the range, from the prefix sums
+    profit_dict = prediction_store.query(start_date, end_date, 'Predicted Profit')
+    if not daily:
+        return profit_dict
 
-    # Create a dictionary with 'Date' as the key and 'Predicted Profit' as the value
-    profit_dict = {(row['Flower Name']):row["Predicted Profit"]
-    for _, row in filtered_data.iterrows()}
-    return profit_dict
+    # Optionally include the per-day series for each flower
+    series = prediction_store.series(start_date, end_date, 'Predicted Profit')
+    daily_dict = {flower: {str(date.date()): value for date, value in values.items()}
+                  for flower, values in series.items()}
+    return {"totals": profit_dict, "daily": daily_dict}
 
-# Example usage:
-start_date = "2024-11-01"
-end_date = "2024-11-30"
-predicted_profit_dict = get_predicted_profit(start_date, end_date)
+if __name__ == "__main__":
+    # Example usage:
+    start_date = "2024-11-01"
+    end_date = "2024-11-30"
+    predicted_profit_dict = get_predicted_profit(start_date, end_date)
 
-# Print the predicted profit dictionary
-print(predicted_profit_dict)
+    # Print the predicted profit dictionary
+    print(predicted_profit_dict)
@@ -1,75 +1,28 @@
-import pandas as pd
-import numpy as np
-import joblib
-from datetime import datetime
-from sklearn.preprocessing import LabelEncoder
-
-# Load the revenue model
-revenue_model = joblib.load('models/regression/revenue_model_svm.joblib')
-
-# Load dataset
-data = pd.read_csv("data/flowers_dataset_cleaned.csv")
-
-# Encode flower names
-label_encoder = LabelEncoder()
-data['Flower Name Encoded'] = label_encoder.fit_transform(data['Flower Name'])
-flower_names = label_encoder.classes_
+from models.functions.dataset import DATASET_CSV
+from models.functions.forecast_cube import CUBE_MANIFEST, window_totals
+from models.functions.registry import artifact_path, flower_encoding
+from models.functions.surrogate import forecast_model
+from models.functions.result_cache import cached_forecast
 
 # Function to get aggregated results
-def get_aggregated_results(start_date: str, end_date: str):
-    # Convert string dates to datetime
-    start_date = datetime.strptime(start_date, "%Y-%m-%d")
-    end_date = datetime.strptime(end_date, "%Y-%m-%d")
-
-    # Generate date range
-    date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-
-    results = []
-
-    for flower in flower_names:
-        # Get encoded value for flower
-        encoded_flower = label_encoder.transform([flower])[0]
-
-        # Randomly generate quantities for each day
-        freq_qty_sold = np.random.randint(50, 200, len(date_range))
-        average_price = data['MRP (₹)'].mean()
-
-        # Prepare future data for predictions
-        future_data = pd.DataFrame({
-            'Flower Name': [encoded_flower] * len(date_range),
-            'Qty Sold (kg)': freq_qty_sold,
-            'MRP (₹)': [average_price] * len(date_range)
-        })
-
-        # Predict revenue
-        predicted_revenue = revenue_model.predict(future_data)
-
-        # Collect results
-        for i, single_date in enumerate(date_range):
-            results.append({
-                'Flower Name': flower,
-                'Date': single_date,
-                'Predicted Revenue': predicted_revenue[i]
-            })
-
-    # Create a DataFrame with all the results
-    prediction_summary = pd.DataFrame(results)
+@cached_forecast('aggregated_revenue', [DATASET_CSV, artifact_path('revenue_model'), CUBE_MANIFEST])
+def get_aggregated_results(start_date: str, end_date: str, seed=None, fast=False):
+    # Shared, lazily loaded encoder and model (or its fast surrogate); reloaded only when their files change
+    label_encoder, flower_names, average_price = flower_encoding()
 
-    # Aggregate results by flower name
-    aggregated_results = prediction_summary.groupby('Flower Name').agg({
-        'Predicted Revenue': 'sum'
-    }).reset_index()
+    # Read the days inside the nightly forecast cube, forecast the rest in one batched predict
+    totals = window_totals({'Predicted Revenue': forecast_model('revenue_model', fast)}, flower_names, label_encoder,
+                           start_date, end_date, average_price, seed=seed)
 
-    # Convert the aggregated results to a dictionary
-    aggregated_results_dict = aggregated_results.set_index('Flower Name').to_dict()['Predicted Revenue']
-    
-    return aggregated_results_dict
+    # Aggregated revenue per flower, in label encoder order
+    return totals['Predicted Revenue']
 
 
-# Example usage:
-start_date = "2024-11-01"
-end_date = "2024-11-30"
-aggregated_results = get_aggregated_results(start_date, end_date)
+if __name__ == "__main__":
+    # Example usage:
+    start_date = "2024-11-01"
+    end_date = "2024-11-30"
+    aggregated_results = get_aggregated_results(start_date, end_date)
 
-# Print aggregated results
-print(aggregated_results)
+    # Print aggregated results
+    print(aggregated_results)
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from models.functions.forecast_engine import parse_dates
+from models.functions.timing import stage
+
+# Metrics stored in prediction_summary.joblib
+METRICS = ['Predicted Revenue', 'Predicted Profit']
+
+
+class PredictionStore:
+    """
+    Date-sorted, per-flower index over a prediction summary frame.
+
+    Each flower keeps its sorted day stamps, its daily values and the
+    cumulative sum of every metric, so a range total costs two
+    searchsorted calls and one subtraction per flower, whatever the size
+    of the summary.
+    """
+
+    def __init__(self, prediction_summary: pd.DataFrame, metrics=METRICS):
+        self.metrics = list(metrics)
+        self.flowers = {}
+
+        frame = prediction_summary[['Flower Name', 'Date'] + self.metrics].copy()
+        frame['Date'] = pd.to_datetime(frame['Date']).values.astype('datetime64[D]')
+        frame = frame.sort_values(['Flower Name', 'Date'], kind='stable')
+
+        for flower_name, flower_data in frame.groupby('Flower Name', sort=True):
+            values = {metric: flower_data[metric].to_numpy(dtype=float) for metric in self.metrics}
+            # Leading zero so that cumsum[hi] - cumsum[lo] is the sum of rows lo..hi-1
+            cumsums = {metric: np.concatenate(([0.0], np.cumsum(column))) for metric, column in values.items()}
+            self.flowers[flower_name] = (flower_data['Date'].to_numpy(), values, cumsums)
+
+    @staticmethod
+    def _parse_days(start_date: str, end_date: str):
+        start, end = parse_dates(start_date, end_date)
+        return np.datetime64(start, 'D'), np.datetime64(end, 'D')
+
+    def _bounds(self, dates, start, end):
+        return np.searchsorted(dates, start, side='left'), np.searchsorted(dates, end, side='right')
+
+    def query(self, start_date: str, end_date: str, metric: str = 'Predicted Profit'):
+        """
+        Total of a metric per flower between two YYYY-MM-DD dates (inclusive).
+
+        Flowers with no predictions in the range are left out.
+        """
+        start, end = self._parse_days(start_date, end_date)
+
+        with stage('aggregate'):
+            totals = {}
+            for flower_name, (dates, _, cumsums) in self.flowers.items():
+                lo, hi = self._bounds(dates, start, end)
+                if hi > lo:
+                    totals[flower_name] = float(cumsums[metric][hi] - cumsums[metric][lo])
+            return totals
+
+    def series(self, start_date: str, end_date: str, metric: str = 'Predicted Profit'):
+        """Per-day values of a metric per flower between two YYYY-MM-DD dates (inclusive)."""
+        start, end = self._parse_days(start_date, end_date)
+
+        with stage('aggregate'):
+            daily = {}
+            for flower_name, (dates, values, _) in self.flowers.items():
+                lo, hi = self._bounds(dates, start, end)
+                if hi > lo:
+                    daily[flower_name] = pd.Series(values[metric][lo:hi], index=pd.DatetimeIndex(dates[lo:hi]), name=metric)
+            return daily
+
+
+def shared_prediction_store():
+    """Process-wide store over prediction_summary.joblib, rebuilt when the file changes."""
+    from models.functions.registry import registry
+
+    return registry.derived('prediction_store', PredictionStore, ('artifact', 'prediction_summary'))
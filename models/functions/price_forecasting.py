@@ -1,23 +1,17 @@
 import numpy as np
 import pandas as pd
-import joblib
-from sklearn.preprocessing import LabelEncoder
-import matplotlib.pyplot as plt
 
-revenue_model = joblib.load('models/regression/revenue_model_svm.joblib')
-profit_model = joblib.load('models/regression/profit_model_svm.joblib')
-
-data = pd.read_csv('data/flowers_dataset_cleaned.csv')
-
-label_encoder = LabelEncoder()
-data['Flower Name'] = label_encoder.fit_transform(data['Flower Name'])
-
-flower_names = label_encoder.classes_
+from models.functions.forecast_engine import forecast_grid
+from models.functions.registry import flower_encoding, registry
+from models.functions.surrogate import forecast_model
 
 def predict_for_days(flower_name, days):
+    label_encoder, flower_names, average_price = flower_encoding()
+    revenue_model = registry.artifact('revenue_model')
+    profit_model = registry.artifact('profit_model')
+
     encoded_flower = label_encoder.transform([flower_name])[0]
     freq_qty_sold = np.random.randint(50, 200, days)
-    average_price = data['MRP (₹)'].mean()
 
     future_data = pd.DataFrame({
         'Flower Name': [encoded_flower] * days,
@@ -33,31 +27,45 @@ def predict_for_days(flower_name, days):
 
     return total_revenue, total_profit
 
-def find_best_flower(days):
-    max_revenue = -np.inf
-    max_profit = -np.inf
-    best_flower_revenue = None
-    best_flower_profit = None
-
-    for flower in flower_names:
-        revenue, profit = predict_for_days(flower, days)
-        if revenue > max_revenue:
-            max_revenue = revenue
-            best_flower_revenue = flower
-        if profit > max_profit:
-            max_profit = profit
-            best_flower_profit = flower
-    
-    return best_flower_revenue, max_revenue, best_flower_profit, max_profit
-
-def generate_forecast_summary(days):
-    results = []
-    for flower in flower_names:
-        total_revenue, total_profit = predict_for_days(flower, days)
-        results.append({
-            "Flower Name": flower,
-            "Total Predicted Revenue": total_revenue,
-            "Total Predicted Profit": total_profit
-        })
-    forecast_summary = pd.DataFrame(results)
-    return forecast_summary
+def forecast_summary(days, seed=None, fast=False):
+    """
+    Forecast every flower over the next `days` days in one batched pass.
+
+    One predict per model runs over all flowers × days, so the summary and
+    the best flowers come from the same simulated quantities.
+
+    Parameters:
+    - days (int): Number of days to forecast.
+    - seed (int, optional): Seed for the simulated quantities.
+    - fast (bool): Use the grid surrogates instead of the SVR models.
+
+    Returns:
+    - pd.DataFrame: Total predicted revenue and profit per flower.
+    - tuple: (best flower for revenue, max revenue, best flower for profit, max profit).
+    """
+    label_encoder, flower_names, average_price = flower_encoding()
+    models = {
+        'Total Predicted Revenue': forecast_model('revenue_model', fast),
+        'Total Predicted Profit': forecast_model('profit_model', fast)
+    }
+
+    grid = forecast_grid(models, label_encoder.transform(flower_names), days, average_price, seed=seed)
+    totals = {name: predictions.sum(axis=1) for name, predictions in grid.items()}
+
+    summary = pd.DataFrame({'Flower Name': flower_names, **totals})
+
+    best_revenue = int(np.argmax(totals['Total Predicted Revenue']))
+    best_profit = int(np.argmax(totals['Total Predicted Profit']))
+    best_flowers = (
+        flower_names[best_revenue], float(totals['Total Predicted Revenue'][best_revenue]),
+        flower_names[best_profit], float(totals['Total Predicted Profit'][best_profit])
+    )
+    return summary, best_flowers
+
+def find_best_flower(days, seed=None, fast=False):
+    _, best_flowers = forecast_summary(days, seed=seed, fast=fast)
+    return best_flowers
+
+def generate_forecast_summary(days, seed=None, fast=False):
+    summary, _ = forecast_summary(days, seed=seed, fast=fast)
+    return summary
@@ -1,10 +1,12 @@
-import joblib
 import pandas as pd
 
+from models.functions.interval_index import shared_interval_index
+from models.functions.registry import registry
+
 # Load the joblib model
 def load_model(filename='hackathon/Datanyx/models/regression/adjusted_flower_sales_model.joblib'):
-    """Load the saved flower sales optimization model."""
-    return joblib.load(filename)
+    """Load the saved flower sales optimization model (shared, loaded once per process)."""
+    return registry.file(filename)
 
 # Profit calculation function
 def calculate_profit(price, cost, quantity):
@@ -13,20 +15,69 @@ def calculate_profit(price, cost, quantity):
 
 # Load flower dataset
 def load_flower_data(dataset_path="hackathon/flowers_dataset_cleaned.csv"):
-    """Load the flower dataset."""
-    return pd.read_csv(dataset_path)
+    """Load the shared flower dataset with typed categorical and datetime columns."""
+    return registry.dataset(dataset_path)
 
 # Filter data by the provided start and end dates
-def filter_data_by_dates(data, start_date, end_date):
-    """Filter the flower data to the given date range."""
-    data['Start DateTime'] = pd.to_datetime(data['Start DateTime'])
-    data['End DateTime'] = pd.to_datetime(data['End DateTime'])
+def filter_data_by_dates(data, start_date, end_date, index=None):
+    """Filter the flower data to the sales that start and end within the given date range."""
+    # Binary search on the dataset's interval index when it covers this frame
+    if index is not None and index.frame is data:
+        return index.take(index.contained_in(start_date, end_date))
+
+    # The dataset may be shared, so parse into locals instead of overwriting its columns
+    start_datetime = pd.to_datetime(data['Start DateTime'])
+    end_datetime = pd.to_datetime(data['End DateTime'])
     
-    filtered_data = data[(data['Start DateTime'] >= start_date) & (data['End DateTime'] <= end_date)]
+    filtered_data = data[(start_datetime >= start_date) & (end_datetime <= end_date)]
     return filtered_data
 
+# Cost per unit used for flowers without their own cost
+DEFAULT_COST_PER_UNIT = 50
+
+def optimal_sales_totals(filtered_data, model, cost_per_unit=DEFAULT_COST_PER_UNIT):
+    """
+    Best quantity and total profit per flower over a set of sale records.
+
+    Quantities and costs are looked up once per flower category and spread
+    to the rows through the category codes; profits are summed in one groupby.
+
+    Parameters:
+    - filtered_data (pd.DataFrame): Sale records with 'Flower Name' and 'MRP (₹)'.
+    - model (dict): Flower name -> best quantity; missing flowers get 0.
+    - cost_per_unit (float or dict): Cost per unit, or flower name -> cost
+      (flowers not listed use DEFAULT_COST_PER_UNIT).
+
+    Returns:
+    - pd.DataFrame: 'Flower Name', 'Best Quantity' and 'Total Profit (₹)', in order of first appearance.
+    """
+    flowers = filtered_data['Flower Name'].astype('category')
+    categories = pd.Series(flowers.cat.categories)
+
+    if isinstance(cost_per_unit, dict):
+        costs = categories.map(cost_per_unit).fillna(DEFAULT_COST_PER_UNIT)
+    else:
+        costs = pd.Series(float(cost_per_unit), index=categories.index)
+    best_quantities = categories.map(model).fillna(0)
+
+    codes = flowers.cat.codes.to_numpy()
+    profit = calculate_profit(
+        filtered_data['MRP (₹)'].to_numpy(dtype=float),
+        costs.to_numpy(dtype=float)[codes],
+        best_quantities.to_numpy(dtype=float)[codes]
+    )
+
+    totals = pd.Series(profit, index=filtered_data.index).groupby(flowers, observed=True, sort=False).sum()
+
+    return pd.DataFrame({
+        'Flower Name': totals.index.astype(str),
+        'Best Quantity': [model.get(flower_name, 0) for flower_name in totals.index],
+        'Total Profit (₹)': totals.to_numpy()
+    })
+
 # Function to get optimal sales based on the provided start_date and end_date
-def get_optimal_sales(start_date, end_date, model, dataset_path="hackathon/flowers_dataset_cleaned.csv"):
+def get_optimal_sales(start_date, end_date, model, dataset_path="hackathon/flowers_dataset_cleaned.csv",
+                      cost_per_unit=DEFAULT_COST_PER_UNIT):
     """Get the optimal flower sales for the given date range."""
     
     # Load flower data
@@ -34,30 +85,17 @@ def get_optimal_sales(start_date, end_date, model, dataset_path="hackathon/flowe
     start_date = pd.to_datetime(start_date)
     end_date = pd.to_datetime(end_date)
     
-    # Filter the dataset by the date range
-    filtered_data = filter_data_by_dates(data, start_date, end_date)
+    # Filter the dataset by the date range, using the index built once per dataset version
+    filtered_data = filter_data_by_dates(data, start_date, end_date, shared_interval_index(dataset_path))
     
     if filtered_data.empty:
         print("No data found for the given date range.")
         return {}
 
-    flower_sales = {}
-    cost_per_unit = 50  # Example cost per unit
-
-    # For each flower, calculate the total profit based on the optimal quantities from the model
-    for flower_name in filtered_data['Flower Name'].unique():
-        flower_data = filtered_data[filtered_data['Flower Name'] == flower_name]
-        
-        best_quantity = model.get(flower_name, 0)
-        total_profit = 0
-        
-        for _, row in flower_data.iterrows():
-            daily_price = row['MRP (₹)']
-            total_profit += calculate_profit(daily_price, cost_per_unit, best_quantity)
-        
-        flower_sales[flower_name] = best_quantity
-
-    return flower_sales
+    # Best quantity and total profit of every flower in one vectorized pass
+    totals = optimal_sales_totals(filtered_data, model, cost_per_unit)
+
+    return dict(zip(totals['Flower Name'], totals['Best Quantity']))
 
 # Example Usage
 if __name__ == "__main__":
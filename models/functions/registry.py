@@ -0,0 +1,203 @@
+import os
+import time
+import hashlib
+import threading
+
+from models.functions.dataset import DATASET_CSV, load_dataset
+from models.functions.timing import stage
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+REGRESSION_DIR = os.path.join(ROOT_DIR, 'models', 'regression')
+
+# Artifact name -> file in models/regression
+ARTIFACTS = {
+    'revenue_model': 'revenue_model_svm.joblib',
+    'profit_model': 'profit_model_svm.joblib',
+    'prediction_summary': 'prediction_summary.joblib',
+    'aggregated_results': 'aggregated_results.joblib',
+    'top_profit_flowers': 'top_profit_flowers.joblib',
+    'top_revenue_flowers': 'top_revenue_flowers.joblib',
+    'flower_analysis_results': 'flower_analysis_results.joblib',
+    'label_encoder': 'label_encoder.joblib',
+    'scaler_prices': 'scaler_prices.joblib',
+    'scaler_features': 'scaler_features.joblib',
+    'sales_model': 'adjusted_flower_sales_model.joblib',
+    'flower_predictor_rf': 'flower_name_predictor_rf.pkl',
+    'categorical_encoder': 'categorical_encoder.pkl',
+    'numerical_scaler': 'numerical_scaler.pkl',
+    'flower_label_encoder': 'flower_label_encoder.pkl',
+}
+
+
+def artifact_path(name):
+    """Absolute path of a registered artifact."""
+    return os.path.join(REGRESSION_DIR, ARTIFACTS[name])
+
+
+def _joblib_load(path):
+    # joblib is imported on first load so importing the registry stays cheap
+    import joblib
+
+    return joblib.load(path)
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as artifact_file:
+        for block in iter(lambda: artifact_file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Handle:
+    """
+    Lazily loaded, thread-safe handle to one file on disk.
+
+    The file is loaded on first use and reloaded when its size or mtime
+    changes and its content hash differs from the loaded copy.
+    """
+
+    def __init__(self, path, loader):
+        self.path = path
+        self.loader = loader
+        self.value = None
+        self.stamp = None
+        self.digest = None
+        self.loads = 0
+        self.load_seconds = None
+        self._lock = threading.Lock()
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self):
+        stamp = self._stat()
+        if stamp == self.stamp:
+            return self.value
+
+        with self._lock:
+            if stamp != self.stamp:
+                digest = _file_hash(self.path)
+                if digest != self.digest:
+                    started = time.perf_counter()
+                    with stage('load'):
+                        self.value = self.loader(self.path)
+                    self.load_seconds = time.perf_counter() - started
+                    self.loads += 1
+                    self.digest = digest
+                self.stamp = stamp
+        return self.value
+
+    @property
+    def version(self):
+        """Content hash of the loaded copy, or None before the first load."""
+        return self.digest
+
+    def snapshot(self):
+        """The loaded value and its version, read together so a concurrent reload cannot split them."""
+        self.get()
+        with self._lock:
+            return self.value, self.digest
+
+
+class Registry:
+    """
+    Process-wide registry of model artifacts, datasets and values derived from them.
+    """
+
+    def __init__(self):
+        self._handles = {}
+        self._derived = {}
+        # Re-entrant: a builder may itself read other registry entries
+        self._lock = threading.RLock()
+
+    def _handle(self, path, loader):
+        path = os.path.abspath(path)
+        with self._lock:
+            if path not in self._handles:
+                self._handles[path] = Handle(path, loader)
+            return self._handles[path]
+
+    def artifact(self, name):
+        """Loaded object of a registered artifact, e.g. registry.artifact('revenue_model')."""
+        return self._handle(artifact_path(name), _joblib_load).get()
+
+    def file(self, path, loader=_joblib_load):
+        """Any file outside the registered artifacts, loaded with loader (joblib by default)."""
+        return self._handle(path, loader).get()
+
+    def dataset(self, path=DATASET_CSV):
+        """
+        The flower dataset, shared by every caller.
+
+        The frame is shared and must not be modified; copy it before adding columns.
+        """
+        return self._handle(path, load_dataset).get()
+
+    def derived(self, key, builder, *sources):
+        """
+        Value computed from other registry entries, rebuilt when any of them changes.
+
+        Parameters:
+        - key (str): Name of the derived value.
+        - builder (callable): Called with the loaded sources.
+        - sources: ('artifact', name) or ('dataset', path) pairs.
+        """
+        # Snapshot the sources and check/update the cache in one critical section,
+        # so a value is never stored under versions of other source files
+        with self._lock:
+            values, versions = [], []
+            for kind, name in sources:
+                if kind == 'artifact':
+                    handle = self._handle(artifact_path(name), _joblib_load)
+                else:
+                    handle = self._handle(name, load_dataset)
+                value, version = handle.snapshot()
+                values.append(value)
+                versions.append(version)
+            versions = tuple(versions)
+
+            cached = self._derived.get(key)
+            if cached is None or cached[0] != versions:
+                with stage('load'):
+                    cached = (versions, builder(*values))
+                self._derived[key] = cached
+            return cached[1]
+
+    def clear(self):
+        """Forget every loaded file and derived value; the next use loads them again."""
+        with self._lock:
+            self._handles.clear()
+            self._derived.clear()
+
+    def timings(self):
+        """Load count, last load time and version of every file loaded so far."""
+        with self._lock:
+            handles = list(self._handles.values())
+        return {
+            os.path.relpath(handle.path, ROOT_DIR): {
+                'loads': handle.loads,
+                'last_load_seconds': handle.load_seconds,
+                'version': handle.version,
+            }
+            for handle in handles
+        }
+
+
+registry = Registry()
+
+
+def flower_encoding(path=DATASET_CSV):
+    """
+    Label encoder fitted on the dataset's flower names, the sorted names and
+    the average MRP, as used by every forecast.
+    """
+    def build(data):
+        from sklearn.preprocessing import LabelEncoder
+
+        label_encoder = LabelEncoder()
+        label_encoder.fit(data['Flower Name'])
+        return label_encoder, label_encoder.classes_, data['MRP (₹)'].mean()
+
+    return registry.derived(f'flower_encoding:{os.path.abspath(path)}', build, ('dataset', path))
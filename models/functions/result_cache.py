@@ -0,0 +1,134 @@
+import os
+import threading
+from datetime import date, datetime
+from functools import wraps
+
+from cachetools import TTLCache
+
+# Default bounds of the process-wide forecast cache
+DEFAULT_MAXSIZE = 512
+DEFAULT_TTL = 15 * 60  # seconds
+
+
+def normalize_date(value):
+    """Normalize a date string, date or datetime to YYYY-MM-DD."""
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+
+
+def artifact_version(paths):
+    """Version stamp of a set of files: (size, mtime) of each, or None when missing."""
+    version = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            version.append((stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+
+def with_seed(params, seed):
+    """Keyword arguments for the wrapped function; seed is only passed when set."""
+    return dict(params, seed=seed) if seed is not None else dict(params)
+
+
+class ForecastCache:
+    """
+    Bounded LRU cache with a time-to-live for forecast results.
+
+    Entries are keyed on endpoint, normalized dates, model version and seed.
+    When the files behind an endpoint change, its entries are dropped.
+    Cached results are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _check_version(self, endpoint, version):
+        # Drop the endpoint's entries the first time a new artifact version is seen
+        if self._versions.get(endpoint, version) != version:
+            for key in [key for key in self._cache.keys() if key[0] == endpoint]:
+                self._cache.pop(key, None)
+            self.invalidations += 1
+        self._versions[endpoint] = version
+
+    def get_or_compute(self, endpoint, start_date, end_date, compute, artifact_paths=(), seed=None, **params):
+        """
+        Return the cached result for a query, computing and storing it on a miss.
+
+        Parameters:
+        - endpoint (str): Name of the cached function.
+        - start_date, end_date: Query dates (YYYY-MM-DD strings or date objects).
+        - compute (callable): Called with the normalized dates (and seed, if set) on a miss.
+        - artifact_paths (iterable): Files whose change invalidates the endpoint.
+        - seed (int, optional): RNG seed of the forecast.
+        - params: Extra keyword arguments, part of the key and passed to compute.
+        """
+        start_date, end_date = normalize_date(start_date), normalize_date(end_date)
+        version = artifact_version(artifact_paths)
+        key = (endpoint, start_date, end_date, version, seed, tuple(sorted(params.items())))
+
+        with self._lock:
+            self._check_version(endpoint, version)
+            try:
+                result = self._cache[key]
+                self.hits += 1
+                return result
+            except KeyError:
+                self.misses += 1
+
+        # Compute outside the lock so slow forecasts do not serialize other endpoints
+        result = compute(start_date, end_date, **with_seed(params, seed))
+        with self._lock:
+            self._cache[key] = result
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "size": len(self._cache),
+                "maxsize": self._cache.maxsize,
+                "ttl": self._cache.ttl
+            }
+
+
+# Shared by every forecast function in the process
+forecast_cache = ForecastCache()
+
+
+def cached_forecast(endpoint, artifact_paths=(), cache=None):
+    """
+    Decorator putting a (start_date, end_date, *, seed=None) forecast function behind the cache.
+
+    Invalid dates bypass the cache so the wrapped function raises its usual error.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(start_date, end_date, *, seed=None, **params):
+            try:
+                normalize_date(start_date), normalize_date(end_date)
+            except (TypeError, ValueError):
+                return func(start_date, end_date, **with_seed(params, seed))
+
+            return (cache or forecast_cache).get_or_compute(
+                endpoint, start_date, end_date, func,
+                artifact_paths=artifact_paths, seed=seed, **params
+            )
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
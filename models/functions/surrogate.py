@@ -0,0 +1,262 @@
+"""
+Fast lookup-grid surrogates for the RBF SVR revenue and profit models.
+
+Run as a script to print (and save) the validation report:
+    python -m models.functions.surrogate [--output models/regression/surrogate_report.json]
+"""
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from models.functions.dataset import ROOT_DIR
+from models.functions.forecast_engine import FEATURE_COLUMNS
+
+# Grid over (Qty Sold (kg), MRP (₹)) per encoded flower, step 1 in both
+QTY_RANGE = (0, 300)
+MRP_RANGE = (50, 400)
+GRID_STEP = 1.0
+
+# Support vectors multiplied per block while building the grid, to cap memory
+SV_BLOCK = 500
+
+# Training split of the SVRs (train_test_split of the whole dataset)
+TRAIN_TEST_SIZE = 0.3
+TRAIN_RANDOM_STATE = 42
+
+# Models that can be served by a surrogate
+SURROGATE_MODELS = ['revenue_model', 'profit_model']
+
+# Held-out splits the surrogates are validated on
+VALIDATION_SPLITS = (os.path.join(ROOT_DIR, 'data', 'validation.csv'), os.path.join(ROOT_DIR, 'data', 'test.csv'))
+
+
+def feature_frame(data):
+    """SVR feature rows (encoded flower, qty, MRP) of dataset rows."""
+    from models.functions.registry import flower_encoding
+
+    label_encoder, _, _ = flower_encoding()
+    return pd.DataFrame({
+        'Flower Name': label_encoder.transform(data['Flower Name'].astype(str)),
+        'Qty Sold (kg)': data['Qty Sold (kg)'].to_numpy(dtype=float),
+        'MRP (₹)': data['MRP (₹)'].to_numpy(dtype=float)
+    }, columns=FEATURE_COLUMNS)
+
+
+def training_features(data):
+    """Feature rows the SVRs were trained on: the training part of the dataset's split."""
+    from sklearn.model_selection import train_test_split
+
+    X_train, _ = train_test_split(feature_frame(data), test_size=TRAIN_TEST_SIZE, random_state=TRAIN_RANDOM_STATE)
+    return X_train
+
+
+def kernel_gamma(model, X_train):
+    """
+    RBF gamma of a fitted SVR.
+
+    A number is used as is, 'auto' is 1 / n_features and 'scale' is
+    1 / (n_features * X_train.var()), computed like scikit-learn does at fit
+    time from the training matrix, which the model does not keep.
+
+    Parameters:
+    - model (SVR): The fitted model.
+    - X_train (array-like): The features the model was trained on.
+
+    Returns:
+    - float: The gamma of the model's kernel.
+    """
+    gamma = model.get_params()['gamma']
+    if gamma == 'auto':
+        return 1.0 / model.n_features_in_
+    if gamma == 'scale':
+        X_train = np.asarray(X_train, dtype=float)
+        return float(1.0 / (X_train.shape[1] * X_train.var()))
+    return float(gamma)
+
+
+class GridSurrogate:
+    """
+    Precomputed predictions of an RBF SVR over a (flower, qty, MRP) grid.
+
+    The RBF kernel factorizes over the three features, so for each flower
+    the whole (qty, MRP) grid is one weighted matrix product with the
+    support vectors and the grid values are exact, given the kernel's gamma
+    (see kernel_gamma), which is kept as metadata. predict() interpolates
+    bilinearly between grid points; rows off the grid (unknown flower id,
+    quantity or MRP out of range) fall back to the original model.
+    """
+
+    def __init__(self, model, flower_ids, gamma, qty_range=QTY_RANGE, mrp_range=MRP_RANGE, step=GRID_STEP):
+        if getattr(model, 'kernel', None) != 'rbf':
+            raise ValueError("GridSurrogate only supports RBF kernel models")
+
+        self.model = model
+        self.gamma = float(gamma)
+        self.flower_ids = np.asarray(flower_ids, dtype=int)
+        self.step = float(step)
+        self.qty_grid = np.arange(qty_range[0], qty_range[1] + step / 2, step, dtype=float)
+        self.mrp_grid = np.arange(mrp_range[0], mrp_range[1] + step / 2, step, dtype=float)
+
+        # Grid slot of each flower id; -1 for ids without a grid
+        self._slots = np.full(self.flower_ids.max() + 1, -1)
+        self._slots[self.flower_ids] = np.arange(len(self.flower_ids))
+
+        started = time.perf_counter()
+        self.values = self._build_grid()
+        self.build_seconds = time.perf_counter() - started
+
+    def _build_grid(self):
+        gamma = self.gamma
+        support = self.model.support_vectors_
+        dual = self.model.dual_coef_[0]
+        values = np.full((len(self.flower_ids), len(self.qty_grid), len(self.mrp_grid)), self.model.intercept_[0])
+
+        # exp(-g|x - s|^2) = exp(-g(df)^2) * exp(-g(dq)^2) * exp(-g(dm)^2)
+        for first in range(0, len(support), SV_BLOCK):
+            block = support[first:first + SV_BLOCK]
+            qty_kernel = np.exp(-gamma * (self.qty_grid[:, None] - block[:, 1]) ** 2)
+            mrp_kernel = np.exp(-gamma * (self.mrp_grid[:, None] - block[:, 2]) ** 2)
+            for slot, flower_id in enumerate(self.flower_ids):
+                weights = dual[first:first + SV_BLOCK] * np.exp(-gamma * (flower_id - block[:, 0]) ** 2)
+                values[slot] += (qty_kernel * weights) @ mrp_kernel.T
+        return values
+
+    def predict(self, X):
+        """Predictions for rows of FEATURE_COLUMNS, like the original model's predict."""
+        X = np.asarray(X[FEATURE_COLUMNS] if isinstance(X, pd.DataFrame) else X, dtype=float)
+        flowers, qty, mrp = X[:, 0], X[:, 1], X[:, 2]
+
+        qty_pos = (qty - self.qty_grid[0]) / self.step
+        mrp_pos = (mrp - self.mrp_grid[0]) / self.step
+        flower_index = np.clip(flowers, 0, len(self._slots) - 1).astype(int)
+        slots = self._slots[flower_index]
+
+        on_grid = ((flowers == flower_index) & (slots >= 0)
+                   & (qty_pos >= 0) & (qty_pos <= len(self.qty_grid) - 1)
+                   & (mrp_pos >= 0) & (mrp_pos <= len(self.mrp_grid) - 1))
+
+        predictions = np.empty(len(X))
+
+        # Bilinear interpolation between the four surrounding grid points
+        s, q, m = slots[on_grid], qty_pos[on_grid], mrp_pos[on_grid]
+        q0 = np.minimum(q.astype(int), len(self.qty_grid) - 2)
+        m0 = np.minimum(m.astype(int), len(self.mrp_grid) - 2)
+        tq, tm = q - q0, m - m0
+        grid = self.values
+        predictions[on_grid] = ((1 - tq) * (1 - tm) * grid[s, q0, m0] + tq * (1 - tm) * grid[s, q0 + 1, m0]
+                                + (1 - tq) * tm * grid[s, q0, m0 + 1] + tq * tm * grid[s, q0 + 1, m0 + 1])
+
+        if not on_grid.all():
+            off_grid = pd.DataFrame(X[~on_grid], columns=FEATURE_COLUMNS)
+            predictions[~on_grid] = self.model.predict(off_grid)
+        return predictions
+
+
+def shared_surrogate(name):
+    """Process-wide surrogate of a registered SVR, rebuilt when the model or dataset changes."""
+    from models.functions.dataset import DATASET_CSV
+    from models.functions.registry import flower_encoding, registry
+
+    label_encoder, flower_names, _ = flower_encoding()
+    flower_ids = label_encoder.transform(flower_names)
+
+    def build(model, data):
+        return GridSurrogate(model, flower_ids, kernel_gamma(model, training_features(data)))
+
+    return registry.derived(f'surrogate:{name}', build, ('artifact', name), ('dataset', DATASET_CSV))
+
+
+def forecast_model(name, fast=False):
+    """The registered model, or its grid surrogate when fast is set."""
+    from models.functions.registry import registry
+
+    if fast:
+        return shared_surrogate(name)
+    return registry.artifact(name)
+
+
+def validation_features(split_path, data):
+    """
+    SVR feature rows of a split file (data/validation.csv, data/test.csv).
+
+    The split files hold scaled, one-hot features; their unnamed first
+    column is the row index in flowers_dataset_cleaned.csv, which gives back
+    the unscaled (flower, qty, MRP) features the SVRs take.
+    """
+    rows = pd.read_csv(split_path, index_col=0, usecols=[0]).index
+    return feature_frame(data.iloc[rows])
+
+
+def _rows_per_second(predict, X, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        predict(X)
+        best = min(best, time.perf_counter() - started)
+    return len(X) / best
+
+
+def validation_report(splits=VALIDATION_SPLITS, bulk_rows=50_000, seed=0):
+    """
+    Error of each surrogate against its original model on the split files,
+    and the bulk scoring speed of both on simulated forecast rows.
+
+    Returns:
+    - dict: Model name -> {"build_seconds", "gamma", "splits": {split: errors}, "speed": bulk rows per second}.
+    """
+    from models.functions.registry import flower_encoding, registry
+
+    data = registry.dataset()
+    label_encoder, flower_names, average_price = flower_encoding()
+
+    # Rows like those the forecasts score: random flowers and quantities at the average MRP
+    rng = np.random.default_rng(seed)
+    bulk = pd.DataFrame({
+        'Flower Name': rng.choice(label_encoder.transform(flower_names), bulk_rows),
+        'Qty Sold (kg)': rng.integers(50, 200, bulk_rows),
+        'MRP (₹)': np.full(bulk_rows, average_price)
+    }, columns=FEATURE_COLUMNS)
+
+    report = {}
+    for name in SURROGATE_MODELS:
+        model, surrogate = registry.artifact(name), shared_surrogate(name)
+        entry = {"build_seconds": surrogate.build_seconds, "gamma": surrogate.gamma, "splits": {}}
+
+        for split_path in tuple(splits) + ('bulk',):
+            X = bulk if split_path == 'bulk' else validation_features(split_path, data)
+            exact, fast = model.predict(X), surrogate.predict(X)
+            error = np.abs(fast - exact)
+            entry["splits"][os.path.basename(split_path)] = {
+                "rows": len(X),
+                "mae": float(error.mean()),
+                "max_abs_error": float(error.max()),
+                "max_relative_error": float((error / np.maximum(np.abs(exact), 1e-9)).max())
+            }
+
+        exact_speed = _rows_per_second(model.predict, bulk, repeat=1)
+        fast_speed = _rows_per_second(surrogate.predict, bulk)
+        entry["speed"] = {
+            "rows": bulk_rows,
+            "exact_rows_per_second": exact_speed,
+            "fast_rows_per_second": fast_speed,
+            "speedup": fast_speed / exact_speed
+        }
+        report[name] = entry
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate the SVR grid surrogates against the original models")
+    parser.add_argument("--output", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = validation_report()
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
@@ -0,0 +1,318 @@
+"""
+Synthetic market data shaped like flowers_dataset_cleaned.csv, for load and
+regression testing at production scale.
+
+Run as a script (from the repository root):
+    python -m models.functions.synthetic --rows 10000000 --format parquet --output data/synthetic
+    python -m models.functions.synthetic --rows 1000000 --single data/flowers_1m.csv
+"""
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from models.functions.dataset import CATEGORICAL_COLUMNS, DATASET_CSV
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+FORMATS = {'csv': '.csv', 'parquet': '.parquet'}
+
+# Resampled (qty, MRP) pairs are moved by up to this many units, within the flower's range
+JITTER = 5
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class MarketModel:
+    """
+    Distributions of the sale records, learned from the flower dataset.
+
+    - Flower mix: the share of each flower.
+    - Weather and customer segment: their joint distribution per flower.
+    - Quantity, MRP and sale frequency: resampled together from the
+      flower's own records (keeping the quantity/price correlation), with
+      a small jitter inside the flower's observed ranges.
+    - Start → End gap: the empirical distribution of sale durations.
+    - Start times: uniform over the dataset's period, or a given one.
+
+    The score, revenue, margin, demand and duration columns are derived
+    from the sampled values with the rules the dataset follows.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.columns = list(data.columns)
+
+        flowers = data['Flower Name'].astype('category')
+        weathers = data['Weather'].astype('category')
+        segments = data['Customer Segment'].astype('category')
+        self.flowers = np.asarray(flowers.cat.categories, dtype=object)
+        self.weathers = np.asarray(weathers.cat.categories, dtype=object)
+        self.segments = np.asarray(segments.cat.categories, dtype=object)
+        flower_codes = flowers.cat.codes.to_numpy()
+        weather_codes = weathers.cat.codes.to_numpy()
+        segment_codes = segments.cat.codes.to_numpy()
+
+        n_flowers, n_cells = len(self.flowers), len(self.weathers) * len(self.segments)
+        self.flower_p = np.bincount(flower_codes, minlength=n_flowers) / len(data)
+
+        # Cumulative (weather, segment) distribution of each flower, offset by the
+        # flower code so one searchsorted samples every row at once
+        cells = weather_codes * len(self.segments) + segment_codes
+        counts = np.zeros((n_flowers, n_cells))
+        np.add.at(counts, (flower_codes, cells), 1)
+        cdf = np.cumsum(counts, axis=1) / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+        cdf[:, -1] = 1.0
+        self._cell_cdf = (cdf + np.arange(n_flowers)[:, None]).ravel()
+
+        # Source records grouped by flower for the joint (qty, MRP, frequency) resampling
+        order = np.argsort(flower_codes, kind='stable')
+        self.qty = data['Qty Sold (kg)'].to_numpy(dtype=float)[order]
+        self.mrp = data['MRP (₹)'].to_numpy(dtype=np.int64)[order]
+        self.sale_frequency = data['Sale Frequency'].to_numpy(dtype=np.int64)[order]
+        self.flower_counts = np.bincount(flower_codes, minlength=n_flowers)
+        self.flower_offsets = np.concatenate([[0], np.cumsum(self.flower_counts)[:-1]])
+
+        frame = pd.DataFrame({'flower': flower_codes, 'qty': data['Qty Sold (kg)'], 'mrp': data['MRP (₹)']})
+        ranges = frame.groupby('flower')[['qty', 'mrp']].agg(['min', 'max']).reindex(range(n_flowers))
+        self.qty_range = ranges['qty'].fillna(0).to_numpy(dtype=float)
+        self.mrp_range = ranges['mrp'].fillna(0).to_numpy(dtype=np.int64)
+
+        # Scores are fixed per weather and per segment
+        self.weather_score = (data.groupby(weathers, observed=False)['Weather Impact Score'].median()
+                              .to_numpy().astype(data['Weather Impact Score'].dtype))
+        self.segment_score = (data.groupby(segments, observed=False)['Customer Segment Score'].median()
+                              .to_numpy().astype(data['Customer Segment Score'].dtype))
+
+        # Demand levels are quantity bands: the lowest quantity of each level starts its band
+        band_start = data.groupby('Demand', observed=True)['Qty Sold (kg)'].min().sort_values()
+        self.demand_levels = np.asarray(band_start.index, dtype=object)
+        self.demand_bounds = band_start.to_numpy()[1:]
+
+        durations = data['Sales Duration (hours)'].value_counts(normalize=True).sort_index()
+        self.duration_hours = durations.index.to_numpy(dtype=float)
+        self.duration_p = durations.to_numpy()
+
+        starts = data['Start DateTime'].to_numpy(dtype='datetime64[s]')
+        self.period = (starts.min(), starts.max())
+
+        self.profit_rate = float((data['Profit Margin'] / data['Revenue']).median())
+        self.profit_percentage = float(data['Profit Percentage'].median())
+
+    def sample(self, n, rng, period=None):
+        """
+        n synthetic sale records, in the dataset's column order.
+
+        Parameters:
+        - n (int): Number of rows.
+        - rng (np.random.Generator): Source of randomness.
+        - period (tuple, optional): (first, last) start time; defaults to the dataset's period.
+
+        Returns:
+        - pd.DataFrame: Records with the same columns and value rules as the dataset.
+        """
+        flower = rng.choice(len(self.flowers), n, p=self.flower_p)
+
+        n_segments = len(self.segments)
+        cell = np.searchsorted(self._cell_cdf, rng.random(n) + flower, side='right')
+        cell -= flower * (len(self.weathers) * n_segments)
+        weather, segment = np.divmod(cell, n_segments)
+
+        source = self.flower_offsets[flower] + (rng.random(n) * self.flower_counts[flower]).astype(np.int64)
+        qty = np.clip(self.qty[source] + rng.integers(-JITTER, JITTER + 1, n),
+                      self.qty_range[flower, 0], self.qty_range[flower, 1])
+        mrp = np.clip(self.mrp[source] + rng.integers(-JITTER, JITTER + 1, n),
+                      self.mrp_range[flower, 0], self.mrp_range[flower, 1])
+
+        first, last = (np.datetime64(pd.Timestamp(bound), 's') for bound in (period or self.period))
+        seconds = rng.integers(0, (last - first).astype(np.int64) + 1, n)
+        start = first + seconds.astype('timedelta64[s]')
+        hours = rng.choice(self.duration_hours, n, p=self.duration_p)
+        end = start + (hours * 3600).astype('timedelta64[s]')
+
+        revenue = mrp * qty
+        columns = {
+            'Flower Name': pd.Categorical.from_codes(flower, self.flowers),
+            'MRP (₹)': mrp,
+            'Qty Sold (kg)': qty,
+            'Weather': pd.Categorical.from_codes(weather, self.weathers),
+            'Customer Segment': pd.Categorical.from_codes(segment, self.segments),
+            'Revenue': revenue,
+            'Profit Margin': revenue * self.profit_rate,
+            'Sale Frequency': self.sale_frequency[source],
+            'Weather Impact Score': self.weather_score[weather],
+            'Customer Segment Score': self.segment_score[segment],
+            'Start DateTime': start.astype('datetime64[ns]'),
+            'End DateTime': end.astype('datetime64[ns]'),
+            'Demand': self.demand_levels[np.searchsorted(self.demand_bounds, qty, side='right')],
+            'Sales Duration (hours)': hours,
+            'Profit Percentage': np.full(n, self.profit_percentage),
+        }
+        return pd.DataFrame(columns, columns=self.columns)
+
+
+def market_model(path=DATASET_CSV):
+    """Process-wide MarketModel of a dataset, rebuilt when the dataset changes."""
+    from models.functions.registry import registry
+
+    return registry.derived(f'market_model:{os.path.abspath(path)}', MarketModel, ('dataset', path))
+
+
+def _write_csv(frame, path):
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        frame.to_csv(path, index=False, date_format=DATETIME_FORMAT)
+        return
+
+    # pyarrow's writer is about ten times faster than to_csv; whole-second
+    # timestamps keep the dataset's "YYYY-MM-DD HH:MM:SS" layout
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.cast(pa.schema([
+        pa.field(field.name, pa.timestamp('s')) if pa.types.is_timestamp(field.type) else field
+        for field in table.schema
+    ]))
+    pa_csv.write_csv(table, path)
+
+
+def _write_frame(frame, path, file_format):
+    """Write one chunk to a temporary file and move it into place."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if file_format == 'csv':
+        _write_csv(frame, tmp_path)
+    else:
+        frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _write_chunk(model, rows, seed_sequence, path, file_format, period):
+    frame = model.sample(rows, np.random.default_rng(seed_sequence), period)
+    _write_frame(frame, path, file_format)
+    return path
+
+
+def chunk_sizes(rows, chunk_rows):
+    """Row count of every chunk: full chunks plus one remainder."""
+    full, remainder = divmod(rows, chunk_rows)
+    return [chunk_rows] * full + ([remainder] if remainder else [])
+
+
+def generate_market_data(rows, output_dir, chunk_rows=DEFAULT_CHUNK_ROWS, file_format='csv',
+                         seed=0, workers=None, period=None, dataset_path=DATASET_CSV):
+    """
+    Write `rows` synthetic records as numbered chunk files.
+
+    Every chunk has its own random stream spawned from the seed, so the
+    output depends only on (seed, rows, chunk_rows), not on the number of
+    worker processes.
+
+    Parameters:
+    - rows (int): Total number of records.
+    - output_dir (str): Directory of the chunk files (part-00000.csv, ...).
+    - chunk_rows (int): Records per chunk file.
+    - file_format (str): 'csv' or 'parquet'.
+    - seed (int): Seed of the random streams.
+    - workers (int, optional): Worker processes; defaults to the CPU count.
+    - period (tuple, optional): (first, last) start time of the sales.
+    - dataset_path (str): Dataset the distributions are learned from.
+
+    Returns:
+    - list: Paths of the chunk files, in order.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown format {file_format!r}; expected one of {sorted(FORMATS)}")
+    if rows <= 0 or chunk_rows <= 0:
+        raise ValueError("rows and chunk_rows must be positive")
+
+    model = market_model(dataset_path)
+    sizes = chunk_sizes(rows, chunk_rows)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [os.path.join(output_dir, f'part-{index:05d}{FORMATS[file_format]}') for index in range(len(sizes))]
+
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+    if workers == 1:
+        return [_write_chunk(model, size, seed_sequence, path, file_format, period)
+                for size, seed_sequence, path in zip(sizes, seeds, paths)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_write_chunk, model, size, seed_sequence, path, file_format, period)
+                   for size, seed_sequence, path in zip(sizes, seeds, paths)]
+        return [future.result() for future in futures]
+
+
+def combine_chunks(paths, output_path, file_format='csv'):
+    """
+    Join chunk files into one file, streaming (one chunk in memory at a time).
+
+    CSV chunks are concatenated without their repeated headers; Parquet
+    chunks become row groups of one file. Categories are written as plain
+    strings, since the chunks may not share their category sets.
+    """
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    if file_format == 'csv':
+        with open(tmp_path, 'wb') as output_file:
+            for index, path in enumerate(paths):
+                with open(path, 'rb') as chunk_file:
+                    if index:
+                        chunk_file.readline()
+                    shutil.copyfileobj(chunk_file, output_file)
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for path in paths:
+                table = pq.read_table(path)
+                table = table.cast(pa.schema([
+                    pa.field(field.name, pa.string()) if field.name in CATEGORICAL_COLUMNS else field
+                    for field in table.schema
+                ]).with_metadata(None))
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Generate synthetic flower market data")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of records to generate")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Records per chunk file")
+    parser.add_argument("--format", choices=sorted(FORMATS), default='csv')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--start", help="First sale start time (default: the dataset's)")
+    parser.add_argument("--end", help="Last sale start time (default: the dataset's)")
+    parser.add_argument("--dataset", default=DATASET_CSV, help="Dataset to learn the distributions from")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--output", help="Directory of the chunk files")
+    output.add_argument("--single", help="Combine the chunks into this one file")
+    args = parser.parse_args()
+
+    period = None
+    if args.start or args.end:
+        learned = market_model(args.dataset).period
+        period = (args.start or learned[0], args.end or learned[1])
+
+    started = time.perf_counter()
+    if args.single:
+        # Chunks go to a scratch directory next to the combined file
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(args.single))) as scratch:
+            chunks = generate_market_data(args.rows, scratch, args.chunk_rows, args.format,
+                                          args.seed, args.workers, period, args.dataset)
+            paths = [combine_chunks(chunks, args.single, args.format)]
+    else:
+        paths = generate_market_data(args.rows, args.output, args.chunk_rows, args.format,
+                                     args.seed, args.workers, period, args.dataset)
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {args.rows:,} rows to {len(paths)} file(s) in {elapsed:.1f}s ({args.rows / elapsed:,.0f} rows/s)")
@@ -0,0 +1,77 @@
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+# Stages a request's time is broken down into, in pipeline order; "load" is
+# reading a model or dataset (or building a value derived from them) on first use
+STAGES = ('load', 'parse', 'frame', 'predict', 'aggregate', 'serialize')
+
+# Timings of the request being served by the current thread (or task), if any
+_current = ContextVar('stage_timings', default=None)
+
+_NOT_RECORDING = nullcontext()
+
+
+class StageTimings:
+    """Seconds spent in each stage while recording; a stage entered twice adds up."""
+
+    def __init__(self):
+        self.seconds = {}
+        self.started = time.perf_counter()
+        self._token = None
+
+    def add(self, name, seconds):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def total(self):
+        """Seconds since recording started."""
+        return time.perf_counter() - self.started
+
+    def start(self):
+        """Make these the timings stage() records into, in the current context."""
+        self.started = time.perf_counter()
+        self._token = _current.set(self)
+        return self
+
+    def stop(self):
+        """Stop recording; returns the total seconds."""
+        _current.reset(self._token)
+        return self.total()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class _Stage:
+    __slots__ = ('timings', 'name', 'started')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.name, time.perf_counter() - self.started)
+
+
+def stage(name):
+    """
+    Context manager timing a block as one stage of the current request.
+
+    Outside a recording (scripts, Streamlit pages) it does nothing, so the
+    forecast functions can mark their stages unconditionally.
+    """
+    timings = _current.get()
+    if timings is None:
+        return _NOT_RECORDING
+    return _Stage(timings, name)
+
+
+def current_timings():
+    """StageTimings being recorded in this context, or None."""
+    return _current.get()
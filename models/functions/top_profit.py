@@ -1,62 +1,24 @@
-import pandas as pd
-import numpy as np
-import joblib
-from datetime import datetime
-from sklearn.preprocessing import LabelEncoder
-
-data = pd.read_csv("data/flowers_dataset_cleaned.csv")
-
-if 'Timestamp' in data.columns:
-    data['Timestamp'] = pd.to_datetime(data['Timestamp'])
-
-label_encoder = LabelEncoder()
-data['Flower Name Encoded'] = label_encoder.fit_transform(data['Flower Name'])
-flower_names = label_encoder.classes_
-
-revenue_model = joblib.load('models/regression/revenue_model_svm.joblib')
-profit_model = joblib.load('models/regression/profit_model_svm.joblib')
-
-def get_total_revenue(start_date: str, end_date: str):
-   
-    start_date = datetime.strptime(start_date, "%Y-%m-%d")
-    end_date = datetime.strptime(end_date, "%Y-%m-%d")
-
-    date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-
-    results = []
-
-    for flower in flower_names:
-        encoded_flower = label_encoder.transform([flower])[0] 
-        freq_qty_sold = np.random.randint(50, 200, len(date_range))  
-        average_price = data['MRP (₹)'].mean()  
-
-        future_data = pd.DataFrame({
-            'Flower Name': [encoded_flower] * len(date_range),
-            'Qty Sold (kg)': freq_qty_sold,
-            'MRP (₹)': [average_price] * len(date_range)
-        })
-
-        predicted_revenue = profit_model.predict(future_data)
-
-        for i, single_date in enumerate(date_range):
-            results.append({
-                'Flower Name': flower,
-                'Date': single_date,
-                'Predicted Profit': predicted_revenue[i]
-            })
-
-    prediction_summary = pd.DataFrame(results)
-
-    aggregated_revenue = prediction_summary.groupby('Flower Name')['Predicted Profit'].sum().reset_index()
-
-    top_revenue = aggregated_revenue.sort_values(by='Predicted Profit', ascending=False)
-
-    revenue_dict = dict(zip(top_revenue['Flower Name'], top_revenue['Predicted Profit']))
-
-    return revenue_dict
-
-start_date = "2024-11-01"
-end_date = "2024-11-10"
-revenue_dict = get_total_revenue(start_date, end_date)
-
-print(revenue_dict)
\ No newline at end of file
+from models.functions.dataset import DATASET_CSV
+from models.functions.forecast_cube import CUBE_MANIFEST, window_totals
+from models.functions.forecast_engine import rank_totals
+from models.functions.registry import artifact_path, flower_encoding
+from models.functions.surrogate import forecast_model
+from models.functions.result_cache import cached_forecast
+
+@cached_forecast('total_profit', [DATASET_CSV, artifact_path('profit_model'), CUBE_MANIFEST])
+def get_total_revenue(start_date: str, end_date: str, seed=None, fast=False):
+    # Shared, lazily loaded encoder and model (or its fast surrogate); reloaded only when their files change
+    label_encoder, flower_names, average_price = flower_encoding()
+    # Days inside the nightly forecast cube are read from it; the rest are predicted
+    totals = window_totals({'Predicted Profit': forecast_model('profit_model', fast)}, flower_names, label_encoder,
+                           start_date, end_date, average_price, seed=seed)
+
+    return rank_totals(totals['Predicted Profit'])
+
+# Example usage:
+if __name__ == "__main__":
+    start_date = "2024-11-01"
+    end_date = "2024-11-10"
+    revenue_dict = get_total_revenue(start_date, end_date)
+
+    print(revenue_dict)
@@ -1,47 +1,144 @@
-import joblib
+import copy
+
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
-from sklearn.ensemble import RandomForestClassifier
+
+from models.functions.registry import registry
+from models.functions.timing import stage
 
 def load_models():
-    rf_model = joblib.load("../regression/flower_name_predictor_rf.pkl")
-    encoder = joblib.load("../regression/categorical_encoder.pkl")
-    scaler = joblib.load("../regression/numerical_scaler.pkl")
-    flower_encoder = joblib.load("../regression/flower_label_encoder.pkl")
+    # Shared handles; the pickles are read once per process, not per prediction
+    rf_model = registry.artifact('flower_predictor_rf')
+    encoder = registry.artifact('categorical_encoder')
+    scaler = registry.artifact('numerical_scaler')
+    flower_encoder = registry.artifact('flower_label_encoder')
     return rf_model, encoder, scaler, flower_encoder
 
-def predict_flower(weather, qty_sold, mrp, customer_segment):
-    rf_model, encoder, scaler, flower_encoder = load_models()
+# Input columns of the recommender, and the snake_case keys accepted for them
+INPUT_COLUMNS = ['Weather', 'Qty Sold (kg)', 'MRP (₹)', 'Customer Segment']
+INPUT_ALIASES = {'weather': 'Weather', 'qty_sold': 'Qty Sold (kg)', 'mrp': 'MRP (₹)', 'customer_segment': 'Customer Segment'}
 
-    input_data = pd.DataFrame({
-        'Weather': [weather],
-        'Qty Sold (kg)': [qty_sold],
-        'MRP (₹)': [mrp],
-        'Customer Segment': [customer_segment]
-    })
-    
-    input_data['Revenue'] = input_data['MRP (₹)'] * input_data['Qty Sold (kg)']
-    
-    categorical_features = ['Weather', 'Customer Segment']
-    numerical_features = ['MRP (₹)', 'Qty Sold (kg)', 'Revenue']
+CATEGORICAL_FEATURES = ['Weather', 'Customer Segment']
+NUMERICAL_FEATURES = ['MRP (₹)', 'Qty Sold (kg)', 'Revenue']
+
+class FlowerRecommender:
+    """
+    Encoder, scaler, random forest and label decoder fused into one batch predictor.
+
+    The one-hot encoding and the standard scaling are applied with NumPy
+    from the fitted encoder and scaler parameters, so a batch costs a few
+    array operations plus one (multi-core) forest predict.
+    """
+
+    def __init__(self, rf_model, encoder, scaler, flower_encoder, n_jobs=-1):
+        # Shallow copy so the shared model keeps its own n_jobs
+        self.rf_model = copy.copy(rf_model)
+        self.rf_model.n_jobs = n_jobs
+        self.categories = dict(zip(CATEGORICAL_FEATURES, encoder.categories_))
+        self.mean = scaler.mean_
+        self.scale = scaler.scale_
+        self.flower_encoder = flower_encoder
+
+    def transform(self, data):
+        """Feature matrix (one-hot categoricals, then scaled numericals) of a batch."""
+        blocks = []
+        for column in CATEGORICAL_FEATURES:
+            codes = pd.Categorical(data[column], categories=self.categories[column]).codes
+            if (codes < 0).any():
+                unknown = sorted(set(data[column][codes < 0].astype(str)))
+                raise ValueError(f"Unknown {column} value(s): {', '.join(unknown)}")
+            blocks.append(np.eye(len(self.categories[column]))[codes])
+
+        qty_sold = data['Qty Sold (kg)'].to_numpy(dtype=float)
+        mrp = data['MRP (₹)'].to_numpy(dtype=float)
+        numerical = np.column_stack([mrp, qty_sold, mrp * qty_sold])
+        blocks.append((numerical - self.mean) / self.scale)
+
+        return np.hstack(blocks)
+
+    def predict(self, data):
+        """Predicted flower names for a DataFrame with INPUT_COLUMNS."""
+        with stage('frame'):
+            features = self.transform(data)
+        with stage('predict'):
+            predicted_class = self.rf_model.predict(features)
+        return self.flower_encoder.inverse_transform(predicted_class)
 
-    X_categorical = encoder.transform(input_data[categorical_features])
+def flower_recommender():
+    """Process-wide fused recommender, rebuilt when any of its pickles changes."""
+    return registry.derived(
+        'flower_recommender', FlowerRecommender,
+        ('artifact', 'flower_predictor_rf'), ('artifact', 'categorical_encoder'),
+        ('artifact', 'numerical_scaler'), ('artifact', 'flower_label_encoder')
+    )
 
-    X_numerical = scaler.transform(input_data[numerical_features])
+def input_frame(data):
+    """
+    Normalize a batch to a DataFrame with INPUT_COLUMNS.
 
-    X_combined = np.hstack((X_categorical, X_numerical))
+    Parameters:
+    - data (pd.DataFrame, dict or list): A DataFrame, a dict of equal-length
+      arrays, or a list of records; keys may be the column names or the
+      INPUT_ALIASES snake_case keys.
+    """
+    with stage('parse'):
+        frame = pd.DataFrame(data).rename(columns=INPUT_ALIASES)
+        missing = [column for column in INPUT_COLUMNS if column not in frame.columns]
+        if missing:
+            raise ValueError(f"Missing input column(s): {', '.join(missing)}")
+        return frame[INPUT_COLUMNS]
 
-    predicted_class = rf_model.predict(X_combined)
+def predict_flowers(data):
+    """
+    Predict the best flower for every row of a batch in one pass.
 
-    predicted_flower = flower_encoder.inverse_transform(predicted_class)
-    
-    return predicted_flower[0]
+    Parameters:
+    - data (pd.DataFrame, dict or list): Weather, Qty Sold (kg), MRP (₹) and
+      Customer Segment per row (see input_frame).
+
+    Returns:
+    - np.ndarray: Predicted flower name per row.
+    """
+    return flower_recommender().predict(input_frame(data))
+
+def market_grid(qty_sold, mrp, weathers=None, customer_segments=None, max_cells=None):
+    """
+    Every combination of weather, customer segment, quantity and MRP.
+
+    Weathers and segments default to all the values the encoder knows.
+
+    Returns:
+    - pd.DataFrame: One row per combination, with INPUT_COLUMNS.
+
+    Raises:
+    - ValueError: If the grid would have more than max_cells rows.
+    """
+    encoder = registry.artifact('categorical_encoder')
+    weathers = encoder.categories_[0] if weathers is None else weathers
+    customer_segments = encoder.categories_[1] if customer_segments is None else customer_segments
+
+    # Checked before building the product, which grows with every axis
+    cells = len(weathers) * len(qty_sold) * len(mrp) * len(customer_segments)
+    if max_cells is not None and cells > max_cells:
+        raise ValueError(f"The grid has {cells} combinations; at most {max_cells} are allowed")
+
+    index = pd.MultiIndex.from_product([weathers, qty_sold, mrp, customer_segments], names=INPUT_COLUMNS)
+    return index.to_frame(index=False)
+
+def predict_flower(weather, qty_sold, mrp, customer_segment):
+    return predict_flowers({
+        'Weather': [weather],
+        'Qty Sold (kg)': [qty_sold],
+        'MRP (₹)': [mrp],
+        'Customer Segment': [customer_segment]
+    })[0]
 
-weather = 'Sunny'  
-qty_sold = 5  
-mrp = 50  
-customer_segment = 'Marriage'  
+# Example usage:
+if __name__ == "__main__":
+    weather = 'Sunny'  
+    qty_sold = 5  
+    mrp = 50  
+    customer_segment = 'Marriage'  
 
-predicted_flower_name = predict_flower(weather, qty_sold, mrp, customer_segment)
-print(f"The predicted flower name is: {predicted_flower_name}")
+    predicted_flower_name = predict_flower(weather, qty_sold, mrp, customer_segment)
+    print(f"The predicted flower name is: {predicted_flower_name}")
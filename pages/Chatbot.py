@@ -1,6 +1,7 @@
 import streamlit as st
-from chatbot.model import Gemini
+from chatbot.model import get_gemini
 from chatbot.data_from_api import returnFromApi  # Import the function to get data
+from chatbot.context import build_context
 
 def main():
     # Initialize the app title and layout
@@ -15,6 +16,12 @@ def main():
         st.session_state.preloaded_data = None
     if "dates_provided" not in st.session_state:
         st.session_state.dates_provided = False
+    if "chat" not in st.session_state:
+        st.session_state.chat = None
+    if "context" not in st.session_state:
+        st.session_state.context = ""
+    if "date_range" not in st.session_state:
+        st.session_state.date_range = None
     if "first_response" not in st.session_state:
         st.session_state.first_response = False  # Tracks if the first response has been shown
 
@@ -32,6 +39,10 @@ def main():
                         start_date.strftime("%Y-%m-%d"), 
                         end_date.strftime("%Y-%m-%d")
                     )
+                    st.session_state.date_range = (
+                        start_date.strftime("%Y-%m-%d"),
+                        end_date.strftime("%Y-%m-%d")
+                    )
                     st.session_state.dates_provided = True
                 except Exception as e:
                     st.error(f"Failed to load preloaded data: {e}")
@@ -42,64 +53,72 @@ def main():
     if st.session_state.dates_provided:
         # Generate the first response from Gemini if not already done
         if not st.session_state.first_response:
-            gemini = Gemini()
-
-            # Combine preloaded data and a descriptive prompt
-            preloaded_data = st.session_state.preloaded_data
-            explanation_prompt = (
-                """
-                {data[0]}
-                This is the predicted profit.
-                {data[1]}
-                This is the total aggregated revenue for each flower.
-                {data[2]}
-                This is the total profit for each flower.
-                {data[3]}
-                This is the  top profit generated for each flower.
-
-                This data pertains to a shop owner in rural India. This person will ask
-                questions to you with regards to this data. Continue the conversation.
-                """
-                f"{preloaded_data}"
+            gemini = get_gemini()
+
+            # Compact, token-budgeted table of the preloaded data
+            explanation_prompt = build_context(
+                st.session_state.preloaded_data,
+                date_range=st.session_state.date_range
             )
+            st.session_state.context = explanation_prompt
 
             try:
-                # Get the initial response from Gemini
-                first_response = gemini.respond(explanation_prompt)
+                # One chat session per user session; the data is sent only with this first turn
+                st.session_state.chat = gemini.start_chat()
+
+                # Stream the initial response from Gemini as it is generated
+                with st.chat_message("assistant"):
+                    first_response = st.write_stream(gemini.send_stream(st.session_state.chat, explanation_prompt))
+                if not first_response:
+                    raise RuntimeError("Gemini returned an empty response")
+
+                # Only a completed first turn leaves the data context on the chat session
                 st.session_state.messages.append({"role": "assistant", "content": first_response})
                 st.session_state.first_response = True
             except Exception as e:
+                # Drop the session; the next rerun opens a new one and sends the data again
+                st.session_state.chat = None
                 st.error(f"Failed to generate the initial response: {e}")
-
-        # Display chat history
-        for message in st.session_state.messages:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
+        else:
+            # Display chat history
+            for message in st.session_state.messages:
+                with st.chat_message(message["role"]):
+                    st.markdown(message["content"])
 
         # Input box for user input
         user_input = st.chat_input("Type your message here...")
 
         if user_input:
-            # Combine user input with the preloaded data as context
-            input_with_context = f"Preloaded data: {st.session_state.preloaded_data}\n\nUser input: {user_input}"
-
             # Display the user's message in the chat
             with st.chat_message("user"):
                 st.markdown(user_input)
 
-            # Create an instance of the Gemini class
-            gemini = Gemini()
-
-            # Get the response from the Gemini model
-            try:
-                response = gemini.respond(input_with_context)
-            except Exception as e:
-                response = "Sorry, something went wrong while processing your request."
-                st.error(f"Error: {e}")
+            # Reuse the process-wide Gemini client
+            gemini = get_gemini()
 
-            # Display the bot's response in the chat
+            # Stream the bot's response into the chat token by token
+            sends_data = False
             with st.chat_message("assistant"):
-                st.markdown(response)
+                try:
+                    # The chat session already holds the data context and earlier turns;
+                    # both identify the reply in the response cache
+                    earlier_questions = [message["content"] for message in st.session_state.messages if message["role"] == "user"]
+                    turn_context = "\n".join([st.session_state.context] + earlier_questions)
+
+                    # After a failed first turn no session holds the data; open one and send the data with this message
+                    sends_data = st.session_state.chat is None
+                    if sends_data:
+                        st.session_state.chat = gemini.start_chat()
+                    message = f"{st.session_state.context}\n\n{user_input}" if sends_data else user_input
+                    response = st.write_stream(gemini.send_stream(st.session_state.chat, message, context=turn_context))
+                    if sends_data:
+                        st.session_state.first_response = True
+                except Exception as e:
+                    if sends_data:
+                        # The data did not reach the new session either; open another one next time
+                        st.session_state.chat = None
+                    response = "Sorry, something went wrong while processing your request."
+                    st.error(f"Error: {e}")
 
             # Append user and bot messages to the session state
             st.session_state.messages.append({"role": "user", "content": user_input})
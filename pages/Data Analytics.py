@@ -4,22 +4,23 @@ import plotly.express as px
 import matplotlib.pyplot as plt
 
 # Importing the necessary functions from each file
+from models.functions.app_cache import dataset, forecast_summary as cached_forecast_summary, cache_stats_panel
 from models.functions.predicted_profit import get_predicted_profit
 from models.functions.predicted_revenue import get_aggregated_results
-from models.functions.price_forecasting import predict_for_days, generate_forecast_summary, find_best_flower
 from models.functions.top_profit import get_total_revenue
+from models.functions.interval_index import day_bounds
+from models.functions.ingest import live_interval_index
 
 # Dropdown menu for feature selection
 feature_option = st.sidebar.selectbox("Select the feature to display", 
                                      ["Flower MRP Visualization", "Predicted Profit", "Predicted Revenue", 
                                       "Flower Revenue and Profit Forecast", "Predicted Profit for All Flowers"])
+cache_stats_panel()
 
 # Flower MRP Visualization
 if feature_option == "Flower MRP Visualization":
     file_path = 'data/flowers_dataset_cleaned.csv'  # Update with the actual path
-    data = pd.read_csv(file_path)
-    data['Start DateTime'] = pd.to_datetime(data['Start DateTime'])
-    data['End DateTime'] = pd.to_datetime(data['End DateTime'])
+    data = dataset(file_path)  # Shared across reruns; Start/End DateTime already parsed
 
     flowers = data['Flower Name'].unique()
     selected_flower = st.selectbox("Select a flower:", flowers)
@@ -27,11 +28,9 @@ if feature_option == "Flower MRP Visualization":
     start_date = st.date_input("Start date:", value=data['Start DateTime'].min().date())
     end_date = st.date_input("End date:", value=data['Start DateTime'].max().date())
     
-    filtered_data = data[
-        (data['Flower Name'] == selected_flower) &
-        (data['Start DateTime'].dt.date >= start_date) &
-        (data['Start DateTime'].dt.date <= end_date)
-    ]
+    # Sales of the flower starting on any of the selected days, via the dataset's interval index
+    index = live_interval_index(file_path)
+    filtered_data = index.take(index.starting_within(*day_bounds(start_date, end_date), flower_name=selected_flower))
     
     if filtered_data.empty:
         st.warning("No data available for the selected flower and date range.")
@@ -95,10 +94,10 @@ elif feature_option == "Flower Revenue and Profit Forecast":
     days = st.number_input("Enter the number of days for prediction", min_value=1, max_value=365, value=30)
     
     if days:
-        forecast_summary = generate_forecast_summary(days)
+        forecast_summary, best_flowers = cached_forecast_summary(days)
         st.dataframe(forecast_summary)
 
-        best_flower_revenue, max_revenue, best_flower_profit, max_profit = find_best_flower(days)
+        best_flower_revenue, max_revenue, best_flower_profit, max_profit = best_flowers
         st.markdown(f"**Best Flower for Revenue:** {best_flower_revenue} (₹{max_revenue:.2f})")
         st.markdown(f"**Best Flower for Profit:** {best_flower_profit} (₹{max_profit:.2f})")
 
@@ -3,21 +3,8 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.express as px
-from sklearn.preprocessing import MinMaxScaler, LabelEncoder
-import joblib
 
-# Load necessary components
-def load_components():
-    data = pd.read_csv("data/flowers_dataset_cleaned.csv")
-    label_encoder = joblib.load('models/regression/label_encoder.joblib')
-    scaler_prices = joblib.load('models/regression/scaler_prices.joblib')  # For scaling profit
-    return data, label_encoder, scaler_prices
-
-# Calculate daily profit for each flower (for demonstration, use the last 30 days)
-def calculate_daily_profit(data):
-    daily_profit_per_flower = data.groupby('Flower Name')['MRP (₹)'].rolling(30).mean().reset_index()
-    daily_profit_per_flower = daily_profit_per_flower.groupby('Flower Name').last()['MRP (₹)']
-    return daily_profit_per_flower
+from models.functions.app_cache import profit_components, cache_stats_panel
 
 # Forecast day-wise profit for a flower
 def forecast_daywise_profit(flower_id, n_days, data, label_encoder, daily_profit_per_flower):
@@ -58,9 +45,9 @@ def main():
     st.title("Flower Profit Forecast")
     st.write("Use this tool to forecast the daily profits of flowers based on their name or ID.")
     
-    # Load components
-    data, label_encoder, scaler_prices = load_components()
-    daily_profit_per_flower = calculate_daily_profit(data)
+    # Load components (cached across reruns, pages and sessions)
+    data, label_encoder, scaler_prices, daily_profit_per_flower = profit_components()
+    cache_stats_panel()
     
     # Flower ID or Name input
     flower_input = st.text_input("Enter Flower Name or Flower ID:")
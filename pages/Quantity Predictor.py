@@ -1,34 +1,33 @@
 import streamlit as st
-import joblib
 import pandas as pd
 import matplotlib.pyplot as plt
 
-# Load the joblib model
-def load_model(filename='models/regression/adjusted_flower_sales_model.joblib'):
-    """Load the saved flower sales optimization model."""
-    return joblib.load(filename)
-
-# Profit calculation function
-def calculate_profit(price, cost, quantity):
-    """Calculate profit for a given price, cost, and quantity."""
-    return (price - cost) * quantity
+from models.functions.ingest import live_interval_index
+from models.functions.quantity import DEFAULT_COST_PER_UNIT, optimal_sales_totals
+from models.functions.app_cache import dataset, sales_model, cache_stats_panel
 
 # Load flower dataset
 def load_flower_data(dataset_path="data/flowers_dataset_cleaned.csv"):
-    """Load the flower dataset."""
-    return pd.read_csv(dataset_path)
+    """Load the shared flower dataset with typed categorical and datetime columns."""
+    return dataset(dataset_path)
 
 # Filter data by the provided start and end dates
-def filter_data_by_dates(data, start_date, end_date):
-    """Filter the flower data to the given date range."""
-    data['Start DateTime'] = pd.to_datetime(data['Start DateTime'])
-    data['End DateTime'] = pd.to_datetime(data['End DateTime'])
+def filter_data_by_dates(data, start_date, end_date, index=None):
+    """Filter the flower data to the sales that start and end within the given date range."""
+    # Binary search on the dataset's interval index when it covers this frame
+    if index is not None and index.frame is data:
+        return index.take(index.contained_in(start_date, end_date))
+
+    # The dataset may be shared, so parse into locals instead of overwriting its columns
+    start_datetime = pd.to_datetime(data['Start DateTime'])
+    end_datetime = pd.to_datetime(data['End DateTime'])
     
-    filtered_data = data[(data['Start DateTime'] >= start_date) & (data['End DateTime'] <= end_date)]
+    filtered_data = data[(start_datetime >= start_date) & (end_datetime <= end_date)]
     return filtered_data
 
 # Function to get optimal sales based on the provided start_date and end_date
-def get_optimal_sales(start_date, end_date, model, dataset_path="data/flowers_dataset_cleaned.csv"):
+def get_optimal_sales(start_date, end_date, model, dataset_path="data/flowers_dataset_cleaned.csv",
+                      cost_per_unit=DEFAULT_COST_PER_UNIT):
     """Get the optimal flower sales for the given date range."""
     
     # Load flower data
@@ -36,49 +35,39 @@ def get_optimal_sales(start_date, end_date, model, dataset_path="data/flowers_da
     start_date = pd.to_datetime(start_date)
     end_date = pd.to_datetime(end_date)
     
-    # Filter the dataset by the date range
-    filtered_data = filter_data_by_dates(data, start_date, end_date)
+    # Filter the dataset by the date range, using the index built once per dataset version
+    filtered_data = filter_data_by_dates(data, start_date, end_date, live_interval_index(dataset_path))
     
     if filtered_data.empty:
         st.write("No data found for the given date range.")
         return {}
 
-    flower_sales = []
-    cost_per_unit = 50  # Example cost per unit
-
-    # For each flower, calculate the total profit based on the optimal quantities from the model
-    for flower_name in filtered_data['Flower Name'].unique():
-        flower_data = filtered_data[filtered_data['Flower Name'] == flower_name]
-        
-        best_quantity = model.get(flower_name, 0)
-        total_profit = 0
-        
-        for _, row in flower_data.iterrows():
-            daily_price = row['MRP (₹)']
-            total_profit += calculate_profit(daily_price, cost_per_unit, best_quantity)
-        
-        flower_sales.append({
-            'Flower Name': flower_name,
-            'Best Quantity': best_quantity,
-            'Total Profit (₹)': total_profit
-        })
-
-    return flower_sales
+    # Best quantity and total profit of every flower in one vectorized pass
+    return optimal_sales_totals(filtered_data, model, cost_per_unit).to_dict('records')
 
 # Streamlit interface
 st.title('Flower Sales Optimization')
 
-# Load model
-model = load_model('models/regression/adjusted_flower_sales_model.joblib')
+# Load model (cached across reruns, pages and sessions)
+model = sales_model()
+cache_stats_panel()
 
 # User inputs for date range
 start_date = st.date_input('Select start date', pd.to_datetime('2023-11-01'))
 end_date = st.date_input('Select end date', pd.to_datetime('2023-11-30'))
 
+# Cost per unit, editable per flower
+with st.expander('Cost per unit (₹)'):
+    costs = st.data_editor(
+        pd.DataFrame({'Flower Name': sorted(model), 'Cost per unit (₹)': float(DEFAULT_COST_PER_UNIT)}),
+        hide_index=True, disabled=['Flower Name']
+    )
+cost_per_unit = dict(zip(costs['Flower Name'], costs['Cost per unit (₹)']))
+
 # Button to get optimized sales
 if st.button('Get Optimized Sales'):
     # Get the optimized sales for the selected date range
-    result = get_optimal_sales(start_date, end_date, model)
+    result = get_optimal_sales(start_date, end_date, model, cost_per_unit=cost_per_unit)
     
     # Display the result
     if result:
@@ -99,10 +88,15 @@ if st.button('Get Optimized Sales'):
 
         # Pie Chart: Distribution of Total Profit for Each Flower using Matplotlib
         st.subheader('Total Profit Distribution (Pie Chart)')
-        fig, ax = plt.subplots()
-        ax.pie(df['Total Profit (₹)'], labels=df['Flower Name'], autopct='%1.1f%%', startangle=90)
-        ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle.
-        st.pyplot(fig)
+        # Newly ingested flowers have no best quantity in the model yet, so their profit is 0
+        profitable = df[df['Total Profit (₹)'] > 0]
+        if profitable.empty:
+            st.write("No flower made a profit in this date range.")
+        else:
+            fig, ax = plt.subplots()
+            ax.pie(profitable['Total Profit (₹)'], labels=profitable['Flower Name'], autopct='%1.1f%%', startangle=90)
+            ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle.
+            st.pyplot(fig)
 
     else:
         st.write("No results to display.")
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Make the repository root importable when pytest is started from any directory
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT_DIR)
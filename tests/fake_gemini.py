@@ -0,0 +1,59 @@
+"""Local stand-in for the google.generativeai model and chat session."""
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """
+    Replies with `chunks`, streamed one by one or joined.
+
+    With `error` set, the call raises it after `fail_after` chunks, so both
+    an immediate failure and a stream broken halfway can be simulated.
+    """
+
+    def __init__(self, chunks=("Roses ", "sell ", "best."), error=None, fail_after=0):
+        self.chunks = list(chunks)
+        self.error = error
+        self.fail_after = fail_after
+        self.calls = []
+
+    def _stream(self):
+        for i, chunk in enumerate(self.chunks):
+            if self.error is not None and i == self.fail_after:
+                raise self.error
+            yield FakeChunk(chunk)
+        if self.error is not None:
+            raise self.error
+
+    def generate_content(self, prompt, stream=False):
+        self.calls.append(prompt)
+        if stream:
+            return self._stream()
+        if self.error is not None:
+            raise self.error
+        return FakeChunk("".join(self.chunks))
+
+    def start_chat(self, history=None):
+        return FakeChat(self, history or [])
+
+
+class FakeChat:
+    """Chat session that records a turn only once its reply completed."""
+
+    def __init__(self, model, history):
+        self.model = model
+        self.history = list(history)
+
+    def send_message(self, message, stream=False):
+        self.model.calls.append(message)
+        reply = []
+        for chunk in self.model._stream():
+            reply.append(chunk.text)
+            yield chunk
+        self.history = self.history + [
+            {"role": "user", "parts": [message]},
+            {"role": "model", "parts": ["".join(reply)]}
+        ]
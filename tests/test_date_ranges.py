@@ -0,0 +1,66 @@
+import importlib
+
+import pytest
+
+from models.functions import forecast_cube
+from models.functions.forecast_engine import forecast_scenarios, parse_date_range
+from models.functions.registry import flower_encoding, registry
+
+REVERSED = {'start_date': '2024-02-01', 'end_date': '2024-01-01'}
+MESSAGE = "start_date must be on or before end_date"
+
+# (module, route) of every date-range endpoint
+ENDPOINTS = [
+    ('chatbot.api.service', '/get_predicted_profit'),
+    ('chatbot.api.service', '/get_aggregated_revenue'),
+    ('chatbot.api.service', '/get_total_profit'),
+    ('chatbot.api.service', '/get_total_revenue'),
+    ('chatbot.api.service', '/summary'),
+    ('chatbot.api.service', '/scenarios'),
+    ('chatbot.api.predictedProfit', '/get_predicted_profit'),
+    ('chatbot.api.predictedRevenue', '/get_aggregated_revenue'),
+    ('chatbot.api.topProfit', '/get_total_profit'),
+    ('chatbot.api.topRevenue', '/get_total_revenue'),
+]
+
+
+def test_parse_date_range_rejects_a_reversed_range():
+    with pytest.raises(ValueError, match=MESSAGE):
+        parse_date_range(REVERSED['start_date'], REVERSED['end_date'])
+    assert len(parse_date_range('2024-01-01', '2024-01-01')) == 1
+
+
+@pytest.mark.parametrize('module, route', ENDPOINTS)
+def test_endpoints_answer_400_for_a_reversed_range(module, route):
+    client = importlib.import_module(module).app.test_client()
+
+    response = client.get(route, query_string=REVERSED)
+    assert response.status_code == 400
+    assert response.get_json() == {"error": MESSAGE}
+
+
+def test_scenarios_reject_a_reversed_range_before_predicting():
+    label_encoder, flower_names, average_price = flower_encoding()
+
+    class Unused:
+        def predict(self, X):
+            raise AssertionError("predict ran for an invalid range")
+
+    with pytest.raises(ValueError, match=MESSAGE):
+        forecast_scenarios({'Predicted Revenue': Unused()}, flower_names, label_encoder,
+                           REVERSED['start_date'], REVERSED['end_date'], average_price, 10)
+
+
+def test_forecast_cube_path_rejects_a_reversed_range(tmp_path, monkeypatch):
+    forecast_cube.build_cube(days=30, start='2024-01-01', seed=0, output_dir=str(tmp_path))
+    cube = forecast_cube.load_cube(str(tmp_path / 'manifest.json'))
+    monkeypatch.setattr(forecast_cube, 'shared_forecast_cube', lambda: cube)
+
+    label_encoder, flower_names, average_price = flower_encoding()
+    models = {'Predicted Revenue': registry.artifact('revenue_model')}
+
+    assert forecast_cube.window_totals(models, flower_names, label_encoder, '2024-01-02', '2024-01-05',
+                                       average_price)['Predicted Revenue']
+    with pytest.raises(ValueError, match=MESSAGE):
+        forecast_cube.window_totals(models, flower_names, label_encoder, REVERSED['start_date'],
+                                    REVERSED['end_date'], average_price)
@@ -0,0 +1,87 @@
+import pytest
+
+from chatbot.model import Gemini, MemoryBackend, ResponseCache
+from fake_gemini import FakeModel
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(MemoryBackend())
+
+
+def test_respond_returns_the_reply_and_caches_it(cache):
+    model = FakeModel()
+    gemini = Gemini(client=model, cache=cache)
+
+    assert gemini.respond("Which flower is most profitable?") == "Roses sell best."
+    assert gemini.respond("which flower is most profitable") == "Roses sell best."
+    assert len(model.calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_respond_raises_model_errors(cache):
+    gemini = Gemini(client=FakeModel(error=RuntimeError("quota exceeded")), cache=cache)
+
+    with pytest.raises(RuntimeError, match="quota exceeded"):
+        gemini.respond("Which flower is most profitable?")
+    assert len(cache.backend) == 0
+
+
+def test_respond_without_cache_calls_the_model_every_time():
+    model = FakeModel()
+    gemini = Gemini(client=model)
+
+    gemini.respond("hello")
+    gemini.respond("hello")
+    assert len(model.calls) == 2
+
+
+def test_respond_stream_yields_chunks_then_serves_the_cache(cache):
+    model = FakeModel()
+    gemini = Gemini(client=model, cache=cache)
+
+    assert list(gemini.respond_stream("Top revenue?", context="data")) == ["Roses ", "sell ", "best."]
+    assert list(gemini.respond_stream("top revenue", context="data")) == ["Roses sell best."]
+    assert len(model.calls) == 1
+
+
+def test_respond_stream_raises_model_errors(cache):
+    gemini = Gemini(client=FakeModel(error=ConnectionError("network down")), cache=cache)
+
+    with pytest.raises(ConnectionError):
+        list(gemini.respond_stream("Top revenue?"))
+    assert len(cache.backend) == 0
+
+
+def test_send_stream_records_the_turn_on_the_chat(cache):
+    model = FakeModel()
+    gemini = Gemini(client=model, cache=cache)
+    chat = gemini.start_chat()
+
+    assert "".join(gemini.send_stream(chat, "Data context", context="")) == "Roses sell best."
+    assert [turn["role"] for turn in chat.history] == ["user", "model"]
+    assert chat.history[1]["parts"] == ["Roses sell best."]
+
+
+def test_send_stream_cache_hit_appends_the_turn_without_calling_the_model(cache):
+    model = FakeModel()
+    gemini = Gemini(client=model, cache=cache)
+    gemini.respond("Data context", context="turn")
+
+    chat = gemini.start_chat()
+    assert list(gemini.send_stream(chat, "data context", context="turn")) == ["Roses sell best."]
+    assert len(model.calls) == 1
+    assert chat.history == [
+        {"role": "user", "parts": ["data context"]},
+        {"role": "model", "parts": ["Roses sell best."]}
+    ]
+
+
+def test_send_stream_raises_model_errors_and_leaves_the_chat_untouched(cache):
+    gemini = Gemini(client=FakeModel(error=RuntimeError("blocked by safety filters")), cache=cache)
+    chat = gemini.start_chat()
+
+    with pytest.raises(RuntimeError, match="safety"):
+        list(gemini.send_stream(chat, "Data context"))
+    assert chat.history == []
+    assert len(cache.backend) == 0
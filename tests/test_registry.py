@@ -0,0 +1,45 @@
+import os
+
+import pandas as pd
+
+from models.functions.dataset import DATASET_CSV
+from models.functions.registry import Registry
+
+
+def write_rows(path, rows):
+    pd.read_csv(DATASET_CSV, nrows=rows).to_csv(path, index=False)
+    # Keep the stat stamp distinct even on coarse-grained file systems
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + rows * 1_000_000_000))
+
+
+def test_derived_builds_once_and_rebuilds_when_a_source_changes(tmp_path):
+    path = str(tmp_path / 'flowers.csv')
+    write_rows(path, 10)
+    registry, builds = Registry(), []
+
+    def build(data):
+        builds.append(len(data))
+        return len(data)
+
+    assert registry.derived('rows', build, ('dataset', path)) == 10
+    assert registry.derived('rows', build, ('dataset', path)) == 10
+    assert builds == [10]
+
+    write_rows(path, 20)
+    assert registry.derived('rows', build, ('dataset', path)) == 20
+    assert builds == [10, 20]
+
+
+def test_derived_values_are_stored_under_the_versions_they_were_built_from(tmp_path):
+    path = str(tmp_path / 'flowers.csv')
+    write_rows(path, 10)
+    registry = Registry()
+
+    for rows in (10, 20, 30):
+        write_rows(path, rows)
+        registry.derived('rows', len, ('dataset', path))
+        value, version = registry._handle(path, None).snapshot()
+
+        versions, cached = registry._derived['rows']
+        assert (versions, cached) == ((version,), len(value)) == ((version,), rows)
@@ -0,0 +1,119 @@
+import json
+
+import pytest
+
+from chatbot.model import DiskBackend, Gemini, MemoryBackend, ResponseCache, normalize_prompt
+from fake_gemini import FakeModel
+
+
+class Clock:
+    """Manually advanced stand-in for time.time."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_prompt_ignores_case_whitespace_and_trailing_punctuation():
+    assert normalize_prompt("  Which flower is   most\nprofitable?! ") == "which flower is most profitable"
+
+
+def test_key_depends_on_model_normalized_prompt_and_context():
+    key = ResponseCache.key("gemini-1.5-flash", "Top revenue?", "data")
+
+    assert ResponseCache.key("gemini-1.5-flash", "top   REVENUE", "data") == key
+    assert ResponseCache.key("gemini-1.5-pro", "Top revenue?", "data") != key
+    assert ResponseCache.key("gemini-1.5-flash", "Top revenue?", "other data") != key
+    assert ResponseCache.key("gemini-1.5-flash", "Top profit?", "data") != key
+
+
+def test_cache_counts_hits_and_misses_and_skips_empty_responses():
+    cache = ResponseCache(MemoryBackend())
+
+    assert cache.get("model", "prompt") is None
+    cache.set("model", "prompt", "")
+    assert cache.get("model", "prompt") is None
+    cache.set("model", "prompt", "reply")
+    assert cache.get("model", "Prompt.") == "reply"
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_memory_backend_evicts_the_least_recently_used_entry():
+    backend = MemoryBackend(maxsize=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    backend.get("a")
+    backend.set("c", "3")
+
+    assert len(backend) == 2
+    assert backend.get("b") is None
+    assert (backend.get("a"), backend.get("c")) == ("1", "3")
+
+
+def test_memory_backend_expires_entries_after_the_ttl():
+    clock = Clock()
+    backend = MemoryBackend(ttl=60, clock=clock)
+    backend.set("a", "1")
+
+    clock.now += 59
+    assert backend.get("a") == "1"
+    clock.now += 1
+    assert backend.get("a") is None
+    assert len(backend) == 0
+
+
+def test_disk_backend_survives_a_reload(tmp_path):
+    path = tmp_path / "cache" / "responses.json"
+    backend = DiskBackend(str(path), maxsize=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    backend.set("c", "3")
+
+    reloaded = DiskBackend(str(path), maxsize=2)
+    assert len(reloaded) == 2
+    assert (reloaded.get("a"), reloaded.get("b"), reloaded.get("c")) == (None, "2", "3")
+
+
+def test_disk_backend_drops_expired_entries_on_reload(tmp_path):
+    path = str(tmp_path / "responses.json")
+    clock = Clock()
+    DiskBackend(path, ttl=60, clock=clock).set("a", "1")
+
+    clock.now += 30
+    assert DiskBackend(path, ttl=60, clock=clock).get("a") == "1"
+    clock.now += 30
+    assert len(DiskBackend(path, ttl=60, clock=clock)) == 0
+
+
+def test_disk_backend_reads_files_without_expiry_times(tmp_path):
+    path = tmp_path / "responses.json"
+    path.write_text(json.dumps([["a", "1"]]), encoding="utf-8")
+
+    assert DiskBackend(str(path)).get("a") == "1"
+
+
+def test_disk_backend_ignores_a_corrupt_file(tmp_path):
+    path = tmp_path / "responses.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    backend = DiskBackend(str(path))
+    assert len(backend) == 0
+    backend.set("a", "1")
+    assert DiskBackend(str(path)).get("a") == "1"
+
+
+@pytest.mark.parametrize("fail_after", [0, 2])
+def test_failed_or_partial_streams_are_not_stored(tmp_path, fail_after):
+    path = str(tmp_path / "responses.json")
+    cache = ResponseCache(DiskBackend(path))
+    gemini = Gemini(client=FakeModel(error=ConnectionError("stream broken"), fail_after=fail_after), cache=cache)
+
+    with pytest.raises(ConnectionError):
+        list(gemini.respond_stream("Top revenue?"))
+    with pytest.raises(ConnectionError):
+        list(gemini.send_stream(gemini.start_chat(), "Top revenue?", context="data"))
+
+    assert len(cache.backend) == 0
+    assert len(DiskBackend(path)) == 0
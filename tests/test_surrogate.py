@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from models.functions.registry import registry
+from models.functions.surrogate import SURROGATE_MODELS, kernel_gamma, shared_surrogate, training_features
+
+
+@pytest.mark.parametrize('name', SURROGATE_MODELS)
+def test_kernel_gamma_matches_the_fitted_model(name):
+    model = registry.artifact(name)
+
+    # _gamma is the value scikit-learn resolved from gamma='scale' at fit time
+    assert kernel_gamma(model, training_features(registry.dataset())) == pytest.approx(model._gamma, rel=1e-12)
+
+
+@pytest.mark.parametrize('name', SURROGATE_MODELS)
+def test_surrogate_keeps_its_gamma_and_reproduces_the_model(name):
+    model, surrogate = registry.artifact(name), shared_surrogate(name)
+    X = training_features(registry.dataset()).iloc[:200]
+
+    assert surrogate.gamma == pytest.approx(model._gamma, rel=1e-12)
+    np.testing.assert_allclose(surrogate.predict(X), model.predict(X), rtol=1e-9)